@@ -0,0 +1,257 @@
+"""
+Benchmarks the client against the local stub server in benchmarks/stub_server.py, so no API key or network is needed.
+
+    python benchmarks/bench.py --latency 5 --output results.json
+
+Each scenario runs in its own process, so its peak RSS is its own. Results are written as JSON (to stdout unless
+--output is given) and summarised as a table on stderr. The working tree's src/ is benchmarked, not an installed copy.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'src'))
+
+AUTHORITIES = ['NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA']
+
+def _race_ids(api) -> list:
+    # The first half of test.py: list the races of every authority.
+    import pandas as pd
+    races = pd.concat([api.get_races(from_date='2023-12-01', to_date='2023-12-06', owning_authority_code=code)
+                       for code in AUTHORITIES], ignore_index=True)
+    return list(races['raceId'].unique())
+
+def sequential(base_url: str, args, metrics, keep_alive: bool = True):
+    from topaz import TopazAPI
+    with TopazAPI('bench', keep_alive=keep_alive, metrics=metrics) as api:
+        api.base_url = base_url
+        for race_id in _race_ids(api):
+            api.get_race_runs(race_id)
+
+def sequential_no_keepalive(base_url: str, args, metrics):
+    return sequential(base_url, args, metrics, keep_alive=False)
+
+def concurrent(base_url: str, args, metrics):
+    from topaz import TopazAPI
+    with TopazAPI('bench', pool_maxsize=args.workers, metrics=metrics) as api:
+        api.base_url = base_url
+        api.get_race_runs_many(_race_ids(api), max_workers=args.workers)
+
+def async_gather(base_url: str, args, metrics):
+    from topaz import TopazAPI, AsyncTopazAPI
+    with TopazAPI('bench', metrics=metrics) as api:
+        api.base_url = base_url
+        race_ids = _race_ids(api)
+
+    async def run():
+        async with AsyncTopazAPI('bench', max_concurrency=args.workers, metrics=metrics) as client:
+            client.base_url = base_url
+            await asyncio.gather(*(client.get_race_runs(race_id) for race_id in race_ids))
+    asyncio.run(run())
+
+def meeting_form(base_url: str, args, metrics):
+    from topaz import TopazAPI
+    with TopazAPI('bench', metrics=metrics) as api:
+        api.base_url = base_url
+        for meeting_id in range(args.meetings):
+            api.get_meeting_form(900000000 + meeting_id)
+
+def bulk_month(base_url: str, args, metrics, typed: bool = True):
+    from topaz import TopazAPI
+    with TopazAPI('bench', metrics=metrics) as api:
+        api.base_url = base_url
+        for month in range(1, args.months + 1):
+            api.get_bulk_runs_by_month('VIC', 2023, month, typed=typed)
+
+def bulk_month_untyped(base_url: str, args, metrics):
+    return bulk_month(base_url, args, metrics, typed=False)
+
+def bulk_month_streamed(base_url: str, args, metrics):
+    from topaz import TopazAPI
+    with TopazAPI('bench', metrics=metrics) as api:
+        api.base_url = base_url
+        for month in range(1, args.months + 1):
+            for _ in api.iter_bulk_runs_by_month('VIC', 2023, month, chunk_size=5000):
+                pass
+
+def parse(base_url: str, args, metrics):
+    # Decode and DataFrame construction cost on their own, without the network.
+    import requests
+    from topaz.topaz import _to_frame
+    timings = {}
+    for name, path, schema in [('race_runs', '/race/1/runs', None), ('bulk_runs', '/bulk/runs/VIC/2023/1', 'bulk_runs')]:
+        body = requests.get(f"{base_url}{path}").content
+        records = json.loads(body)
+        timings[f'{name}_decode_ms'] = _best_of(args.repeat, lambda: json.loads(body))
+        timings[f'{name}_frame_ms'] = _best_of(args.repeat, lambda: _to_frame(records))
+        if schema:
+            timings[f'{name}_frame_typed_ms'] = _best_of(args.repeat, lambda: _to_frame(records, schema))
+        for output in ('pyarrow', 'polars'):
+            try:
+                timings[f'{name}_{output}_ms'] = _best_of(args.repeat, lambda: _to_frame(records, schema, output))
+            except ImportError:
+                pass  # The optional backend is not installed
+        timings[f'{name}_bytes'] = len(body)
+    return timings
+
+def import_time(base_url: str, args, metrics):
+    # The start-up cost of a short-lived job: `from topaz import TopazAPI` in a fresh interpreter, next to importing
+    # requests and pandas on their own. The client should cost little more than requests and not import pandas.
+    probe = "import sys, time; started = time.perf_counter(); {}; print(time.perf_counter() - started, 'pandas' in sys.modules)"
+    env = {**os.environ, 'PYTHONPATH': os.path.join(os.path.dirname(HERE), 'src')}
+    timings = {}
+    for name, statement in [('requests', 'import requests'), ('topaz', 'from topaz import TopazAPI'),
+                            ('pandas', 'import pandas')]:
+        runs = [subprocess.run([sys.executable, '-c', probe.format(statement)], env=env, capture_output=True,
+                               text=True, check=True).stdout.split() for _ in range(args.repeat)]
+        timings[f'{name}_import_ms'] = round(min(float(seconds) for seconds, _ in runs) * 1000, 3)
+        if name == 'topaz':
+            timings['topaz_imports_pandas'] = runs[0][1] == 'True'
+    return timings
+
+def _best_of(repeat: int, fn) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return round(min(times) * 1000, 3)
+
+SCENARIOS = {
+    'sequential': sequential,
+    'sequential_no_keepalive': sequential_no_keepalive,
+    'concurrent': concurrent,
+    'async_gather': async_gather,
+    'meeting_form': meeting_form,
+    'bulk_month': bulk_month,
+    'bulk_month_untyped': bulk_month_untyped,
+    'bulk_month_streamed': bulk_month_streamed,
+    'parse': parse,
+    'import_time': import_time,
+}
+
+def _peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 ** 2 if sys.platform == 'darwin' else 1024), 1)  # Bytes on macOS, KiB elsewhere
+
+def run_scenario(name: str, base_url: str, args) -> dict:
+    """
+    Runs one scenario in this process and returns its measurements.
+    """
+    from topaz import Metrics
+
+    # The histogram buckets are too coarse for a benchmark, so p50/p99 come from the per-request hook.
+    latencies = []
+    metrics = Metrics(on_response=lambda endpoint, status, seconds, nbytes: latencies.append(seconds))
+    started = time.perf_counter()
+    timings = SCENARIOS[name](base_url, args, metrics)
+    seconds = time.perf_counter() - started
+    result = {'scenario': name, 'seconds': round(seconds, 3), 'peak_rss_mb': _peak_rss_mb()}
+    if timings is not None:
+        result.update(timings)
+        return result
+    latencies.sort()
+    snapshot = metrics.snapshot()
+    requests = len(latencies)
+    result.update({
+        'requests': requests,
+        'requests_per_sec': round(requests / seconds, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        'p99_ms': round(latencies[min(requests - 1, int(requests * 0.99))] * 1000, 2) if latencies else None,
+        'bytes': sum(endpoint['bytes'] for endpoint in snapshot.values()),
+    })
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument('--latency', type=float, default=5.0, help='Milliseconds the stub adds to every response.')
+    parser.add_argument('--races', type=int, default=40, help='Races listed per authority (7 authorities).')
+    parser.add_argument('--bulk-rows', type=int, default=20000, help='Runs per bulk month.')
+    parser.add_argument('--months', type=int, default=3, help='Bulk months fetched by the bulk scenarios.')
+    parser.add_argument('--meetings', type=int, default=20, help='Meetings fetched by meeting_form.')
+    parser.add_argument('--workers', type=int, default=10, help='Concurrency of the concurrent and async scenarios.')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions of each parse timing; the best is kept.')
+    parser.add_argument('--output', help='Write the JSON results to this file instead of stdout.')
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)  # Set when running a single scenario in a child process
+    args = parser.parse_args()
+
+    if args.base_url:
+        print(json.dumps(run_scenario(args.scenarios[0], args.base_url, args)))
+        return
+
+    server = subprocess.Popen([sys.executable, os.path.join(HERE, 'stub_server.py'), '--latency', str(args.latency),
+                               '--races', str(args.races), '--bulk-rows', str(args.bulk_rows)],
+                              stdout=subprocess.PIPE, text=True)
+    try:
+        base_url = server.stdout.readline().strip()
+        options = _drop_option_values(sys.argv[1:], ('--scenarios', '--output'))
+        results = []
+        for name in args.scenarios:
+            child = subprocess.run([sys.executable, __file__, '--base-url', base_url, '--scenarios', name, *options],
+                                   capture_output=True, text=True)
+            if child.returncode:
+                results.append({'scenario': name, 'error': child.stderr.strip().splitlines()[-1]})
+            else:
+                results.append(json.loads(child.stdout.strip().splitlines()[-1]))
+            print(_summary(results[-1]), file=sys.stderr)
+    finally:
+        server.terminate()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'commit': _commit(),
+            'config': {key: value for key, value in vars(args).items() if key not in ('output', 'base_url')},
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+def _drop_option_values(argv: list, names: tuple) -> list:
+    # Remove the named options and their values, keeping the rest for the child processes.
+    kept, skipping = [], False
+    for arg in argv:
+        if arg.startswith('--'):
+            skipping = arg.split('=')[0] in names
+        if not skipping:
+            kept.append(arg)
+    return kept
+
+def _summary(result: dict) -> str:
+    if 'error' in result:
+        return f"{result['scenario']:<26} failed: {result['error']}"
+    if 'requests' not in result:
+        timings = ', '.join(f"{key}={value}" for key, value in result.items() if key.endswith('_ms'))
+        return f"{result['scenario']:<26} {timings}  peak {result['peak_rss_mb']} MB"
+    return (f"{result['scenario']:<26} {result['requests']:>5} requests  {result['requests_per_sec']:>8} req/s  "
+            f"p50 {result['p50_ms']} ms  p99 {result['p99_ms']} ms  peak {result['peak_rss_mb']} MB")
+
+def _commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                              text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+A local stand-in for the Topaz API, serving generated but realistically shaped fixtures for the endpoints the
+benchmarks exercise. Bodies are encoded once at startup, so the server costs little CPU per request.
+
+Run it on its own with:
+
+    python benchmarks/stub_server.py --port 8080 --latency 20 --bulk-rows 20000
+
+and point a client at it with `topaz_api.base_url = 'http://127.0.0.1:8080/api'`.
+"""
+import argparse
+import datetime
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+AUTHORITIES = ['NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA']
+TRACKS = ['WPK', 'SAN', 'MEA', 'BAL', 'BEN', 'GEL', 'HOR', 'SAL', 'SHP', 'TRA', 'WAR', 'RIC', 'GAR', 'WEN']
+GRADES = ['M', '5', '4', '3', 'FFA', 'NG', 'RW', 'T3']
+
+def _run(rng: random.Random, race: dict, box: int) -> dict:
+    dog_id = rng.randrange(100000000, 999999999)
+    return {
+        **race,
+        'runId': rng.randrange(100000000, 999999999),
+        'dogId': dog_id,
+        'dogName': f"DOG {dog_id % 5000}",
+        'sex': rng.choice(['D', 'B']),
+        'colourCode': rng.choice(['BK', 'BD', 'F', 'W', 'BE']),
+        'weightInKg': round(rng.uniform(24, 38), 1),
+        'dateWhelped': f"{rng.randint(2018, 2021)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T00:00:00",
+        'damId': rng.randrange(100000000, 999999999),
+        'damName': f"DAM {rng.randrange(2000)}",
+        'sireId': rng.randrange(100000000, 999999999),
+        'sireName': f"SIRE {rng.randrange(400)}",
+        'trainerId': rng.randrange(1000, 9999),
+        'trainerName': f"TRAINER {rng.randrange(1500)}",
+        'trainerSuburb': f"SUBURB {rng.randrange(300)}",
+        'trainerState': race['owningAuthorityCode'],
+        'ownerId': rng.randrange(1000, 99999),
+        'ownerName': f"OWNER {rng.randrange(5000)}",
+        'rugNumber': box,
+        'boxNumber': box,
+        'rating': rng.randint(0, 100),
+        'place': box,
+        'scratched': rng.random() < 0.05,
+        'isLateScratching': False,
+        'resultTime': round(rng.uniform(22, 32), 2),
+        'resultMargin': round(rng.uniform(0, 15), 2),
+        'startPrice': round(rng.uniform(1.5, 60), 1),
+        'pir': ''.join(str(rng.randint(1, 8)) for _ in range(3)),
+        'firstSplitPosition': rng.randint(1, 8),
+        'firstSplitTime': round(rng.uniform(5, 9), 2),
+        'last5': ''.join(str(rng.randint(1, 8)) for _ in range(5)),
+        'careerPrizeMoney': round(rng.uniform(0, 200000), 2),
+        'comment': rng.choice(['', 'BLK', 'CRD1', 'SAW', 'FCRD4', 'MSD']),
+    }
+
+def _race(rng: random.Random, authority: str, day: datetime.date, number: int) -> dict:
+    return {
+        'meetingId': rng.randrange(100000000, 999999999),
+        'meetingDate': f"{day.isoformat()}T00:00:00",
+        'trackCode': rng.choice(TRACKS),
+        'owningAuthorityCode': authority,
+        'raceId': rng.randrange(100000000, 999999999),
+        'raceNumber': number,
+        'raceName': f"RACE {number} STAKE",
+        'raceType': rng.choice(GRADES),
+        'distance': rng.choice([300, 350, 400, 450, 515, 520, 595, 600, 715]),
+        'startTime': f"{day.isoformat()}T{12 + number // 2:02d}:{(number * 17) % 60:02d}:00+11:00",
+        'prizeMoney': float(rng.choice([1500, 2000, 3000, 7000, 15000])),
+    }
+
+class Fixtures:
+    def __init__(self, races: int = 40, bulk_rows: int = 20000, meeting_races: int = 10, seed: int = 1):
+        """
+        Generates and encodes the fixture bodies.
+
+        Args:
+            races (int, optional): Races listed per authority by /race. Default is 40.
+            bulk_rows (int, optional): Runs returned by each /bulk/runs month. Default is 20000.
+            meeting_races (int, optional): Races in each /meeting/{id}/form. Default is 10.
+            seed (int, optional): The random seed, so every run serves the same data. Default is 1.
+        """
+        rng = random.Random(seed)
+        day = datetime.date(2023, 12, 1)
+        self.races = {code: json.dumps([_race(rng, code, day, n % 12 + 1) for n in range(races)]).encode()
+                      for code in AUTHORITIES}
+        race = _race(rng, 'VIC', day, 1)
+        self.race_runs = json.dumps([_run(rng, race, box) for box in range(1, 9)]).encode()
+        meeting = {key: race[key] for key in ('meetingId', 'meetingDate', 'trackCode', 'owningAuthorityCode')}
+        meeting['races'] = []
+        for number in range(1, meeting_races + 1):
+            runs = []
+            for box in range(1, 9):
+                run = _run(rng, race, box)
+                run['form'] = [_run(rng, _race(rng, 'VIC', day - datetime.timedelta(days=7 * i), number), box)
+                               for i in range(1, 6)]
+                runs.append(run)
+            meeting['races'].append({'raceNumber': number, 'runs': runs})
+        self.meeting_form = json.dumps(meeting).encode()
+        rows = []
+        while len(rows) < bulk_rows:
+            race = _race(rng, 'VIC', day + datetime.timedelta(days=len(rows) % 28), len(rows) // 8 % 12 + 1)
+            rows.extend(_run(rng, race, box) for box in range(1, 9))
+        self.bulk_runs = json.dumps(rows[:bulk_rows]).encode()
+
+    def body(self, path: str, query: str) -> bytes:
+        if path == '/race':
+            match = re.search(r'owningauthoritycode=(\w+)', query, re.IGNORECASE)
+            return self.races.get(match.group(1) if match else 'VIC', b'[]')
+        if re.fullmatch(r'/race/\d+/runs', path):
+            return self.race_runs
+        if re.fullmatch(r'/meeting/\d+/form', path):
+            return self.meeting_form
+        if re.fullmatch(r'/bulk/runs/\w+/\d+/\d+', path):
+            return self.bulk_runs
+        return None
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # The default backlog of 5 drops concurrent connects, which then retry after a second
+
+def start(latency: float = 0.0, port: int = 0, **fixture_options):
+    """
+    Starts the stub server on a background thread.
+
+    Args:
+        latency (float, optional): Seconds to wait before answering each request. Default is 0.
+        port (int, optional): The port to listen on. Default is 0 (any free port).
+        **fixture_options: Passed to Fixtures.
+
+    Returns:
+        tuple: The server and its base URL, e.g. 'http://127.0.0.1:8080/api'.
+    """
+    fixtures = Fixtures(**fixture_options)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+        # Send the headers and body in one segment, without Nagle's algorithm, so keep-alive requests do not
+        # stall on delayed ACKs; that would measure the stub's TCP handling instead of the client.
+        disable_nagle_algorithm = True
+        wbufsize = 64 * 1024
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            path, _, query = self.path.partition('?')
+            body = fixtures.body(path[len('/api'):], query)
+            if latency:
+                time.sleep(latency)
+            status = 200 if body is not None else 404
+            body = body if body is not None else b'{"message": "Not found"}'
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = _Server(('127.0.0.1', port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0, help='Milliseconds added to every response.')
+    parser.add_argument('--races', type=int, default=40, help='Races listed per authority.')
+    parser.add_argument('--bulk-rows', type=int, default=20000, help='Runs per bulk month.')
+    args = parser.parse_args()
+    server, base_url = start(args.latency / 1000, args.port, races=args.races, bulk_rows=args.bulk_rows)
+    print(base_url, flush=True)  # The first line of output tells a parent process where to connect
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == '__main__':
+    sys.exit(main())
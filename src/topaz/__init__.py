@@ -1 +1,14 @@
-from .topaz import TopazAPI
\ No newline at end of file
+from .topaz import TopazAPI, BatchResult, AuthorityWarning
+from .async_topaz import AsyncTopazAPI
+from .cache import ResponseCache, NEVER_EXPIRE, BYPASS
+from .conditional import ConditionalStore
+from .metrics import Metrics
+from .singleflight import SingleFlight
+from .breaker import CircuitBreaker, CircuitOpenError
+from .normalize import normalize, Tables
+from .formstore import DogFormStore
+from .scheduler import RaceDayScheduler
+from .backfill import BulkRunsBackfill
+from .sync import MeetingStore, MeetingSync
+from .warehouse import RaceWarehouse
+from .transport import RecordReplayTransport, CassetteMiss
@@ -0,0 +1,570 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from .breaker import CircuitBreaker
+from .cache import cache_key
+from .conditional import RESEND, ConditionalStore
+from .metrics import Metrics
+from .ratelimit import RateLimiter, RetryPolicy, endpoint_family
+from .topaz import (_json, _frame, _restricted_json, _bulk_frame, _validate_authority_code, _validate_output,
+                    _authority_codes, _merge_authorities)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+def _httpx():
+    # httpx is an optional dependency, only needed for the async client, so it is imported when a client is created.
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError("AsyncTopazAPI requires httpx. Install it with: pip install topaz_api[async]") from None
+    return httpx
+
+class AsyncTopazAPI:
+    def __init__(self, api_key, max_concurrency: int = 10, max_keepalive_connections: int = None,
+                 keep_alive: bool = True, timeout: float = 30, rate_limit: float = None, rate_limits: dict = None,
+                 max_retries: int = 3, backoff_factor: float = 0.5, typed_frames: bool = True,
+                 conditional=True, metrics=True, output: str = 'pandas', circuit_breaker=None):
+        """
+        Creates an asyncio client with the same endpoint methods and return types as TopazAPI.
+        Every method is a coroutine and all requests share one pooled httpx.AsyncClient.
+        Rate limiting, retries, conditional polling, metrics and the circuit breaker work as in TopazAPI. Requires httpx (pip install topaz_api[async]).
+
+        Args:
+            api_key (str): Your Topaz API key.
+            max_concurrency (int, optional): The maximum number of requests in flight at once. Further calls wait
+                                             for a free slot, so many coroutines can be gathered safely. Default is 10.
+            max_keepalive_connections (int, optional): The number of idle connections kept open for reuse.
+                                                       Defaults to max_concurrency.
+            keep_alive (bool, optional): Reuse connections between requests. Default is True.
+            timeout (float, optional): The request timeout in seconds. Default is 30.
+            rate_limit (float, optional): The maximum requests per second for the whole client. Default is None (unlimited).
+            rate_limits (dict, optional): The maximum requests per second per endpoint family (the first path segment),
+                                          e.g. {'bulk': 0.5, 'race': 20}. Default is None.
+            max_retries (int, optional): The number of times a failed request is retried. 0 disables retries. Default is 3.
+            backoff_factor (float, optional): The base delay in seconds of the exponential backoff. Default is 0.5.
+            typed_frames (bool, optional): Build bulk run, race and meeting listing DataFrames with their declared
+                                           compact schema. False keeps the frames pandas infers. Default is True.
+            conditional (bool or ConditionalStore, optional): Poll the field endpoints with conditional requests.
+                                                             Default is True.
+            metrics (bool or Metrics, optional): Collect per-endpoint metrics in self.metrics. Default is True.
+            output (str, optional): What list endpoints return: 'pandas', 'pyarrow', 'polars' or 'raw'.
+                                    Every list endpoint also accepts output= per call. Default is 'pandas'.
+            circuit_breaker (bool or CircuitBreaker, optional): Fail fast per endpoint family while the server is
+                                                                failing. A breaker without metrics of its own reports
+                                                                to self.metrics. Default is None (no breaker).
+
+        Raises:
+            ImportError: If httpx is not installed.
+            ValueError: If output is not one of OUTPUTS.
+        """
+        httpx = _httpx()
+        _validate_output(output)
+
+        self.base_url = "https://topaz.grv.org.au/api"
+        self.headers = {
+            'accept': 'application/json',
+            'X-API-Key': api_key
+        }
+        if max_keepalive_connections is None:
+            max_keepalive_connections = max_concurrency
+        if not keep_alive:
+            max_keepalive_connections = 0
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = RateLimiter(rate_limit, rate_limits)
+        self.retry_policy = RetryPolicy(max_retries=max_retries, backoff_factor=backoff_factor)
+        self.typed_frames = typed_frames
+        self.output = output
+        self.conditional = ConditionalStore() if conditional is True else (conditional or None)
+        self.metrics = Metrics() if metrics is True else (metrics or None)
+        self.breaker = CircuitBreaker() if circuit_breaker is True else (circuit_breaker or None)
+        if self.breaker is not None and self.breaker.metrics is None:
+            self.breaker.metrics = self.metrics  # A breaker given without its own metrics reports to the client's
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_keepalive_connections)
+        )
+        # Created on first use so that it binds to the running event loop.
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the underlying HTTP client and all of its pooled connections.
+        """
+        await self.client.aclose()
+
+    async def _get(self, path: str, params: dict = None, headers: dict = None):
+        """
+        Sends a GET request for a path relative to the base URL, waiting for a free concurrency slot first
+        and applying the rate limiter and retry policy.
+
+        Args:
+            path (str): The endpoint path, e.g. "/race/972428497/runs".
+            params (dict, optional): Query string parameters. Default is None.
+            headers (dict, optional): Extra request headers, e.g. conditional request validators. Default is None.
+
+        Returns:
+            httpx.Response: The raw response. After the last retry this may still be an unsuccessful response.
+        """
+        import asyncio  # Imported here rather than with the package, which synchronous jobs import too
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if params:
+            # Encode parameters the way requests does for TopazAPI: None values are dropped (httpx would send an
+            # empty string) and booleans are sent as 'True'/'False' (httpx would send 'true'/'false').
+            params = {key: str(value) if isinstance(value, bool) else value
+                      for key, value in params.items() if value is not None}
+        family = endpoint_family(path)
+        attempt = 0
+        while True:
+            if self.breaker is not None:
+                if self.breaker.probe_due(family):
+                    healthy = False
+                    try:
+                        healthy = await self._probe()
+                    finally:
+                        # Report even when the probe raised or was cancelled, or the circuit would be left probing.
+                        self.breaker.probed(family, healthy)
+                await asyncio.sleep(self.breaker.before(family))  # Raises CircuitOpenError while the circuit is open
+            await asyncio.sleep(self.rate_limiter.reserve(family))
+            try:
+                async with self._semaphore:
+                    if self.metrics is not None:
+                        self.metrics.request(path, params)
+                    started = time.perf_counter()
+                    response = await self.client.get(f"{self.base_url}{path}", params=params, headers=headers)
+            except _httpx().TransportError:  # Connection errors and timeouts
+                if self.metrics is not None:
+                    self.metrics.response(path, None, time.perf_counter() - started)
+                if self.breaker is not None:
+                    self.breaker.record(family, None)
+                if not self.retry_policy.should_retry(attempt):
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+            else:
+                if self.metrics is not None:
+                    self.metrics.response(path, response.status_code, time.perf_counter() - started, len(response.content))
+                if self.breaker is not None:
+                    self.breaker.record(family, response.status_code)
+                if not self.retry_policy.should_retry(attempt, response.status_code):
+                    return response
+                delay = self.retry_policy.backoff(attempt, response.headers.get('Retry-After'))
+                if response.status_code == 429:
+                    # Throttled: hold back the client's other requests too, not just this one.
+                    self.rate_limiter.pause(family, delay)
+            if self.metrics is not None:
+                self.metrics.retry(path)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _probe(self) -> bool:
+        """
+        Awaitable version of TopazAPI._probe.
+        """
+        path = "/health"
+        if self.metrics is not None:
+            self.metrics.request(path)
+        started = time.perf_counter()
+        try:
+            response = await self.client.get(f"{self.base_url}{path}")
+        except _httpx().HTTPError:  # Connection errors, timeouts, redirect loops...
+            if self.metrics is not None:
+                self.metrics.response(path, None, time.perf_counter() - started)
+            return False
+        if self.metrics is not None:
+            self.metrics.response(path, response.status_code, time.perf_counter() - started, len(response.content))
+        return response.status_code == 200
+
+    async def _fetch(self, handler, path: str, params: dict = None, **options):
+        """
+        Sends a GET request and converts the response with one of the shared response handlers.
+
+        Args:
+            handler (callable): The response handler, e.g. _frame or _json.
+            path (str): The endpoint path, e.g. "/race/972428497/runs".
+            params (dict, optional): Query string parameters. Default is None.
+            **options: Keyword arguments for the handler, e.g. schema.
+
+        Returns:
+            The value produced by the handler.
+        """
+        if self.conditional is not None and self.conditional.matches(path):
+            key = (cache_key(path, params), handler, tuple(sorted(options.items())))
+            response = await self._get(path, params=params, headers=self.conditional.request_headers(key))
+            result = self.conditional.resolve(key, response, handler, options)
+            if result is RESEND:
+                result = self.conditional.resolve(key, await self._get(path, params=params), handler, options,
+                                                  conditional=False)
+            return result
+        return handler(await self._get(path, params=params), **options)
+
+    async def _fetch_authorities(self, method, codes: list, schema: str, output: str, **kwargs):
+        """
+        Awaitable version of TopazAPI._fetch_authorities: the authorities are fetched concurrently with gather.
+        """
+        import asyncio
+
+        fetched = await asyncio.gather(*(method(owning_authority_code=code, output='raw', **kwargs) for code in codes),
+                                       return_exceptions=True)
+        results, errors = {}, {}
+        for code, result in zip(codes, fetched):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result  # e.g. cancellation
+                errors[code] = result
+            else:
+                results[code] = result
+        return _merge_authorities(codes, results, errors, schema, output)
+
+    def _schema(self, name: str, typed: bool = None) -> str:
+        """
+        Returns the schema name to build a DataFrame with, or None for an inferred frame.
+        """
+        return name if (self.typed_frames if typed is None else typed) else None
+
+    def _output(self, output: str = None) -> str:
+        """
+        Returns the kind of value a list endpoint builds: the per-call choice if given, otherwise the client's.
+        """
+        if output is None:
+            return self.output
+        _validate_output(output)
+        return output
+
+    ### Codes
+    async def get_dog_colours(self, output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.get_dog_colours.
+        """
+        return await self._fetch(_frame, "/codes/dogcolour", output=self._output(output))
+
+    async def get_dog_colour_by_code(self, colour_code: str) -> dict:
+        """
+        Awaitable version of TopazAPI.get_dog_colour_by_code.
+        """
+        return await self._fetch(_json, f"/codes/dogcolour/{colour_code}")
+
+    async def get_owning_authorities(self, output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.get_owning_authorities.
+        """
+        return await self._fetch(_frame, "/codes/owningauthority", output=self._output(output))
+
+    async def get_owning_authority_by_code(self, authority_code: str) -> dict:
+        """
+        Awaitable version of TopazAPI.get_owning_authority_by_code.
+        """
+        return await self._fetch(_json, f"/codes/owningauthority/{authority_code}")
+
+    async def get_track_codes(self, output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.get_track_codes.
+        """
+        return await self._fetch(_frame, "/codes/track", output=self._output(output))
+
+    async def get_track_by_code(self, track_code: str) -> dict:
+        """
+        Awaitable version of TopazAPI.get_track_by_code.
+        """
+        return await self._fetch(_json, f"/codes/track/{track_code}")
+
+    async def get_grade_codes(self, output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.get_grade_codes.
+        """
+        return await self._fetch(_frame, "/codes/grade", output=self._output(output))
+
+    async def get_grade_by_code(self, grade_code: str) -> dict:
+        """
+        Awaitable version of TopazAPI.get_grade_by_code.
+        """
+        return await self._fetch(_json, f"/codes/grade/{grade_code}")
+
+    ### Dogs
+    async def get_dog_details(self, dog_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_dog_details.
+        """
+        return await self._fetch(_json, f"/dog/{dog_id}")
+
+    async def get_dog_form(self, dog_id: int, meeting_date: str = None, output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.get_dog_form.
+        """
+        params = {'meetingdate': meeting_date} if meeting_date else {}
+        return await self._fetch(_frame, f"/dog/{dog_id}/form", params=params, output=self._output(output))
+
+    async def get_dog_statistics(self, dog_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_dog_statistics.
+        """
+        return await self._fetch(_json, f"/dog/{dog_id}/statistics")
+
+    async def search_dogs(self, search_term: str, exact_match: bool = False, records: int = 300,
+                          output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.search_dogs.
+        """
+        params = {
+            'searchterm': search_term,
+            'exactmatch': exact_match,
+            'records': records
+        }
+        return await self._fetch(_frame, "/search/dogs", params=params, output=self._output(output))
+
+    ### Firstsplit
+    async def get_meeting_first_split_results(self, meeting_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_meeting_first_split_results.
+        """
+        return await self._fetch(_restricted_json, f"/meeting/{meeting_id}/results/firstsplit")
+
+    ### Isolynx
+    async def get_isolynx_splits(self, race_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_isolynx_splits.
+        """
+        return await self._fetch(_restricted_json, f"/isolynx/{race_id}/splits")
+
+    ### Meeting
+    async def get_meetings(self, from_date: str, to_date: str = None, owning_authority_code: str = None,
+                           typed: bool = None, output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.get_meetings.
+        """
+        codes = _authority_codes(owning_authority_code)
+        if codes is not None:
+            return await self._fetch_authorities(self.get_meetings, codes, self._schema('meetings', typed),
+                                                 self._output(output), from_date=from_date, to_date=to_date)
+        params = {
+            'from': from_date,
+            'to': to_date or from_date,  # Defaults to from_date if to_date is not provided
+            'owningauthoritycode': owning_authority_code
+        }
+        return await self._fetch(_frame, "/meeting", params=params, schema=self._schema('meetings', typed),
+                                 output=self._output(output))
+
+    async def get_updated_meetings(self, since: str, owning_authority_code: str = 'VIC',
+                                   typed: bool = None, output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.get_updated_meetings.
+        """
+        codes = _authority_codes(owning_authority_code)
+        if codes is not None:
+            return await self._fetch_authorities(self.get_updated_meetings, codes, self._schema('meetings', typed),
+                                                 self._output(output), since=since)
+        params = {
+            'since': since,
+            'owningauthoritycode': owning_authority_code
+        }
+        return await self._fetch(_frame, "/meeting/updated", params=params, schema=self._schema('meetings', typed),
+                                 output=self._output(output))
+
+    async def get_meeting_details(self, meeting_id: int, format: str = 'all', output: str = None):
+        """
+        Awaitable version of TopazAPI.get_meeting_details.
+        """
+        params = {'format': format}
+        if format == 'all':  # 'all' returns a dictionary, other formats a DataFrame
+            return await self._fetch(_json, f"/meeting/{meeting_id}", params=params)
+        return await self._fetch(_frame, f"/meeting/{meeting_id}", params=params, output=self._output(output))
+
+    async def get_meeting_form(self, meeting_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_meeting_form.
+        """
+        return await self._fetch(_json, f"/meeting/{meeting_id}/form")
+
+    async def get_meeting_results(self, meeting_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_meeting_results.
+        """
+        return await self._fetch(_json, f"/meeting/{meeting_id}/results")
+
+    async def get_meeting_results_first_split(self, meeting_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_meeting_results_first_split.
+        """
+        return await self._fetch(_restricted_json, f"/meeting/{meeting_id}/results/firstsplit")
+
+    async def get_meeting_races(self, meeting_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_meeting_races.
+        """
+        return await self._fetch(_json, f"/meeting/{meeting_id}/races")
+
+    async def get_races_first_split(self, meeting_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_races_first_split.
+        """
+        return await self._fetch(_restricted_json, f"/meeting/{meeting_id}/races/firstsplit")
+
+    async def get_meeting_field(self, meeting_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_meeting_field.
+        """
+        return await self._fetch(_json, f"/meeting/{meeting_id}/field")
+
+    ### Race
+    async def get_races(self, from_date: str, to_date: str = None, owning_authority_code: str = None,
+                        typed: bool = None, output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.get_races.
+        """
+        codes = _authority_codes(owning_authority_code)
+        if codes is not None:
+            return await self._fetch_authorities(self.get_races, codes, self._schema('races', typed),
+                                                 self._output(output), from_date=from_date, to_date=to_date)
+        params = {
+            'from': from_date,
+            'to': to_date or from_date,  # Defaults to from_date if to_date is not provided
+            'owningauthoritycode': owning_authority_code
+        }
+        return await self._fetch(_frame, "/race", params=params, schema=self._schema('races', typed),
+                                 output=self._output(output))
+
+    async def get_races_for_meeting(self, meeting_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_races_for_meeting.
+        """
+        return await self._fetch(_json, f"/race/meeting/{meeting_id}")
+
+    async def get_race_result(self, race_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_race_result.
+        """
+        return await self._fetch(_json, f"/race/{race_id}/result")
+
+    async def get_race_runs(self, race_id: int, output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.get_race_runs.
+        """
+        return await self._fetch(_frame, f"/race/{race_id}/runs", output=self._output(output))
+
+    async def get_race_runs_form(self, race_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_race_runs_form.
+        """
+        return await self._fetch(_json, f"/race/{race_id}/runs/form")
+
+    async def get_race_field(self, race_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_race_field.
+        """
+        return await self._fetch(_json, f"/race/{race_id}/field")
+
+    async def get_race_runs_first_split(self, race_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_race_runs_first_split.
+        """
+        return await self._fetch(_restricted_json, f"/race/{race_id}/runs/firstsplit")
+
+    async def get_race_first_split(self, race_id: int) -> dict:
+        """
+        Awaitable version of TopazAPI.get_race_first_split.
+        """
+        return await self._fetch(_restricted_json, f"/race/{race_id}/firstsplit")
+
+    async def get_upcoming_races(self, from_datetime: str = None, typed: bool = None,
+                                 output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.get_upcoming_races.
+        """
+        params = {'from': from_datetime} if from_datetime else {}
+        return await self._fetch(_frame, "/race/upcoming", params=params, schema=self._schema('races', typed),
+                                 output=self._output(output))
+
+    ### RaceResult
+    async def get_recent_race_results(self) -> dict:
+        """
+        Awaitable version of TopazAPI.get_recent_race_results.
+        """
+        return await self._fetch(_json, "/raceresult/recent")
+
+    ### Race
+    async def get_runs_for_race(self, race_id: int, output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.get_runs_for_race.
+        """
+        return await self._fetch(_frame, f"/run/race/{race_id}", output=self._output(output))
+
+    ### System
+    async def get_change_log(self) -> dict:
+        """
+        Awaitable version of TopazAPI.get_change_log.
+        """
+        return await self._fetch(_json, "/changelog")
+
+    async def get_server_health(self) -> dict:
+        """
+        Awaitable version of TopazAPI.get_server_health.
+        """
+        return await self._fetch(_json, "/health")
+
+    async def get_cache_health(self) -> dict:
+        """
+        Awaitable version of TopazAPI.get_cache_health.
+        """
+        return await self._fetch(_json, "/health/cache")
+
+    ### Trainers
+    async def search_trainers(self, search_term: str, exact_match: bool = False, records: int = 300,
+                              output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.search_trainers.
+        """
+        params = {
+            'searchterm': search_term,
+            'exactmatch': exact_match,
+            'records': records
+        }
+        return await self._fetch(_frame, "/search/trainers", params=params, output=self._output(output))
+
+    ### TrialResults
+    async def get_trial_results(self, from_date: str, to_date: str = None, output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.get_trial_results.
+        """
+        params = {
+            'from': from_date,
+            'to': to_date or from_date  # Defaults to from_date if to_date is not provided
+        }
+        return await self._fetch(_frame, "/trialresult", params=params, output=self._output(output))
+
+    ### Bulk Data
+    async def get_bulk_runs_by_day(self, owning_authority_code: str, year: int, month: int, day: int,
+                                   typed: bool = None, output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.get_bulk_runs_by_day.
+        """
+        codes = _authority_codes(owning_authority_code)
+        if codes is not None:
+            return await self._fetch_authorities(self.get_bulk_runs_by_day, codes, self._schema('bulk_runs', typed),
+                                                 self._output(output), year=year, month=month, day=day)
+        _validate_authority_code(owning_authority_code)
+        return await self._fetch(_bulk_frame, f"/bulk/runs/{owning_authority_code}/{year}/{month}/{day}",
+                                 schema=self._schema('bulk_runs', typed), output=self._output(output))
+
+    async def get_bulk_runs_by_month(self, owning_authority_code: str, year: int, month: int,
+                                     typed: bool = None, output: str = None) -> pd.DataFrame:
+        """
+        Awaitable version of TopazAPI.get_bulk_runs_by_month.
+        """
+        codes = _authority_codes(owning_authority_code)
+        if codes is not None:
+            return await self._fetch_authorities(self.get_bulk_runs_by_month, codes, self._schema('bulk_runs', typed),
+                                                 self._output(output), year=year, month=month)
+        _validate_authority_code(owning_authority_code)
+        return await self._fetch(_bulk_frame, f"/bulk/runs/{owning_authority_code}/{year}/{month}",
+                                 schema=self._schema('bulk_runs', typed), output=self._output(output))
@@ -0,0 +1,231 @@
+import datetime
+import glob
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import period_is_final
+from .ratelimit import TokenBucket
+from .schema import SCHEMAS, _arrow_type, build_arrow
+from .topaz import _validate_authority_code
+
+MANIFEST = '_manifest.json'
+
+# Partition states recorded in the manifest. DONE and NO_DATA partitions are not fetched again once final.
+DONE = 'done'
+NO_DATA = 'no_data'
+FAILED = 'failed'
+
+def _to_date(value) -> datetime.date:
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(value)
+
+def _write_parquet(records: list, path: str):
+    # Every declared bulk_runs column is written, as missing values if a partition has none, so all files share
+    # the declared schema. Naive timestamps are taken as UTC. Undeclared columns follow at a fixed width too.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = build_arrow(records, 'bulk_runs')
+    declared = SCHEMAS['bulk_runs']
+    columns = {name: (table.column(name) if name in table.column_names else pa.nulls(len(table)), _arrow_type(kind))
+               for name, kind in declared.items()}
+    for name, column in zip(table.column_names, table.columns):
+        if name in declared:
+            continue
+        dtype = column.type
+        if pa.types.is_integer(dtype):
+            dtype = pa.int64()
+        elif pa.types.is_null(dtype):  # An all-missing column has no values to type it
+            dtype = pa.string()
+        columns[name] = column, dtype
+
+    arrays = []
+    for column, dtype in columns.values():
+        if pa.types.is_dictionary(dtype) and not pa.types.is_dictionary(column.type):
+            column = column.cast(pa.string())  # e.g. codes the API sent as numbers
+        arrays.append(column.cast(dtype))
+    pq.write_table(pa.Table.from_arrays(arrays, schema=pa.schema(list(zip(columns, (a.type for a in arrays))))), path)
+
+class BulkRunsBackfill:
+    def __init__(self, api, authorities: list, start, end, path: str, granularity: str = 'month',
+                 max_workers: int = 4, rate_limit: float = None, chunk_size: int = None):
+        """
+        A resumable, parallel backfill of bulk run data into a Parquet dataset partitioned as
+        authority=<code>/year=<yyyy>/month=<m>. Progress is recorded in a manifest at the root of the dataset,
+        so a rerun only fetches partitions that are missing, failed, or were not yet final when last fetched.
+        Requires pyarrow (pip install topaz_api[parquet]).
+
+        Args:
+            api (TopazAPI): The client to fetch with.
+            authorities (list): The owning authority codes, e.g. ['NSW', 'VIC'].
+            start (str or date): The first day to fetch, e.g. '2020-01-01'.
+            end (str or date): The last day to fetch, inclusive.
+            path (str): The root directory of the dataset.
+            granularity (str, optional): 'month' for one get_bulk_runs_by_month request per month,
+                                         or 'day' for one get_bulk_runs_by_day request per day. Default is 'month'.
+            max_workers (int, optional): The number of partitions fetched concurrently. Default is 4.
+            rate_limit (float, optional): The maximum requests per second of the backfill. Default is None (unlimited).
+            chunk_size (int, optional): Stream each response and write it as Parquet files of at most chunk_size rows,
+                                        so memory use no longer grows with the size of a month. Default is None
+                                        (each partition is fetched and written as a single file).
+        """
+        if granularity not in ('month', 'day'):
+            raise ValueError(f"Invalid granularity: {granularity}. Must be 'month' or 'day'")
+        for code in authorities:
+            _validate_authority_code(code)
+        self.api = api
+        self.authorities = list(authorities)
+        self.start = _to_date(start)
+        self.end = _to_date(end)
+        self.path = path
+        self.granularity = granularity
+        self.max_workers = max_workers
+        self.bucket = TokenBucket(rate_limit) if rate_limit else None
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(os.path.join(self.path, MANIFEST)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save_manifest(self):
+        # Write to a temporary file and swap it in, so a crash never leaves a truncated manifest behind.
+        os.makedirs(self.path, exist_ok=True)
+        target = os.path.join(self.path, MANIFEST)
+        with open(target + '.tmp', 'w') as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+        os.replace(target + '.tmp', target)
+
+    def plan(self) -> list:
+        """
+        Lists every partition in the range as (authority, year, month, day) tuples, where day is None for
+        monthly requests.
+        """
+        periods = []
+        if self.granularity == 'month':
+            year, month = self.start.year, self.start.month
+            while (year, month) <= (self.end.year, self.end.month):
+                periods.append((year, month, None))
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        else:
+            day = self.start
+            while day <= self.end:
+                periods.append((day.year, day.month, day.day))
+                day += datetime.timedelta(days=1)
+        return [(code, *period) for code in self.authorities for period in periods]
+
+    def _key(self, partition: tuple) -> str:
+        code, year, month, day = partition
+        return f"{code}/{year}/{month}" + (f"/{day}" if day else "")
+
+    def _location(self, partition: tuple) -> tuple:
+        # A partition is written as <directory>/<stem>-00000.parquet, <stem>-00001.parquet, ...
+        code, year, month, day = partition
+        stem = f"day-{day:02d}" if day else "data"
+        return os.path.join(self.path, f"authority={code}", f"year={year}", f"month={month}"), stem
+
+    def _batches(self, partition: tuple):
+        code, year, month, day = partition
+        if self.chunk_size:
+            if day:
+                return self.api.iter_bulk_runs_by_day(code, year, month, day, chunk_size=self.chunk_size, output='raw')
+            return self.api.iter_bulk_runs_by_month(code, year, month, chunk_size=self.chunk_size, output='raw')
+        if day:
+            records = self.api.get_bulk_runs_by_day(code, year, month, day, output='raw')
+        else:
+            records = self.api.get_bulk_runs_by_month(code, year, month, output='raw')
+        return [records] if records else []
+
+    def _write(self, partition: tuple) -> int:
+        # Write the new files under temporary names and only swap them in once the whole partition has been
+        # fetched, so a failure halfway through leaves the previous files untouched.
+        directory, stem = self._location(partition)
+        written = []
+        rows = 0
+        try:
+            for part, records in enumerate(self._batches(partition)):
+                if not written:
+                    os.makedirs(directory, exist_ok=True)
+                target = os.path.join(directory, f"{stem}-{part:05d}.parquet")
+                _write_parquet(records, target + '.tmp')
+                written.append(target)
+                rows += len(records)
+        except BaseException:
+            for target in written:
+                os.remove(target + '.tmp')
+            raise
+        for old in glob.glob(os.path.join(glob.escape(directory), f"{stem}-*.parquet")):
+            os.remove(old)
+        for target in written:
+            os.replace(target + '.tmp', target)
+        return rows
+
+    def pending(self) -> list:
+        """
+        Lists the partitions a run would fetch: those never fetched, those that failed,
+        and those fetched before their period was final.
+        """
+        pending = []
+        for partition in self.plan():
+            entry = self.manifest.get(self._key(partition))
+            if entry is None or entry['status'] == FAILED or not entry.get('final'):
+                pending.append(partition)
+        return pending
+
+    def _fetch(self, partition: tuple) -> dict:
+        _, year, month, day = partition
+        if self.bucket is not None:
+            self.bucket.acquire()
+        final = period_is_final(year, month, day)
+        try:
+            rows = self._write(partition)
+        except Exception as e:
+            return {'status': FAILED, 'error': f"{type(e).__name__}: {e}"}
+
+        fetched_at = datetime.datetime.now().isoformat(timespec='seconds')
+        # The API answers 404 when there were no runs; that is a result, not a failure.
+        status = DONE if rows else NO_DATA
+        return {'status': status, 'rows': rows, 'final': final, 'fetched_at': fetched_at}
+
+    def _record(self, partition: tuple, entry: dict):
+        with self._lock:
+            self.manifest[self._key(partition)] = entry
+            self._save_manifest()
+
+    def run(self) -> dict:
+        """
+        Fetches every pending partition and records each outcome in the manifest as soon as it is known.
+
+        Returns:
+            dict: The number of partitions per outcome ('done', 'no_data', 'failed') in this run,
+                  and 'skipped' for the partitions that were already complete.
+        """
+        pending = self.pending()
+        summary = {DONE: 0, NO_DATA: 0, FAILED: 0, 'skipped': len(self.plan()) - len(pending)}
+        if not pending:
+            return summary
+
+        def work(partition):
+            entry = self._fetch(partition)
+            self._record(partition, entry)
+            return entry['status']
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for status in executor.map(work, pending):
+                summary[status] += 1
+        return summary
+
+    def failures(self) -> dict:
+        """
+        Returns the error message of every failed partition, keyed by 'authority/year/month[/day]'.
+        """
+        return {key: entry['error'] for key, entry in self.manifest.items() if entry['status'] == FAILED}
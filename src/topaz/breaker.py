@@ -0,0 +1,220 @@
+import threading
+import time
+
+from .ratelimit import TokenBucket
+
+# Circuit states.
+CLOSED = 'closed'          # Requests flow normally
+OPEN = 'open'              # Requests fail fast until the reset timeout has passed
+PROBING = 'probing'        # One caller is checking the health endpoint; the others still fail fast (for at most
+                           # reset_timeout, in case the probe never reports back)
+RECOVERING = 'recovering'  # The server is healthy again; requests are let through at a rate that grows back
+
+class CircuitOpenError(Exception):
+    def __init__(self, family: str, retry_in: float):
+        """
+        Raised instead of sending a request while the circuit of its endpoint family is open.
+
+        Args:
+            family (str): The endpoint family, e.g. 'race'.
+            retry_in (float): The number of seconds until the health endpoint is probed again.
+        """
+        super().__init__(f"The circuit for '{family}' requests is open after repeated failures; "
+                         f"the server health is checked again in {retry_in:.0f}s.")
+        self.family = family
+        self.retry_in = retry_in
+
+class _Circuit:
+    __slots__ = ('state', 'failures', 'changed_at', 'opens', 'rejected', 'bucket')
+
+    def __init__(self, now: float):
+        self.state = CLOSED
+        self.failures = 0  # Consecutive failed attempts
+        self.changed_at = now
+        self.opens = 0
+        self.rejected = 0
+        self.bucket = None
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30, recovery_rate: float = 1,
+                 recovery_interval: float = 5, recovery_time: float = 30, metrics=None, on_change=None,
+                 clock=time.monotonic):
+        """
+        A circuit breaker per endpoint family. After failure_threshold consecutive attempts to a family fail with a
+        connection error, a timeout or a 5xx response, its circuit opens and its requests raise CircuitOpenError
+        at once instead of waiting on a struggling server. Once reset_timeout has passed, the next request first
+        probes the server health endpoint. If the server is healthy, requests are let through again at
+        recovery_rate per second, doubling every recovery_interval seconds, and the circuit closes after
+        recovery_time seconds without a failure. A failed probe, or any failure while recovering, opens it again.
+
+        Args:
+            failure_threshold (int, optional): The number of consecutive failed attempts that opens a circuit.
+                                               Default is 5.
+            reset_timeout (float, optional): The number of seconds a circuit stays open before probing. Default is 30.
+            recovery_rate (float, optional): The requests per second let through right after a successful probe.
+                                             Default is 1.
+            recovery_interval (float, optional): The number of seconds after which the recovery rate doubles.
+                                                 Default is 5.
+            recovery_time (float, optional): The number of seconds of recovery after which the circuit closes.
+                                             Default is 30.
+            metrics (Metrics, optional): Records state changes and rejected requests per family. Default is None.
+            on_change (callable, optional): Called as on_change(family, old_state, new_state) on every state change.
+            clock (callable, optional): Returns the current time in seconds. Default is time.monotonic.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.recovery_rate = recovery_rate
+        self.recovery_interval = recovery_interval
+        self.recovery_time = recovery_time
+        self.metrics = metrics
+        self.on_change = on_change
+        self.clock = clock
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, family: str) -> _Circuit:
+        circuit = self._circuits.get(family)
+        if circuit is None:
+            circuit = self._circuits[family] = _Circuit(self.clock())
+        return circuit
+
+    def _change(self, family: str, circuit: _Circuit, state: str, now: float) -> tuple:
+        # Called with the lock held. Returns the change, to be reported once the lock is released.
+        old, circuit.state, circuit.changed_at = circuit.state, state, now
+        if state == OPEN:
+            circuit.opens += 1
+        if state == RECOVERING:
+            circuit.bucket = TokenBucket(self.recovery_rate, burst=1, clock=self.clock)
+        elif state == CLOSED:
+            circuit.bucket = None
+        return family, old, state
+
+    def _expire_probe(self, family: str, circuit: _Circuit, now: float) -> tuple:
+        # Called with the lock held. A probe that has not reported back within reset_timeout is abandoned: the
+        # circuit goes back to OPEN with its reset timeout already passed, so the next caller probes again.
+        if circuit.state != PROBING or now < circuit.changed_at + self.reset_timeout:
+            return None
+        circuit.state, circuit.changed_at = OPEN, now - self.reset_timeout
+        return family, PROBING, OPEN
+
+    def _report(self, change: tuple):
+        if change is None:
+            return
+        family, old, state = change
+        if self.metrics is not None:
+            self.metrics.circuit_change(family, state)
+        if self.on_change is not None:
+            self.on_change(family, old, state)
+
+    def probe_due(self, family: str) -> bool:
+        """
+        Whether the caller should probe the server health before its request. Only one caller is told to probe
+        when a circuit's reset timeout has passed; it must report the outcome with probed.
+        """
+        expired = change = None
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if circuit is None:
+                return False
+            now = self.clock()
+            expired = self._expire_probe(family, circuit, now)
+            if circuit.state == OPEN and now >= circuit.changed_at + self.reset_timeout:
+                change = self._change(family, circuit, PROBING, now)
+        self._report(expired)
+        self._report(change)
+        return change is not None
+
+    def probed(self, family: str, healthy: bool):
+        """
+        Records the outcome of a health probe: a healthy server starts the recovery, otherwise the circuit reopens.
+        """
+        with self._lock:
+            circuit = self._circuit(family)
+            change = self._change(family, circuit, RECOVERING if healthy else OPEN, self.clock())
+        self._report(change)
+
+    def before(self, family: str) -> float:
+        """
+        Admits a request to an endpoint family.
+
+        Returns:
+            float: The number of seconds the caller must wait before sending, while the circuit is recovering.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or being probed.
+        """
+        expired = change = retry_in = None
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if circuit is None or circuit.state == CLOSED:
+                return 0.0
+            now = self.clock()
+            expired = self._expire_probe(family, circuit, now)
+            if circuit.state in (OPEN, PROBING):
+                circuit.rejected += 1
+                retry_in = max(0.0, circuit.changed_at + self.reset_timeout - now)
+            elif now >= circuit.changed_at + self.recovery_time:
+                change = self._change(family, circuit, CLOSED, now)
+                wait = 0.0
+            else:
+                circuit.bucket.rate = self.recovery_rate * 2 ** int((now - circuit.changed_at) / self.recovery_interval)
+                wait = circuit.bucket.reserve()
+        self._report(expired)
+        if retry_in is not None:
+            if self.metrics is not None:
+                self.metrics.circuit_rejected(family)
+            raise CircuitOpenError(family, retry_in)
+        self._report(change)
+        return wait
+
+    def record(self, family: str, status_code: int = None):
+        """
+        Records the outcome of an attempt: its status code, or None for a connection error or timeout.
+        Only 5xx responses and connection errors count as failures; any other response shows the server is up.
+        """
+        failed = status_code is None or status_code >= 500
+        change = None
+        with self._lock:
+            circuit = self._circuit(family)
+            if not failed:
+                circuit.failures = 0
+                return
+            circuit.failures += 1
+            if circuit.state == RECOVERING or (circuit.state == CLOSED and circuit.failures >= self.failure_threshold):
+                change = self._change(family, circuit, OPEN, self.clock())
+        self._report(change)
+
+    def state(self, family: str) -> str:
+        """
+        Returns the state of a family's circuit: 'closed', 'open', 'probing' or 'recovering'.
+        """
+        with self._lock:
+            circuit = self._circuits.get(family)
+            return CLOSED if circuit is None else circuit.state
+
+    def states(self) -> dict:
+        """
+        Returns the state of every circuit used so far, keyed by endpoint family, e.g.
+        {'race': {'state': 'open', 'failures': 5, 'opens': 1, 'rejected': 12, 'since': 12.5}}, where since is
+        the number of seconds spent in the current state.
+        """
+        with self._lock:
+            now = self.clock()
+            return {family: {'state': circuit.state, 'failures': circuit.failures, 'opens': circuit.opens,
+                             'rejected': circuit.rejected, 'since': now - circuit.changed_at}
+                    for family, circuit in sorted(self._circuits.items())}
+
+    def reset(self, family: str = None):
+        """
+        Closes one circuit, or every circuit, at once.
+        """
+        changes = []
+        with self._lock:
+            for name, circuit in self._circuits.items():
+                if family is not None and name != family:
+                    continue
+                if circuit.state != CLOSED:
+                    changes.append(self._change(name, circuit, CLOSED, self.clock()))
+                circuit.failures = 0
+        for change in changes:
+            self._report(change)
@@ -0,0 +1,191 @@
+import datetime
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+# TTL values. A policy maps an endpoint to a number of seconds, to NEVER_EXPIRE or to BYPASS,
+# or to a callable (path, params, body) -> ttl that decides per response.
+NEVER_EXPIRE = None
+BYPASS = 0
+
+# Data for a period is treated as final once the period ended this many days ago.
+FINAL_AFTER_DAYS = 7
+
+_MEETING_DATE = re.compile(rb'"meetingDate"\s*:\s*"(\d{4}-\d{2}-\d{2})')
+
+def _is_final(last_day: datetime.date) -> bool:
+    return (datetime.date.today() - last_day).days >= FINAL_AFTER_DAYS
+
+def period_is_final(year: int, month: int, day: int = None) -> bool:
+    """
+    Whether a day, or a whole month if day is None, ended more than FINAL_AFTER_DAYS ago.
+    """
+    if day:
+        last_day = datetime.date(year, month, day)
+    else:
+        last_day = datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.timedelta(days=1)
+    return _is_final(last_day)
+
+def meeting_results_ttl(path: str, params: dict, body: bytes):
+    """
+    Results of a meeting that ran more than FINAL_AFTER_DAYS ago never change, so they never expire.
+    Results of recent meetings are cached for a minute.
+    """
+    match = _MEETING_DATE.search(body)
+    if match and _is_final(datetime.date.fromisoformat(match.group(1).decode())):
+        return NEVER_EXPIRE
+    return 60
+
+def bulk_runs_ttl(path: str, params: dict, body: bytes):
+    """
+    Bulk runs for a day or month that closed more than FINAL_AFTER_DAYS ago never expire.
+    Bulk runs for open periods are cached for an hour.
+    """
+    year, month, *day = (int(part) for part in path.rstrip('/').split('/')[4:])
+    return NEVER_EXPIRE if period_is_final(year, month, *day) else 3600
+
+# Checked in order; the first pattern that fully matches the path wins. Endpoints that match no pattern are not cached.
+DEFAULT_POLICIES = [
+    (r'/codes/.*', 6 * 3600),
+    (r'/meeting/\d+/results(/firstsplit)?', meeting_results_ttl),
+    (r'/bulk/runs/\w+/\d+/\d+(/\d+)?', bulk_runs_ttl),
+    (r'/meeting/\d+/field(/\d+)?', BYPASS),
+    (r'/race/\d+/field', BYPASS),
+]
+
+def cache_key(path: str, params: dict = None) -> str:
+    """
+    Returns the cache key of a request: its path and its non-empty query parameters in sorted order.
+    """
+    params = sorted((key, value) for key, value in (params or {}).items() if value is not None)
+    return f"{path}?{urlencode(params)}" if params else path
+
+class ResponseCache:
+    def __init__(self, path: str = 'topaz_cache.sqlite', max_bytes: int = 512 * 1024 ** 2, policies=None):
+        """
+        A persistent cache of successful API responses, stored in a local SQLite file.
+        Entries are keyed by endpoint path plus query parameters and expire according to per-endpoint TTL policies.
+        When the stored bodies exceed max_bytes, the least recently used entries are evicted.
+
+        Args:
+            path (str, optional): The cache file. Default is 'topaz_cache.sqlite' in the working directory.
+            max_bytes (int, optional): The maximum total size of the cached bodies. Default is 512 MiB.
+            policies (list or dict, optional): (path regex, ttl) pairs checked before DEFAULT_POLICIES, e.g.
+                                               {r'/race/\\d+/result': 3600, r'/meeting/\\d+/form': BYPASS}.
+                                               A ttl is seconds, NEVER_EXPIRE, BYPASS, or a callable
+                                               (path, params, body) -> ttl.
+        """
+        if isinstance(policies, dict):
+            policies = list(policies.items())
+        self.policies = [(re.compile(pattern), ttl) for pattern, ttl in (policies or []) + DEFAULT_POLICIES]
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.expanduser(path), check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires REAL,
+                accessed REAL NOT NULL
+            )''')
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+
+    def policy(self, path: str):
+        """
+        Returns the TTL policy for an endpoint path, or BYPASS if no policy matches.
+        """
+        for pattern, ttl in self.policies:
+            if pattern.fullmatch(path):
+                return ttl
+        return BYPASS
+
+    def is_cacheable(self, path: str) -> bool:
+        return self.policy(path) != BYPASS
+
+    def get(self, key: str):
+        """
+        Looks up a cached response and counts a hit or a miss.
+
+        Args:
+            key (str): The cache key, see cache_key.
+
+        Returns:
+            tuple: (status, headers, body) of the cached response, or None if it is missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute('SELECT status, headers, body, expires FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None or (row[3] is not None and row[3] <= now):
+                self.misses += 1
+                return None
+            self._db.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+            self.hits += 1
+        status, headers, body, _ = row
+        return status, json.loads(headers), body
+
+    def set(self, key: str, path: str, params: dict, status: int, headers: dict, body: bytes):
+        """
+        Stores a response according to the TTL policy of its path, then evicts entries if the cache is too large.
+        """
+        ttl = self.policy(path)
+        if callable(ttl):
+            ttl = ttl(path, params, body)
+        if ttl == BYPASS or len(body) > self.max_bytes:
+            return
+        now = time.time()
+        expires = None if ttl is NEVER_EXPIRE else now + ttl
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             (key, status, json.dumps(dict(headers)), body, len(body), expires, now))
+            self._evict(now)
+
+    def _evict(self, now: float):
+        self._db.execute('DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?', (now,))
+        excess = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        # Walk the entries from least to most recently used until enough bytes have been freed.
+        evicted = []
+        for key, size in self._db.execute('SELECT key, size FROM responses ORDER BY accessed'):
+            evicted.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._db.executemany('DELETE FROM responses WHERE key = ?', evicted)
+
+    def stats(self) -> dict:
+        """
+        Returns the hit and miss counters of this process and the number and total size of the stored entries.
+        """
+        with self._lock:
+            entries, size = self._db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'bytes': size,
+        }
+
+    def clear(self):
+        """
+        Removes every entry from the cache.
+        """
+        with self._lock:
+            self._db.execute('DELETE FROM responses')
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,354 @@
+"""
+The topaz command: pulls data from the Topaz API and streams it as NDJSON (one JSON record per line), CSV or Parquet.
+
+    topaz races --from 2023-12-01 --to 2023-12-31 --authority VIC NSW > races.ndjson
+    topaz runs --from 2023-12-01 --authority VIC --workers 8 | jq .dogName
+    topaz races --from 2023-12-01 | jq .raceId | topaz runs - --format csv --output runs.csv
+    topaz bulk --authority VIC --from 2023-01 --to 2023-12 --format parquet --output runs.parquet
+
+Records are written as they are decoded and are never collected into a DataFrame, so memory depends on --workers
+and --chunk-size, not on the size of the pull. Requests run on --workers threads and records are written in the order they arrive. The API key is read
+from --api-key or the TOPAZ_API_KEY environment variable.
+"""
+import argparse
+import csv
+import datetime
+import json
+import os
+import queue
+import sys
+import threading
+
+from .schema import SCHEMAS, _arrow_type, build_arrow
+from .topaz import TopazAPI, VALID_AUTHORITY_CODES
+
+FORMATS = ('ndjson', 'csv', 'parquet')
+
+# The declared schema (see schema.SCHEMAS) of the records of each command, used to type Parquet columns.
+PARQUET_SCHEMAS = {'bulk': 'bulk_runs', 'races': 'races', 'meetings': 'meetings'}
+
+_DONE = object()
+
+class _Failure:
+    __slots__ = ('label', 'error')
+
+    def __init__(self, label: str, error: Exception):
+        self.label = label
+        self.error = error
+
+def _dates(from_date: str, to_date: str = None) -> list:
+    start = datetime.date.fromisoformat(from_date)
+    end = datetime.date.fromisoformat(to_date) if to_date else start
+    if end < start:
+        raise ValueError(f"--to {to_date} is before --from {from_date}")
+    return [(start + datetime.timedelta(days=offset)).isoformat() for offset in range((end - start).days + 1)]
+
+def _periods(from_period: str, to_period: str = None) -> list:
+    # Whole months for yyyy-mm bounds, single days for yyyy-mm-dd bounds: (year, month, day or None).
+    to_period = to_period or from_period
+    if len(from_period) > 7 or len(to_period) > 7:
+        return [(int(day[:4]), int(day[5:7]), int(day[8:10])) for day in _dates(from_period, to_period)]
+    year, month = int(from_period[:4]), int(from_period[5:7])
+    end = (int(to_period[:4]), int(to_period[5:7]))
+    if end < (year, month):
+        raise ValueError(f"--to {to_period} is before --from {from_period}")
+    periods = []
+    while (year, month) <= end:
+        periods.append((year, month, None))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return periods
+
+def _ids(values: list) -> list:
+    # IDs from the command line, or one per line from stdin for '-', e.g. piped from jq.
+    ids = []
+    for value in values:
+        if value == '-':
+            ids.extend(int(line) for line in (line.strip().strip('"') for line in sys.stdin) if line)
+        else:
+            ids.append(int(value))
+    return list(dict.fromkeys(ids))
+
+def _tagged(records, column: str, value) -> list:
+    # Tag each record with the ID it was fetched for, as the batch methods do, unless it already has one.
+    for record in records or []:
+        record.setdefault(column, value)
+    return records or []
+
+def _stream(tasks: list, workers: int, on_error):
+    """
+    Runs tasks on a pool of threads and yields the lists of records they produce as they arrive.
+    Each task is a (label, callable) pair and the callable returns an iterable of record lists, so a task may stream
+    many chunks. At most one chunk per worker is held waiting for the writer; producers wait when it falls behind.
+    """
+    pending = queue.Queue()
+    for task in tasks:
+        pending.put(task)
+    chunks = queue.Queue(maxsize=workers)
+
+    def work():
+        while True:
+            try:
+                label, task = pending.get_nowait()
+            except queue.Empty:
+                chunks.put(_DONE)
+                return
+            try:
+                for chunk in task():
+                    chunks.put(chunk)
+            except Exception as e:
+                chunks.put(_Failure(label, e))
+
+    threads = [threading.Thread(target=work, daemon=True) for _ in range(max(1, min(workers, len(tasks))))]
+    for thread in threads:
+        thread.start()
+    running = len(threads)
+    while running:
+        chunk = chunks.get()
+        if chunk is _DONE:
+            running -= 1
+        elif isinstance(chunk, _Failure):
+            on_error(chunk.label, chunk.error)
+        else:
+            yield chunk
+
+class _NdjsonWriter:
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, records: list):
+        self.out.write(''.join(json.dumps(record, separators=(',', ':'), default=str) + '\n' for record in records))
+
+    def close(self):
+        _close(self.out)
+
+class _CsvWriter:
+    # The header is taken from the first chunk. Fields that first appear in a later chunk are left out,
+    # and fields a record does not have are written empty.
+    def __init__(self, out):
+        self.out = out
+        self.writer = None
+
+    def write(self, records: list):
+        if not records:
+            return
+        if self.writer is None:
+            fields = list(dict.fromkeys(key for record in records for key in record))
+            self.writer = csv.DictWriter(self.out, fields, extrasaction='ignore')
+            self.writer.writeheader()
+        self.writer.writerows({key: _csv_value(value) for key, value in record.items()} for record in records)
+
+    def close(self):
+        _close(self.out)
+
+def _close(out):
+    if out is sys.stdout:
+        out.flush()
+    else:
+        out.close()
+
+def _csv_value(value):
+    return json.dumps(value, separators=(',', ':')) if isinstance(value, (dict, list)) else value
+
+class _ParquetWriter:
+    # Declared columns (see schema.SCHEMAS) are stored at their fixed types, so every chunk fits them. Undeclared
+    # columns take their type from the first chunk, widened to int64 for integers, or text when they have no values
+    # yet. Columns that first appear in a later chunk, and values that do not fit their column, are left out and
+    # reported on stderr once per column.
+    def __init__(self, path: str, schema: str = None):
+        self.path = path
+        self.declared = SCHEMAS.get(schema, {})
+        self.schema = None
+        self.writer = None
+        self._reported = set()
+
+    def _report(self, column: str, problem: str):
+        if column not in self._reported:
+            self._reported.add(column)
+            print(f"topaz: {self.path}: column '{column}' {problem}", file=sys.stderr)
+
+    def _open(self, table):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        fields = {name: _arrow_type(kind) for name, kind in self.declared.items()}
+        for field in table.schema:
+            if field.name in fields:
+                continue
+            if pa.types.is_integer(field.type):
+                fields[field.name] = pa.int64()
+            elif pa.types.is_null(field.type):
+                fields[field.name] = pa.string()
+            else:
+                fields[field.name] = field.type
+        self.schema = pa.schema(list(fields.items()))
+        self.writer = pq.ParquetWriter(self.path, self.schema)
+
+    def _column(self, table, field):
+        import pyarrow as pa
+
+        if field.name not in table.column_names:
+            return pa.nulls(len(table), field.type)
+        column = table.column(field.name)
+        if pa.types.is_dictionary(field.type) and not pa.types.is_dictionary(column.type):
+            column = column.cast(pa.string())  # e.g. codes the API sent as numbers
+        elif field.type == pa.string() and not (pa.types.is_string(column.type) or pa.types.is_null(column.type)):
+            self._report(field.name, f"had no values in the first chunk; its {column.type} values are written as text")
+        try:
+            return column.cast(field.type)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            self._report(field.name, f"has values that are not {field.type}; they are left out")
+            return pa.nulls(len(table), field.type)
+
+    def write(self, records: list):
+        import pyarrow as pa
+
+        if not records:
+            return
+        table = build_arrow(records, self.declared)
+        if self.writer is None:
+            self._open(table)
+        for name in table.column_names:
+            if self.schema.get_field_index(name) < 0:
+                self._report(name, "first appeared after the first chunk and is left out")
+        columns = [self._column(table, field) for field in self.schema]
+        self.writer.write_table(pa.Table.from_arrays(columns, schema=self.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+def _writer(args):
+    if args.format == 'parquet':
+        if not args.output:
+            raise ValueError("--format parquet needs --output")
+        return _ParquetWriter(args.output, PARQUET_SCHEMAS.get(args.command))
+    out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    return _CsvWriter(out) if args.format == 'csv' else _NdjsonWriter(out)
+
+def _authorities(args) -> list:
+    return args.authority or [None]
+
+def _listing_tasks(api, args, method) -> list:
+    # One request per day and authority, so a long range streams out day by day.
+    return [(f"{day} {code or ''}".strip(),
+             lambda day=day, code=code: [method(from_date=day, to_date=day, owning_authority_code=code)])
+            for day in _dates(args.from_date, args.to_date) for code in _authorities(args)]
+
+def _race_ids(api, args) -> list:
+    ids = _ids(args.race_ids)
+    if args.from_date:
+        _dates(args.from_date, args.to_date)  # Validates the range
+        for code in _authorities(args):
+            races = api.get_races_range(args.from_date, args.to_date, owning_authority_code=code,
+                                        max_workers=args.workers, output='raw')
+            ids.extend(race['raceId'] for race in races)
+    return list(dict.fromkeys(ids))
+
+def _tasks(api, args) -> list:
+    if args.command == 'races':
+        return _listing_tasks(api, args, api.get_races)
+    if args.command == 'meetings':
+        return _listing_tasks(api, args, api.get_meetings)
+    if args.command == 'trials':
+        return [(day, lambda day=day: [api.get_trial_results(from_date=day)])
+                for day in _dates(args.from_date, args.to_date)]
+    if args.command == 'runs':
+        return [(str(race_id), lambda race_id=race_id: [_tagged(api.get_race_runs(race_id), 'raceId', race_id)])
+                for race_id in _race_ids(api, args)]
+    if args.command == 'form':
+        return [(str(dog_id), lambda dog_id=dog_id: [_tagged(api.get_dog_form(dog_id, meeting_date=args.as_at),
+                                                             'dogId', dog_id)])
+                for dog_id in _ids(args.dog_ids)]
+    if args.command == 'bulk':
+        tasks = []
+        for code in args.authority:
+            for year, month, day in _periods(args.from_date, args.to_date):
+                if day:
+                    task = lambda code=code, year=year, month=month, day=day: api.iter_bulk_runs_by_day(
+                        code, year, month, day, chunk_size=args.chunk_size)
+                else:
+                    task = lambda code=code, year=year, month=month: api.iter_bulk_runs_by_month(
+                        code, year, month, chunk_size=args.chunk_size)
+                tasks.append((f"{code} {year}-{month:02d}" + (f"-{day:02d}" if day else ''), task))
+        return tasks
+    raise ValueError(f"Unknown command: {args.command}")
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='topaz', description=__doc__.strip().splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog='\n'.join(__doc__.strip().splitlines()[2:]))
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--api-key', default=os.environ.get('TOPAZ_API_KEY'),
+                        help='Your Topaz API key. Defaults to the TOPAZ_API_KEY environment variable.')
+    common.add_argument('--format', choices=FORMATS, default='ndjson', help='The output format. Default is ndjson.')
+    common.add_argument('--output', help='Write to this file instead of stdout. Required for parquet.')
+    common.add_argument('--workers', type=int, default=4, help='The number of concurrent requests. Default is 4.')
+    common.add_argument('--rate-limit', type=float, help='The maximum requests per second. Default is unlimited.')
+    authority = argparse.ArgumentParser(add_help=False)
+    authority.add_argument('--authority', nargs='+', choices=VALID_AUTHORITY_CODES, metavar='CODE',
+                           help=f"Owning authority codes: {', '.join(VALID_AUTHORITY_CODES)}.")
+    dates = argparse.ArgumentParser(add_help=False)
+    dates.add_argument('--from', dest='from_date', required=True, help='The first date, yyyy-mm-dd.')
+    dates.add_argument('--to', dest='to_date', help='The last date, yyyy-mm-dd. Defaults to --from.')
+
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('races', parents=[common, authority, dates], help='Races between two dates.')
+    commands.add_parser('meetings', parents=[common, authority, dates], help='Meetings between two dates.')
+    commands.add_parser('trials', parents=[common, dates], help='Trial results between two dates.')
+    runs = commands.add_parser('runs', parents=[common, authority], help='The runs of races.')
+    runs.add_argument('race_ids', nargs='*', metavar='RACE_ID', help="Race ids, or '-' to read them from stdin.")
+    runs.add_argument('--from', dest='from_date', help='Also fetch the runs of every race from this date, yyyy-mm-dd.')
+    runs.add_argument('--to', dest='to_date', help='The last date of the races. Defaults to --from.')
+    form = commands.add_parser('form', parents=[common], help='The form of dogs.')
+    form.add_argument('dog_ids', nargs='+', metavar='DOG_ID', help="Dog ids, or '-' to read them from stdin.")
+    form.add_argument('--as-at', help='Form as at this meeting date, yyyy-mm-dd. Defaults to the latest form.')
+    bulk = commands.add_parser('bulk', parents=[common], help='Bulk run data by month or day.')
+    bulk.add_argument('--authority', nargs='+', choices=VALID_AUTHORITY_CODES, metavar='CODE', required=True,
+                      help=f"Owning authority codes: {', '.join(VALID_AUTHORITY_CODES)}.")
+    bulk.add_argument('--from', dest='from_date', required=True,
+                      help='The first month, yyyy-mm, or the first day, yyyy-mm-dd, to fetch day by day.')
+    bulk.add_argument('--to', dest='to_date', help='The last month or day. Defaults to --from.')
+    bulk.add_argument('--chunk-size', type=int, default=10000,
+                      help='The number of records decoded before they are written. Default is 10000.')
+    return parser
+
+def main(argv: list = None) -> int:
+    """
+    Runs the topaz command.
+
+    Args:
+        argv (list, optional): The command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: The exit status: 0 on success, 1 if any request failed, 2 for invalid arguments.
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if not args.api_key:
+        parser.error("an API key is required: pass --api-key or set TOPAZ_API_KEY")
+    if args.command == 'runs' and not (args.race_ids or args.from_date):
+        parser.error("runs needs race ids or --from")
+
+    failed = []
+
+    def on_error(label, error):
+        failed.append(label)
+        print(f"topaz: {label}: {error}", file=sys.stderr)
+
+    with TopazAPI(args.api_key, pool_maxsize=args.workers, rate_limit=args.rate_limit, output='raw') as api:
+        try:
+            tasks = _tasks(api, args)
+            writer = _writer(args)
+        except ValueError as e:
+            parser.error(str(e))
+        try:
+            try:
+                for records in _stream(tasks, args.workers, on_error):
+                    writer.write(records)
+            finally:
+                writer.close()  # Also on errors, so a Parquet file is left readable with the chunks written so far
+        except BrokenPipeError:
+            # The reader went away, e.g. piped into head. Point stdout at devnull so the exit flush cannot fail again.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 0
+    return 1 if failed else 0
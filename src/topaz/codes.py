@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# For each kind of code: the endpoint of the full table, the candidate names of the code field
+# and the candidate names of the field decode() returns by default. The first name present in the table is used.
+CODE_TABLES = {
+    'track': ('/codes/track', ('trackCode', 'code'), ('trackName', 'name', 'description')),
+    'grade': ('/codes/grade', ('gradeCode', 'code'), ('gradeName', 'name', 'description')),
+    'colour': ('/codes/dogcolour', ('colourCode', 'dogColourCode', 'code'), ('colour', 'description', 'name')),
+    'authority': ('/codes/owningauthority', ('owningAuthorityCode', 'code'), ('name', 'description')),
+}
+
+class CodeRegistry:
+    def __init__(self, fetch, refresh_interval: float = 3600):
+        """
+        An in-process index of the Topaz code tables (tracks, grades, dog colours and owning authorities).
+        Each table is loaded in full on first use, indexed by code, and reloaded once it is older than refresh_interval.
+
+        Args:
+            fetch (callable): Returns the decoded JSON list of a code table endpoint, e.g. "/codes/track".
+            refresh_interval (float, optional): The number of seconds after which a table is reloaded. Default is 3600.
+        """
+        self.fetch = fetch
+        self.refresh_interval = refresh_interval
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def _kind(self, kind: str) -> tuple:
+        if kind not in CODE_TABLES:
+            raise ValueError(f"Invalid code kind: {kind}. Must be one of: {', '.join(CODE_TABLES)}")
+        return CODE_TABLES[kind]
+
+    def table(self, kind: str) -> dict:
+        """
+        Returns the code table of a kind as a dictionary of rows keyed by code, loading or reloading it if needed.
+
+        Args:
+            kind (str): One of 'track', 'grade', 'colour', 'authority'.
+
+        Returns:
+            dict: The rows of the table keyed by their code as a string.
+        """
+        path, code_fields, _ = self._kind(kind)
+        with self._lock:
+            loaded = self._tables.get(kind)
+            if loaded is None or time.monotonic() - loaded[0] >= self.refresh_interval:
+                rows = self.fetch(path) or []
+                code_field = next((field for field in code_fields if rows and field in rows[0]), code_fields[0])
+                loaded = (time.monotonic(), {str(row.get(code_field)): row for row in rows})
+                self._tables[kind] = loaded
+            return loaded[1]
+
+    def refresh(self, kind: str = None):
+        """
+        Forgets one or all loaded tables so they are reloaded on next use.
+        """
+        with self._lock:
+            if kind is None:
+                self._tables.clear()
+            else:
+                self._kind(kind)
+                self._tables.pop(kind, None)
+
+    def lookup(self, kind: str, code) -> dict:
+        """
+        Looks up a single code.
+
+        Args:
+            kind (str): One of 'track', 'grade', 'colour', 'authority'.
+            code: The code, e.g. "WPK".
+
+        Returns:
+            dict: A copy of the row of the code table, or None if the code is not in the table.
+        """
+        row = self.table(kind).get(str(code))
+        return dict(row) if row is not None else None
+
+    def decode(self, df: pd.DataFrame, column: str, kind: str, field: str = None) -> pd.Series:
+        """
+        Decodes a whole column of codes in one vectorized pass.
+
+        Args:
+            df (pd.DataFrame): The frame holding the codes, e.g. bulk run data.
+            column (str): The column of codes, e.g. 'trackCode'.
+            kind (str): One of 'track', 'grade', 'colour', 'authority'.
+            field (str, optional): The field of the code table to return, e.g. 'trackName'.
+                                   Defaults to the name or description field of the table.
+
+        Returns:
+            pd.Series: The decoded values, aligned with df. Unknown codes decode to NaN.
+        """
+        import pandas as pd
+
+        _, _, name_fields = self._kind(kind)
+        rows = self.table(kind)
+        if field is None:
+            first = next(iter(rows.values()), {})
+            field = next((name for name in name_fields if name in first), name_fields[0])
+        mapping = {code: row.get(field) for code, row in rows.items()}
+
+        # The tables are keyed by string (grade "1", not 1), so numeric codes are converted first.
+        # Categorical columns are mapped per category rather than per row.
+        codes = df[column]
+        if isinstance(codes.dtype, pd.CategoricalDtype):
+            if not pd.api.types.is_string_dtype(codes.cat.categories.dtype):
+                codes = codes.cat.rename_categories(_to_code_strings(codes.cat.categories))
+        elif not pd.api.types.is_string_dtype(codes.dtype):
+            codes = _to_code_strings(codes)
+        return codes.map(mapping).rename(field)
+
+def _to_code_strings(values):
+    import pandas as pd
+
+    if pd.api.types.is_float_dtype(values.dtype):
+        values = values.astype('Int64')  # 1.0 -> "1", as floats only appear when an integer column has gaps
+    return values.astype(str)
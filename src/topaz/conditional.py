@@ -0,0 +1,126 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+# The race-day field endpoints, which are polled every few seconds and rarely change between polls.
+CONDITIONAL_PATHS = [
+    r'/meeting/\d+/field(/\d+)?',
+    r'/race/\d+/field',
+]
+
+# Returned by ConditionalStore.resolve for a 304 whose stored result was dropped while the request was in flight:
+# a 304 has no body to decode, so the request must be sent again without validators.
+RESEND = object()
+
+class _Entry:
+    __slots__ = ('etag', 'last_modified', 'digest', 'result')
+
+    def __init__(self, etag, last_modified, digest, result):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+        self.result = result
+
+class ConditionalStore:
+    def __init__(self, paths: list = None, max_entries: int = 1024):
+        """
+        Remembers the validators (ETag, Last-Modified) and the last decoded result of polled endpoints, so repeat
+        polls are sent as conditional requests. A 304 Not Modified returns the stored result without downloading
+        or parsing anything. When the server sends no validators, a hash of the body detects identical payloads
+        and returns the stored result without parsing it again.
+
+        While a payload is unchanged, every poll returns the very same object, so `result is previous` tells the
+        caller nothing changed. Treat returned values as read-only.
+
+        Args:
+            paths (list, optional): The path regexes to poll conditionally. Default is CONDITIONAL_PATHS.
+            max_entries (int, optional): The number of results kept; the least recently used are dropped. Default is 1024.
+        """
+        self.patterns = [re.compile(pattern) for pattern in (CONDITIONAL_PATHS if paths is None else paths)]
+        self.max_entries = max_entries
+        self.not_modified = 0
+        self.unchanged = 0
+        self.changed = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def matches(self, path: str) -> bool:
+        return any(pattern.fullmatch(path) for pattern in self.patterns)
+
+    def request_headers(self, key: tuple) -> dict:
+        """
+        Returns the If-None-Match / If-Modified-Since headers for a request, or an empty dict if nothing is stored.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def resolve(self, key: tuple, response, handler, options: dict, conditional: bool = True):
+        """
+        Converts a response with a handler, reusing the stored result when the server answered 304
+        or sent an identical body.
+
+        Args:
+            key (tuple): Identifies the URL and the handler, see TopazAPI._fetch.
+            response: The requests or httpx response.
+            handler (callable): The response handler.
+            options (dict): Keyword arguments for the handler.
+            conditional (bool, optional): Whether the request was sent with validators. Default is True.
+
+        Returns:
+            The value produced by the handler, the stored value, or RESEND if the server answered 304 but the
+            stored value has since been evicted, forgotten or cleared.
+
+        Raises:
+            ValueError: If the server answered 304 to a request sent without validators.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if response.status_code == 304:
+            if entry is not None:
+                self.not_modified += 1
+                return entry.result
+            if not conditional:
+                raise ValueError(f"304 Not Modified in answer to an unconditional request for {response.url}")
+            return RESEND
+        if response.status_code != 200:
+            return handler(response, **options)
+
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        digest = hashlib.sha1(response.content).digest()
+        if entry is not None and entry.digest == digest:
+            self.unchanged += 1
+            result = entry.result
+        else:
+            self.changed += 1
+            result = handler(response, **options)
+        with self._lock:
+            self._entries[key] = _Entry(etag, last_modified, digest, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def forget(self, key: tuple):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        """
+        Returns the number of polls answered with 304, with an identical body, and with a changed body.
+        """
+        return {'not_modified': self.not_modified, 'unchanged': self.unchanged, 'changed': self.changed,
+                'entries': len(self._entries)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
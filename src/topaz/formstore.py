@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import datetime
+import threading
+from typing import TYPE_CHECKING
+
+from .topaz import BatchResult, _concat_frames
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+class DogFormStore:
+    def __init__(self, api, date_column: str = 'meetingDate', id_column: str = 'runId', max_workers: int = None):
+        """
+        Keeps the form lines of every dog seen once, keyed by dog ID, and answers "form as at date D" locally.
+        The API is only called for a dog when the requested date is later than the date its stored form was
+        fetched as at; the new lines are then appended to the ones already held.
+
+        Args:
+            api (TopazAPI): The client to fetch with.
+            date_column (str, optional): The column holding the date of each form line. Default is 'meetingDate'.
+            id_column (str, optional): The column identifying a form line, used to append only new lines.
+                                       Default is 'runId'.
+            max_workers (int, optional): The number of dogs fetched concurrently. Defaults to the pool_maxsize of the client.
+        """
+        self.api = api
+        self.date_column = date_column
+        self.id_column = id_column
+        self.max_workers = max_workers
+        self.fetches = 0
+        self._forms = {}
+        self._as_at = {}  # The date each dog's stored form is complete up to
+        self._lock = threading.Lock()
+
+    def _stale(self, dog_ids: list, as_at: str) -> list:
+        with self._lock:
+            return [dog_id for dog_id in dog_ids if dog_id not in self._as_at or self._as_at[dog_id] < as_at]
+
+    def _merge(self, dog_id, fetched: pd.DataFrame, as_at: str):
+        import pandas as pd
+
+        with self._lock:
+            held = self._forms.get(dog_id)
+            if held is not None and not held.empty and self.id_column in held and self.id_column in fetched:
+                new = fetched[~fetched[self.id_column].isin(held[self.id_column])]
+                fetched = pd.concat([held, new], ignore_index=True) if not new.empty else held
+            if self.date_column in fetched:
+                fetched = fetched.sort_values(self.date_column, kind='stable', ignore_index=True)
+            self._forms[dog_id] = fetched
+            self._as_at[dog_id] = max(as_at, self._as_at.get(dog_id, as_at))
+
+    def _filter(self, form: pd.DataFrame, as_at: str) -> pd.DataFrame:
+        # Only lines from before the date, so a run never sees its own result.
+        if form.empty or self.date_column not in form:
+            return form.copy()
+        return form[form[self.date_column].astype(str).str[:10] < as_at].reset_index(drop=True)
+
+    def forms(self, dog_ids: list, as_at: str = None) -> BatchResult:
+        """
+        Returns the form of many dogs as at a date, e.g. every runner in a meeting's fields. Duplicate IDs are
+        dropped first, and only dogs without form as recent as the date are fetched, concurrently.
+
+        Args:
+            dog_ids (list): The GRV ids of the dogs. Duplicates are fetched and returned once.
+            as_at (str, optional): Only form lines from before this date, format 'yyyy-mm-dd'. Defaults to today.
+
+        Returns:
+            BatchResult: A single DataFrame of the form lines with a 'dogId' column, in input order,
+                         and a dictionary of the errors raised for any dog that could not be fetched.
+        """
+        as_at = as_at or datetime.date.today().isoformat()
+        dog_ids = list(dict.fromkeys(dog_ids))
+        stale = self._stale(dog_ids, as_at)
+        # Today's form is the latest there is, so fetch it without a date.
+        meeting_date = None if as_at >= datetime.date.today().isoformat() else as_at
+        fetched, errors = self.api._fetch_many(self.api.get_dog_form, stale, self.max_workers, meeting_date=meeting_date,
+                                               output='pandas')
+        self.fetches += len(fetched)
+        for dog_id, form in fetched.items():
+            self._merge(dog_id, form, as_at)
+        with self._lock:
+            held = {dog_id: self._forms[dog_id] for dog_id in dog_ids if dog_id not in errors}
+        return BatchResult(_concat_frames({dog_id: self._filter(form, as_at) for dog_id, form in held.items()}, 'dogId'),
+                           errors)
+
+    def form(self, dog_id: int, as_at: str = None) -> pd.DataFrame:
+        """
+        Returns the form of one dog as at a date. See forms.
+
+        Raises:
+            Exception: Whatever get_dog_form raised if the form had to be fetched and could not be.
+        """
+        result, errors = self.forms([dog_id], as_at)
+        if dog_id in errors:
+            raise errors[dog_id]
+        return result
+
+    def stats(self) -> dict:
+        """
+        Returns the number of dogs and form lines held and the number of form fetches made.
+        """
+        with self._lock:
+            lines = sum(len(form) for form in self._forms.values())
+            return {'dogs': len(self._forms), 'lines': lines, 'fetches': self.fetches}
+
+    def clear(self):
+        with self._lock:
+            self._forms.clear()
+            self._as_at.clear()
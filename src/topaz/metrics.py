@@ -0,0 +1,231 @@
+import re
+import threading
+
+from .breaker import CLOSED, OPEN, PROBING, RECOVERING
+
+# Latency histogram bucket bounds in seconds.
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Paths whose segments are not numeric IDs, mapped to their endpoint template. Checked in order; any other path
+# has its numeric segments replaced by {id}.
+ROUTES = [
+    (re.compile(r'/bulk/runs/[^/]+/\d+/\d+/\d+'), '/bulk/runs/{authority}/{year}/{month}/{day}'),
+    (re.compile(r'/bulk/runs/[^/]+/\d+/\d+'), '/bulk/runs/{authority}/{year}/{month}'),
+    (re.compile(r'/codes/(dogcolour|grade|owningauthority|track)/[^/]+'), r'/codes/\1/{code}'),
+]
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+def endpoint_template(path: str) -> str:
+    """
+    Returns the endpoint template of a request path, e.g. '/race/{id}/runs' for '/race/972428497/runs'.
+    """
+    for pattern, template in ROUTES:
+        match = pattern.fullmatch(path)
+        if match:
+            return match.expand(template)
+    return _ID_SEGMENT.sub('/{id}', path)
+
+def _label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class _Endpoint:
+    __slots__ = ('statuses', 'errors', 'retries', 'bytes', 'latency_counts', 'latency_sum', 'cache_hits', 'cache_misses')
+
+    def __init__(self, buckets: int):
+        self.statuses = {}
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.latency_counts = [0] * (buckets + 1)  # The last slot counts latencies above the largest bound
+        self.latency_sum = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+class Metrics:
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS, on_request=None, on_response=None):
+        """
+        Collects request counts, latencies, payload sizes, retries and cache lookups per endpoint template.
+        Every attempt sent over the network is recorded, so a request retried twice counts three responses.
+
+        Args:
+            buckets (tuple, optional): The upper bounds in seconds of the latency histogram. Default is DEFAULT_BUCKETS.
+            on_request (callable, optional): Called as on_request(endpoint, path, params) before each attempt is sent.
+            on_response (callable, optional): Called as on_response(endpoint, status, seconds, nbytes) after each
+                                              attempt. status is None when the attempt failed with a connection
+                                              error or timeout.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.on_request = on_request
+        self.on_response = on_response
+        self._endpoints = {}
+        self._circuits = {}  # Endpoint family -> [state, opens, rejected], see CircuitBreaker
+        self._lock = threading.Lock()
+
+    def _endpoint(self, template: str) -> _Endpoint:
+        endpoint = self._endpoints.get(template)
+        if endpoint is None:
+            endpoint = self._endpoints[template] = _Endpoint(len(self.buckets))
+        return endpoint
+
+    def request(self, path: str, params: dict = None):
+        """
+        Records that an attempt is about to be sent.
+        """
+        if self.on_request is not None:
+            self.on_request(endpoint_template(path), path, params)
+
+    def response(self, path: str, status: int, seconds: float, nbytes: int = 0):
+        """
+        Records the outcome of an attempt: its status code (None for a connection error or timeout),
+        how long it took and the size of the body.
+        """
+        template = endpoint_template(path)
+        slot = next((i for i, bound in enumerate(self.buckets) if seconds <= bound), len(self.buckets))
+        with self._lock:
+            endpoint = self._endpoint(template)
+            if status is None:
+                endpoint.errors += 1
+            else:
+                endpoint.statuses[status] = endpoint.statuses.get(status, 0) + 1
+            endpoint.bytes += nbytes
+            endpoint.latency_counts[slot] += 1
+            endpoint.latency_sum += seconds
+        if self.on_response is not None:
+            self.on_response(template, status, seconds, nbytes)
+
+    def retry(self, path: str):
+        with self._lock:
+            self._endpoint(endpoint_template(path)).retries += 1
+
+    def cache_lookup(self, path: str, hit: bool):
+        with self._lock:
+            endpoint = self._endpoint(endpoint_template(path))
+            if hit:
+                endpoint.cache_hits += 1
+            else:
+                endpoint.cache_misses += 1
+
+    def circuit_change(self, family: str, state: str):
+        """
+        Records that the circuit breaker moved an endpoint family's circuit to a new state.
+        """
+        with self._lock:
+            circuit = self._circuits.setdefault(family, [CLOSED, 0, 0])
+            circuit[0] = state
+            if state == OPEN:
+                circuit[1] += 1
+
+    def circuit_rejected(self, family: str):
+        """
+        Records a request that failed fast because its family's circuit was open.
+        """
+        with self._lock:
+            self._circuits.setdefault(family, [CLOSED, 0, 0])[2] += 1
+
+    def circuits(self) -> dict:
+        """
+        Returns the circuit breaker state of every endpoint family it has acted on, e.g.
+        {'race': {'state': 'open', 'opens': 1, 'rejected': 12}}.
+        """
+        with self._lock:
+            return {family: {'state': state, 'opens': opens, 'rejected': rejected}
+                    for family, (state, opens, rejected) in sorted(self._circuits.items())}
+
+    def _quantile(self, counts: list, q: float) -> float:
+        # Linear interpolation within the bucket holding the quantile, as Prometheus' histogram_quantile does.
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for i, count in enumerate(counts):
+            if seen + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def snapshot(self) -> dict:
+        """
+        Returns the collected metrics keyed by endpoint template, e.g.
+        {'/race/{id}/runs': {'requests': 12, 'statuses': {200: 11, 503: 1}, 'errors': 0, 'retries': 1,
+        'bytes': 48210, 'latency': {'count': 12, 'sum': 1.9, 'p50': 0.12, 'p99': 0.48, 'buckets': {0.01: 0, ...}},
+        'cache_hits': 0, 'cache_misses': 0, 'cache_hit_ratio': 0.0}}. Latency buckets are cumulative.
+        """
+        with self._lock:
+            endpoints = {template: (dict(e.statuses), e.errors, e.retries, e.bytes, list(e.latency_counts),
+                                    e.latency_sum, e.cache_hits, e.cache_misses)
+                         for template, e in self._endpoints.items()}
+        snapshot = {}
+        for template, (statuses, errors, retries, nbytes, counts, latency_sum, hits, misses) in sorted(endpoints.items()):
+            cumulative, running = {}, 0
+            for bound, count in zip(self.buckets, counts):
+                running += count
+                cumulative[bound] = running
+            lookups = hits + misses
+            snapshot[template] = {
+                'requests': sum(statuses.values()) + errors,
+                'statuses': statuses,
+                'errors': errors,
+                'retries': retries,
+                'bytes': nbytes,
+                'latency': {'count': sum(counts), 'sum': latency_sum, 'p50': self._quantile(counts, 0.5),
+                            'p99': self._quantile(counts, 0.99), 'buckets': cumulative},
+                'cache_hits': hits,
+                'cache_misses': misses,
+                'cache_hit_ratio': hits / lookups if lookups else 0.0,
+            }
+        return snapshot
+
+    def prometheus(self, prefix: str = 'topaz') -> str:
+        """
+        Returns the collected metrics in the Prometheus text exposition format.
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ','.join(f'{key}="{_label(val)}"' for key, val in labels)
+                lines.append(f"{prefix}_{name}{suffix}{{{label_text}}} {value}")
+
+        family('responses_total', 'counter', 'Responses received, by endpoint and status code.',
+               [('', [('endpoint', t), ('status', status)], n)
+                for t, m in snapshot.items() for status, n in sorted(m['statuses'].items())])
+        family('errors_total', 'counter', 'Attempts that failed with a connection error or timeout.',
+               [('', [('endpoint', t)], m['errors']) for t, m in snapshot.items()])
+        family('retries_total', 'counter', 'Attempts that were retried.',
+               [('', [('endpoint', t)], m['retries']) for t, m in snapshot.items()])
+        family('response_bytes_total', 'counter', 'Response body bytes received.',
+               [('', [('endpoint', t)], m['bytes']) for t, m in snapshot.items()])
+        family('cache_lookups_total', 'counter', 'Response cache lookups, by result.',
+               [('', [('endpoint', t), ('result', result)], m['cache_hits' if result == 'hit' else 'cache_misses'])
+                for t, m in snapshot.items() for result in ('hit', 'miss')])
+        samples = []
+        for t, m in snapshot.items():
+            latency = m['latency']
+            samples += [('_bucket', [('endpoint', t), ('le', bound)], n) for bound, n in latency['buckets'].items()]
+            samples += [('_bucket', [('endpoint', t), ('le', '+Inf')], latency['count']),
+                        ('_sum', [('endpoint', t)], latency['sum']),
+                        ('_count', [('endpoint', t)], latency['count'])]
+        family('request_duration_seconds', 'histogram', 'Request latency in seconds.', samples)
+        circuits = self.circuits()
+        if circuits:
+            family('circuit_state', 'gauge', 'The circuit breaker state of each endpoint family (1 for the current state).',
+                   [('', [('family', f), ('state', state)], int(c['state'] == state))
+                    for f, c in circuits.items() for state in (CLOSED, OPEN, PROBING, RECOVERING)])
+            family('circuit_opens_total', 'counter', 'Times the circuit of an endpoint family opened.',
+                   [('', [('family', f)], c['opens']) for f, c in circuits.items()])
+            family('circuit_rejections_total', 'counter', 'Requests failed fast by an open circuit.',
+                   [('', [('family', f)], c['rejected']) for f, c in circuits.items()])
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+            for circuit in self._circuits.values():
+                circuit[1:] = [0, 0]  # The counters restart; the current state still holds
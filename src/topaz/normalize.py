@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# The levels of a nested payload: (table, the key of its child list, its id column, the schema of its frame).
+# A child row gets the id of every ancestor as a foreign key column, except form lines, which are runs of their own
+# with their own raceId and meetingId, and are linked to the run they are the form of by parentRunId instead.
+LEVELS = [
+    ('meetings', 'races', 'meetingId', 'meetings'),
+    ('races', 'runs', 'raceId', 'races'),
+    ('runs', 'form', 'runId', 'bulk_runs'),
+    ('form', None, None, 'bulk_runs'),
+]
+_CHILD_KEYS = {'races': ('races',), 'runs': ('runs',), 'form': ('form', 'formLines')}
+_FORM_PARENT = 'parentRunId'
+
+class Tables(NamedTuple):
+    """
+    The relational tables of normalized meeting, race and run payloads.
+
+    Attributes:
+        meetings (pd.DataFrame): One row per meeting.
+        races (pd.DataFrame): One row per race, with a meetingId column.
+        runs (pd.DataFrame): One row per run, with raceId and meetingId columns.
+        form (pd.DataFrame): One row per form line, with a parentRunId column linking it to runs.runId.
+    """
+    meetings: pd.DataFrame
+    races: pd.DataFrame
+    runs: pd.DataFrame
+    form: pd.DataFrame
+
+def _level_of(record: dict) -> int:
+    # Where a payload starts: a meeting holds races, a race holds runs, anything else is a run.
+    if any(key in record for key in _CHILD_KEYS['races']):
+        return 0
+    if any(key in record for key in _CHILD_KEYS['runs']):
+        return 1
+    return 2
+
+def _flatten(record: dict, skip: tuple) -> dict:
+    # Nested objects become dotted columns as in pd.json_normalize; the child list is left out.
+    row = {}
+    stack = [('', record)]
+    while stack:
+        prefix, obj = stack.pop()
+        for key, value in obj.items():
+            if not prefix and key in skip:
+                continue
+            if isinstance(value, dict):
+                stack.append((f"{prefix}{key}.", value))
+            else:
+                row[f"{prefix}{key}"] = value
+    return row
+
+def normalize(payloads, typed: bool = True) -> Tables:
+    """
+    Flattens nested payloads (meeting → races → runs → form lines) into linked tables in a single pass.
+    Accepts what get_meeting_form, get_meeting_results, get_meeting_details(format='all') and get_race_runs_form
+    return, or a list of any of them, e.g. every meeting of a day. Rows are collected as plain dictionaries and each
+    table is built once at the end, so the cost grows linearly with the number of rows.
+
+    Args:
+        payloads (dict or list): A meeting, race or list of runs, or a list of such payloads.
+        typed (bool, optional): Build the tables with the declared compact schemas (see schema.SCHEMAS).
+                                Default is True.
+
+    Returns:
+        Tables: The meetings, races, runs and form tables. A table with no rows is an empty DataFrame.
+    """
+    import pandas as pd
+    from .schema import build_frame
+
+    rows = _rows(payloads)
+    frames = []
+    for table, _, _, schema in LEVELS:
+        records = rows[table]
+        frames.append(build_frame(records, schema) if typed and records else pd.DataFrame(records))
+    return Tables(*frames)
+
+def _rows(payloads) -> dict:
+    # The flat rows of each table, keyed by table name.
+    rows = {table: [] for table, _, _, _ in LEVELS}
+    # An explicit stack of (level, record, foreign keys) instead of recursion.
+    stack = [(None, payloads, {})]
+    while stack:
+        level, record, keys = stack.pop()
+        if isinstance(record, list):
+            stack.extend((level, item, keys) for item in reversed(record))
+            continue
+        if not isinstance(record, dict):
+            continue
+        if level is None:
+            level = _level_of(record)
+        table, child, id_column, _ = LEVELS[level]
+        child_keys = _CHILD_KEYS.get(LEVELS[level + 1][0], ()) if child else ()
+        row = _flatten(record, child_keys)
+        for column, value in keys.items():
+            row.setdefault(column, value)
+        rows[table].append(row)
+
+        for key in child_keys:
+            children = record.get(key)
+            if not children:
+                continue
+            if level + 1 == 3:  # Form lines
+                child_fks = {_FORM_PARENT: row.get(id_column)}
+                if 'dogId' in row:
+                    child_fks['dogId'] = row['dogId']
+            else:
+                child_fks = {**keys, id_column: row.get(id_column)} if row.get(id_column) is not None else dict(keys)
+            stack.extend((level + 1, item, child_fks) for item in reversed(children))
+    return rows
@@ -0,0 +1,170 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# Status codes worth retrying: throttling and transient gateway/availability errors.
+RETRY_STATUSES = (429, 502, 503, 504)
+
+def endpoint_family(path: str) -> str:
+    """
+    Returns the endpoint family of a request path, i.e. its first segment.
+
+    Args:
+        path (str): The endpoint path, e.g. "/race/972428497/runs".
+
+    Returns:
+        str: The family, e.g. "race". Families include 'codes', 'dog', 'search', 'meeting', 'race', 'raceresult',
+             'run', 'isolynx', 'health', 'changelog', 'trialresult' and 'bulk'.
+    """
+    return path.lstrip('/').split('/', 1)[0]
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float = None, clock=time.monotonic):
+        """
+        A thread-safe token bucket that allows `rate` requests per second on average, with bursts of up to `burst`.
+
+        Args:
+            rate (float): The sustained number of requests per second.
+            burst (float, optional): The bucket capacity. Defaults to max(1, rate).
+            clock (callable, optional): Returns the current time in seconds. Default is time.monotonic.
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self.clock = clock
+        self._updated = clock()
+        self._not_before = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Takes a token, borrowing against future refills if the bucket is empty.
+
+        Returns:
+            float: The number of seconds the caller must wait before sending its request.
+        """
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._not_before - now)
+
+    def acquire(self):
+        """
+        Takes a token, sleeping until it is available.
+        """
+        time.sleep(self.reserve())
+
+    def pause(self, seconds: float):
+        """
+        Holds back every request for the given number of seconds, e.g. after the server sent Retry-After.
+        """
+        with self._lock:
+            self._not_before = max(self._not_before, self.clock() + seconds)
+
+class RateLimiter:
+    def __init__(self, rate: float = None, family_rates: dict = None, burst: float = None):
+        """
+        Client-side rate limiting with an optional client-wide limit and optional limits per endpoint family.
+        A request must get a token from both the client-wide bucket and its family's bucket, and waits out any pause.
+
+        Args:
+            rate (float, optional): The client-wide requests per second. Default is None (unlimited).
+            family_rates (dict, optional): Requests per second per endpoint family, e.g. {'bulk': 0.5, 'race': 20}.
+            burst (float, optional): The burst size of every bucket. Defaults to max(1, rate) for each bucket.
+        """
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.family_buckets = {family: TokenBucket(family_rate, burst)
+                               for family, family_rate in (family_rates or {}).items()}
+        # The pause deadline is kept apart from the buckets, so a throttled client pauses even without rate limits.
+        self._not_before = 0.0
+        self._lock = threading.Lock()
+
+    def _buckets(self, family: str) -> list:
+        return [bucket for bucket in (self.bucket, self.family_buckets.get(family)) if bucket is not None]
+
+    def reserve(self, family: str) -> float:
+        """
+        Takes a token for a request to the given endpoint family.
+
+        Returns:
+            float: The number of seconds the caller must wait before sending its request.
+        """
+        wait = max([bucket.reserve() for bucket in self._buckets(family)], default=0.0)
+        with self._lock:
+            return max(wait, self._not_before - time.monotonic())
+
+    def acquire(self, family: str):
+        """
+        Takes a token for a request to the given endpoint family, sleeping until it is available.
+        """
+        time.sleep(self.reserve(family))
+
+    def pause(self, family: str, seconds: float):
+        """
+        Holds back every request of the client for the given number of seconds, e.g. after a 429 response with
+        Retry-After, whether or not any rate limit is set. The server throttles per API key, not per endpoint family.
+        """
+        with self._lock:
+            self._not_before = max(self._not_before, time.monotonic() + seconds)
+
+class RetryPolicy:
+    def __init__(self, max_retries: int = 3, backoff_factor: float = 0.5, max_backoff: float = 60,
+                 retry_statuses: tuple = RETRY_STATUSES):
+        """
+        Retries idempotent GET requests on throttling, transient server errors and connection errors.
+
+        Args:
+            max_retries (int, optional): The number of retries after the first attempt. Default is 3.
+            backoff_factor (float, optional): The base of the exponential backoff in seconds. Default is 0.5.
+            max_backoff (float, optional): The longest backoff in seconds, including a Retry-After sent by the server.
+                                           Default is 60.
+            retry_statuses (tuple, optional): The status codes to retry. Default is (429, 502, 503, 504).
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+
+    def should_retry(self, attempt: int, status_code: int = None) -> bool:
+        """
+        Whether to retry after the given attempt (0 for the first), which failed with status_code,
+        or with a connection error or timeout if status_code is None.
+        """
+        if attempt >= self.max_retries:
+            return False
+        return status_code is None or status_code in self.retry_statuses
+
+    def backoff(self, attempt: int, retry_after: str = None) -> float:
+        """
+        Returns how long to wait before retrying.
+
+        Args:
+            attempt (int): The attempt that failed, 0 for the first.
+            retry_after (str, optional): The Retry-After header of the response, in seconds or as an HTTP date.
+
+        Returns:
+            float: The Retry-After delay if the server sent one, otherwise a random ("full jitter")
+                   delay of up to backoff_factor * 2 ** attempt seconds, either capped at max_backoff.
+        """
+        delay = _parse_retry_after(retry_after)
+        if delay is not None:
+            return min(delay, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+def _parse_retry_after(retry_after: str):
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
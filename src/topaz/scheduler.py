@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import datetime
+import time
+from typing import TYPE_CHECKING
+
+import requests
+
+from .ratelimit import TokenBucket
+from .sync import MELBOURNE
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# How often a race's field is polled as its jump approaches: (at least this many seconds to the jump, poll interval).
+# Checked in order, so a race more than an hour away is polled every 10 minutes and one in its last minute every 5 seconds.
+DEFAULT_FIELD_SCHEDULE = [
+    (3600, 600),
+    (900, 120),
+    (300, 30),
+    (60, 10),
+    (0, 5),
+]
+
+# Race phases.
+FIELD = 'field'
+RESULT = 'result'
+DONE = 'done'
+ABANDONED = 'abandoned'
+
+_JUMP_COLUMNS = ('startTime', 'raceStart', 'raceTime')
+
+def _epoch(value) -> float:
+    # Jump times without a UTC offset are Melbourne local time, like every other time in the API.
+    import pandas as pd
+
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize(MELBOURNE) if MELBOURNE is not None else timestamp.tz_localize('UTC')
+    return timestamp.timestamp()
+
+def _race_ids(payload) -> set:
+    # Every raceId anywhere in a decoded payload.
+    found, stack = set(), [payload]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if 'raceId' in item:
+                found.add(item['raceId'])
+            stack.extend(value for value in item.values() if isinstance(value, (dict, list)))
+        elif isinstance(item, list):
+            stack.extend(item)
+    return found
+
+def _race_entry(payload, race_id):
+    # The outermost entry of a race in a decoded payload covering several races, e.g. a meeting field.
+    queue = [payload]
+    for item in queue:
+        if isinstance(item, dict):
+            if item.get('raceId') == race_id:
+                return item
+            queue.extend(value for value in item.values() if isinstance(value, (dict, list)))
+        elif isinstance(item, list):
+            queue.extend(item)
+    return None
+
+def _same(a, b) -> bool:
+    try:
+        return a is b or bool(a == b)
+    except (TypeError, ValueError):  # e.g. comparing DataFrames
+        return False
+
+def _has_result(result) -> bool:
+    return bool(result)
+
+class RaceState:
+    """
+    What the scheduler knows about one race.
+
+    Attributes:
+        race_id (int): The id of the race.
+        meeting_id (int): The id of its meeting, if known.
+        jump (float): The jump time as a Unix timestamp.
+        phase (str): FIELD before the jump, RESULT until the result is final, then DONE (or ABANDONED if no final
+                     result arrived within result_timeout).
+        field_polls (int): The number of field requests made for the race.
+        result_polls (int): The number of result requests made for the race.
+        field: The latest field.
+        result: The final result, once known.
+    """
+    __slots__ = ('race_id', 'meeting_id', 'jump', 'phase', 'next_poll', 'field_polls', 'result_polls', 'field',
+                 'result', 'result_seen')
+
+    def __init__(self, race_id: int, jump: float, meeting_id: int = None):
+        self.race_id = race_id
+        self.meeting_id = meeting_id
+        self.jump = jump
+        self.phase = FIELD
+        self.next_poll = 0.0
+        self.field_polls = 0
+        self.result_polls = 0
+        self.field = None
+        self.result = None
+        self.result_seen = False
+
+class RaceDayScheduler:
+    def __init__(self, api, field_schedule: list = None, result_interval: float = 15, result_timeout: float = 1800,
+                 requests_per_minute: float = None, meeting_fields: bool = False, on_field=None, on_result=None,
+                 on_error=None, is_final=None, reseed_interval: float = 600, clock=time.time, sleep=time.sleep):
+        """
+        Polls the fields and results of the day's races, spending requests where they matter: a race's field is
+        polled more often as its jump approaches, and after the jump its result is polled until it is final.
+        While several races are waiting for results, one get_recent_race_results request per interval tells which
+        of them have resulted, so get_race_result is only requested for those. All polls share one request budget
+        and the most urgent races are served first when the budget is tight.
+
+        Args:
+            api (TopazAPI): The client to poll with.
+            field_schedule (list, optional): (seconds to the jump, poll interval) pairs, see DEFAULT_FIELD_SCHEDULE.
+            result_interval (float, optional): The number of seconds between result polls. Default is 15.
+            result_timeout (float, optional): Stop polling a race this many seconds after its jump if its result is
+                                              still not final. Default is 1800.
+            requests_per_minute (float, optional): The request budget of the scheduler. Default is None (unlimited).
+            meeting_fields (bool, optional): Poll the fields of races from the same meeting that are due together
+                                             with a single get_meeting_field request. Each race gets its own entry
+                                             of the meeting field. Default is False.
+            on_field (callable, optional): Called as on_field(race, field) when a race's field changes.
+            on_result (callable, optional): Called as on_result(race, result) when a race's result is final.
+            on_error (callable, optional): Called as on_error(race, exception) when a poll fails.
+            is_final (callable, optional): Decides whether a get_race_result response is final.
+                                           Defaults to any non-empty result.
+            reseed_interval (float, optional): The number of seconds between get_upcoming_races requests that add
+                                               newly listed races. Default is 600.
+            clock (callable, optional): Returns the current Unix time. Default is time.time.
+            sleep (callable, optional): Sleeps for a number of seconds. Default is time.sleep.
+        """
+        self.api = api
+        self.field_schedule = sorted(field_schedule or DEFAULT_FIELD_SCHEDULE, reverse=True)
+        self.result_interval = result_interval
+        self.result_timeout = result_timeout
+        self.budget = TokenBucket(requests_per_minute / 60, clock=clock) if requests_per_minute else None
+        self.meeting_fields = meeting_fields
+        self.on_field = on_field
+        self.on_result = on_result
+        self.on_error = on_error
+        self.is_final = is_final or _has_result
+        self.reseed_interval = reseed_interval
+        self.clock = clock
+        self.sleep = sleep
+        self.races = {}
+        self.requests = 0
+        self.recent_polls = 0
+        self._next_seed = 0.0
+        self._next_recent = 0.0
+
+    def add_race(self, race_id: int, jump, meeting_id: int = None) -> RaceState:
+        """
+        Starts polling a race.
+
+        Args:
+            race_id (int): The id of the race.
+            jump: The jump time, as a datetime, a string or a Unix timestamp.
+            meeting_id (int, optional): The id of the meeting, needed for meeting_fields.
+
+        Returns:
+            RaceState: The state of the race.
+        """
+        if race_id not in self.races:
+            jump = float(jump) if isinstance(jump, (int, float)) else _epoch(jump)
+            self.races[race_id] = RaceState(race_id, jump, meeting_id)
+        return self.races[race_id]
+
+    def seed(self) -> int:
+        """
+        Adds the races listed by get_upcoming_races that are not known yet.
+
+        Returns:
+            int: The number of races added.
+        """
+        self._next_seed = self.clock() + self.reseed_interval
+        upcoming = self._poll(None, lambda: self.api.get_upcoming_races(force_refresh=True, output='pandas'))
+        jump_column = None if upcoming is None else next((column for column in _JUMP_COLUMNS if column in upcoming), None)
+        if jump_column is None or upcoming.empty:
+            return 0
+        import pandas as pd
+
+        added = 0
+        has_meeting = 'meetingId' in upcoming
+        for row in upcoming.itertuples(index=False):
+            row = row._asdict()
+            if row['raceId'] in self.races or pd.isna(row[jump_column]):
+                continue
+            self.add_race(int(row['raceId']), row[jump_column], int(row['meetingId']) if has_meeting else None)
+            added += 1
+        return added
+
+    def _spend(self):
+        if self.budget is not None:
+            self.sleep(self.budget.reserve())
+        self.requests += 1
+
+    def _field_interval(self, race: RaceState, now: float) -> float:
+        to_jump = race.jump - now
+        for threshold, interval in self.field_schedule:
+            if to_jump >= threshold:
+                return min(interval, max(to_jump, 0.0)) or interval  # Do not sleep through the jump
+        return self.field_schedule[-1][1]
+
+    def _active(self) -> list:
+        return [race for race in self.races.values() if race.phase in (FIELD, RESULT)]
+
+    def _update_phase(self, race: RaceState, now: float):
+        if race.phase == FIELD and now >= race.jump:
+            race.phase = RESULT
+            race.next_poll = now
+        if race.phase == RESULT and now >= race.jump + self.result_timeout:
+            race.phase = ABANDONED
+
+    def step(self) -> bool:
+        """
+        Makes the most urgent poll that is due, if any.
+
+        Returns:
+            bool: True if a poll was made.
+        """
+        now = self.clock()
+        if self.reseed_interval and now >= self._next_seed:
+            self.seed()
+            return True
+        for race in self._active():
+            self._update_phase(race, now)
+        due = [race for race in self._active() if race.next_poll <= now]
+        if not due:
+            return False
+        # Races waiting for their result first, then the races closest to their jump.
+        race = min(due, key=lambda race: (race.phase != RESULT, race.jump))
+        if race.phase == RESULT:
+            self._poll_result(race, now)
+        else:
+            self._poll_field(race, now)
+        return True
+
+    def _poll(self, race: RaceState, fn, *args):
+        self._spend()
+        try:
+            return fn(*args)
+        except Exception as e:
+            if isinstance(e, requests.HTTPError) and e.response is not None and e.response.status_code == 404:
+                return None  # Not published yet, e.g. a result before the race has been run
+            if self.on_error is not None:
+                self.on_error(race, e)
+            return None
+
+    def _poll_field(self, race: RaceState, now: float):
+        group = [race]
+        if self.meeting_fields and race.meeting_id is not None:
+            group = [other for other in self._active() if other.phase == FIELD and other.meeting_id == race.meeting_id
+                     and other.next_poll <= now]
+        if len(group) > 1:
+            field = self._poll(race, self.api.get_meeting_field, race.meeting_id)
+        else:
+            field = self._poll(race, self.api.get_race_field, race.race_id)
+        for member in group:
+            member.field_polls += 1
+            member.next_poll = now + self._field_interval(member, now)
+            # Compare each race's own entry, so a change to one race of a meeting is not reported for the others.
+            entry = _race_entry(field, member.race_id) if len(group) > 1 and field is not None else field
+            if entry is not None and not _same(entry, member.field):
+                member.field = entry
+                if self.on_field is not None:
+                    self.on_field(member, entry)
+
+    def _poll_result(self, race: RaceState, now: float):
+        waiting = [other for other in self._active() if other.phase == RESULT and not other.result_seen]
+        if not race.result_seen and len(waiting) > 1:
+            # One request tells which of the waiting races have resulted.
+            if now >= self._next_recent:
+                self._next_recent = now + self.result_interval
+                self.recent_polls += 1
+                recent = self._poll(race, self.api.get_recent_race_results)
+                resulted = _race_ids(recent) if recent is not None else set()
+                for other in waiting:
+                    other.result_seen = other.race_id in resulted
+                    other.next_poll = now if other.result_seen else now + self.result_interval
+            else:
+                race.next_poll = self._next_recent
+            return
+        race.result_polls += 1
+        result = self._poll(race, self.api.get_race_result, race.race_id)
+        if result is not None and self.is_final(result):
+            race.result = result
+            race.phase = DONE
+            if self.on_result is not None:
+                self.on_result(race, result)
+        else:
+            race.result_seen = False
+            race.next_poll = now + self.result_interval
+
+    def run(self, until=None):
+        """
+        Polls until every known race is done or abandoned, or until a given time.
+
+        Args:
+            until (float or datetime, optional): Stop at this time, as a Unix timestamp or a datetime. Default is None.
+        """
+        if isinstance(until, datetime.datetime):
+            until = _epoch(until)
+        if not self.races:
+            self.seed()
+        while until is None or self.clock() < until:
+            if self.step():
+                continue
+            active = self._active()
+            if not active:
+                break
+            wake = min(race.next_poll for race in active)
+            wake = min(wake, max(self._next_seed, self.clock())) if self.reseed_interval else wake
+            if until is not None:
+                wake = min(wake, until)
+            self.sleep(max(0.0, wake - self.clock()))
+
+    def poll_counts(self) -> pd.DataFrame:
+        """
+        Returns one row per race with its jump time, phase and the number of field and result requests made for it.
+        """
+        import pandas as pd
+
+        return pd.DataFrame([{
+            'raceId': race.race_id,
+            'meetingId': race.meeting_id,
+            'jump': pd.Timestamp(race.jump, unit='s', tz='UTC'),
+            'phase': race.phase,
+            'fieldPolls': race.field_polls,
+            'resultPolls': race.result_polls,
+        } for race in self.races.values()], columns=['raceId', 'meetingId', 'jump', 'phase', 'fieldPolls', 'resultPolls'])
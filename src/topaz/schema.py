@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+# The column declarations are plain data, usable without pandas; numpy and pandas are imported by the builders.
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Column kinds:
+#   'category'  low-cardinality strings, stored once per distinct value
+#   'int'       integers, always as 64-bit nullable Int64, so frames fetched separately concatenate without upcasting
+#   'float32'   measurements where 7 significant digits are plenty (times, margins, weights, prices)
+#   'float64'   amounts that need full precision (prize money)
+#   'bool'      flags (nullable boolean when values are missing)
+#   'datetime'  dates and times parsed from ISO 8601 strings, in UTC when they carry UTC offsets
+# Columns that are not declared are inferred exactly as pd.DataFrame would infer them.
+
+_MEETING_COLUMNS = {
+    'meetingId': 'int',
+    'meetingDate': 'datetime',
+    'trackCode': 'category',
+    'track': 'category',
+    'trackName': 'category',
+    'state': 'category',
+    'owningAuthorityCode': 'category',
+    'owningAuthority': 'category',  # Added by queries over several authorities
+    'timeslot': 'category',
+    'meetingType': 'category',
+}
+
+_RACE_COLUMNS = {
+    **_MEETING_COLUMNS,
+    'raceId': 'int',
+    'raceNumber': 'int',
+    'raceName': 'category',
+    'raceType': 'category',
+    'raceTypeCode': 'category',
+    'raceGrade': 'category',
+    'gradeCode': 'category',
+    'distance': 'int',
+    'distanceInMetres': 'int',
+    'startTime': 'datetime',
+    'raceStart': 'datetime',
+    'raceTime': 'datetime',
+    'prizeMoney': 'float64',
+    'isQuaddie': 'bool',
+    'isDuet': 'bool',
+}
+
+SCHEMAS = {
+    'meetings': _MEETING_COLUMNS,
+    'races': _RACE_COLUMNS,
+    'bulk_runs': {
+        **_RACE_COLUMNS,
+        'runId': 'int',
+        'dogId': 'int',
+        'dogName': 'category',
+        'sex': 'category',
+        'colourCode': 'category',
+        'weightInKg': 'float32',
+        'dateWhelped': 'datetime',
+        'damId': 'int',
+        'damName': 'category',
+        'sireId': 'int',
+        'sireName': 'category',
+        'trainerId': 'int',
+        'trainerName': 'category',
+        'trainerSuburb': 'category',
+        'trainerState': 'category',
+        'trainerDistrict': 'category',
+        'trainerPostCode': 'category',
+        'ownerId': 'int',
+        'ownerName': 'category',
+        'ownerState': 'category',
+        'rugNumber': 'int',
+        'boxNumber': 'int',
+        'boxDrawnOrder': 'int',
+        'rating': 'int',
+        'place': 'int',
+        'unplaced': 'category',
+        'unplacedCode': 'category',
+        'scratched': 'bool',
+        'isLateScratching': 'bool',
+        'isBestTime': 'bool',
+        'bestTime': 'category',
+        'resultTime': 'float32',
+        'resultMargin': 'float32',
+        'resultMarginLengths': 'category',
+        'startPrice': 'float32',
+        'pir': 'category',
+        'firstSplitPosition': 'int',
+        'firstSplitTime': 'float32',
+        'secondSplitPosition': 'int',
+        'secondSplitTime': 'float32',
+        'firstSecond': 'category',
+        'secondThird': 'category',
+        'last5': 'category',
+        'jumpCode': 'category',
+        'runLineCode': 'category',
+        'incomingGrade': 'category',
+        'outgoingGrade': 'category',
+        'gradedTo': 'category',
+        'careerPrizeMoney': 'float64',
+    },
+}
+
+def build_frame(records, schema) -> pd.DataFrame:
+    """
+    Builds a DataFrame from a decoded JSON list of records, converting each declared column to its compact dtype
+    as the column is built, rather than inferring generic dtypes first and converting afterwards.
+
+    Args:
+        records (list): The decoded JSON response, a list of dictionaries.
+        schema (str or dict): The name of one of SCHEMAS ('bulk_runs', 'races', 'meetings') or a dict of column kinds.
+
+    Returns:
+        pd.DataFrame: The typed frame. Columns are in the order pd.DataFrame(records) would give them.
+    """
+    import pandas as pd
+
+    if isinstance(schema, str):
+        schema = SCHEMAS[schema]
+    if not records or not isinstance(records, list) or not isinstance(records[0], dict):
+        return pd.DataFrame(records)
+    columns = dict.fromkeys(key for record in records for key in record)
+    return pd.DataFrame({column: _column([record.get(column) for record in records], schema.get(column))
+                         for column in columns})
+
+def _column(values: list, kind: str):
+    import numpy as np
+    import pandas as pd
+
+    if kind is None:
+        return values
+    try:
+        if kind == 'category':
+            return pd.Categorical(values)
+        if kind == 'int':
+            return _integers(values)
+        if kind in ('float32', 'float64'):
+            return pd.to_numeric(values, errors='coerce').astype(kind)
+        if kind == 'bool':
+            return np.array(values, dtype=bool) if None not in values else pd.array(values, dtype='boolean')
+        if kind == 'datetime':
+            return _datetimes(values)
+    except (TypeError, ValueError):
+        return values  # The API sent something unexpected for this column; keep it as inferred
+    raise ValueError(f"Unknown column kind: {kind}")
+
+def _integers(values: list):
+    import numpy as np
+    import pandas as pd
+
+    # One dtype whatever the values, so chunks, months and authorities fetched separately share it.
+    numbers = pd.to_numeric(values, errors='coerce')
+    if numbers.dtype.kind in 'iu':
+        return pd.array(numbers, dtype='Int64')
+    present = numbers[~np.isnan(numbers)]
+    if not np.all(present == np.floor(present)):
+        return numbers  # Not whole numbers after all
+    return pd.array(numbers, dtype='Int64')
+
+def _datetimes(values: list):
+    import pandas as pd
+
+    # Values with UTC offsets are always parsed in UTC, whichever offsets a frame happens to contain (e.g. +11:00,
+    # +10:00 or both across a daylight saving change), so every frame of a schema has the same dtype.
+    utc = any(isinstance(value, str) and any(sign in value[10:] for sign in 'Z+-') for value in values)
+    return pd.to_datetime(values, errors='coerce', format='ISO8601', utc=utc)
+
+def _records(records) -> tuple:
+    # The rows of a decoded JSON response, and their columns in first-seen order as pd.DataFrame would give them.
+    if isinstance(records, dict):
+        records = [records]
+    records = [record for record in records or [] if isinstance(record, dict)]
+    return records, list(dict.fromkeys(key for record in records for key in record))
+
+def _schema(schema) -> dict:
+    return SCHEMAS[schema] if isinstance(schema, str) else (schema or {})
+
+def _arrow_type(kind: str):
+    # build_arrow types each table on its own (strings are only dictionary-encoded when a column has any, and
+    # timestamps are only in UTC when the strings carry offsets), but every file of a dataset, or every chunk of one
+    # file, must share one schema, so each declared kind is stored as one fixed type.
+    import pyarrow as pa
+
+    return {'category': pa.dictionary(pa.int32(), pa.string()), 'int': pa.int64(), 'float32': pa.float32(),
+            'float64': pa.float64(), 'bool': pa.bool_(), 'datetime': pa.timestamp('us', tz='UTC')}[kind]
+
+def build_arrow(records, schema=None):
+    """
+    Builds a pyarrow Table straight from a decoded JSON list of records, without an intermediate DataFrame.
+    Declared columns get the compact Arrow types matching build_frame: dictionary-encoded strings, int64, float32,
+    bool and timestamps (in UTC when the strings carry offsets). Other columns are inferred by pyarrow. Requires pyarrow (pip install topaz_api[parquet]).
+
+    Args:
+        records (list): The decoded JSON response, a list of dictionaries.
+        schema (str or dict, optional): The name of one of SCHEMAS or a dict of column kinds. Default is None.
+
+    Returns:
+        pyarrow.Table: The table. Columns are in the order pd.DataFrame(records) would give them.
+    """
+    import pyarrow as pa
+
+    records, columns = _records(records)
+    schema = _schema(schema)
+    return pa.table({column: _arrow_column([record.get(column) for record in records], schema.get(column))
+                     for column in columns})
+
+def _arrow_column(values: list, kind: str):
+    import pyarrow as pa
+
+    try:
+        array = pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed types, e.g. numbers and strings in one column: keep the values as text
+        return pa.array([None if value is None else str(value) for value in values], pa.string())
+    if kind is None:
+        return array
+    try:
+        if kind == 'category':
+            return array.dictionary_encode() if pa.types.is_string(array.type) else array
+        if kind == 'int':
+            return array.cast(pa.int64()) if pa.types.is_integer(array.type) or pa.types.is_null(array.type) else array
+        if kind in ('float32', 'float64'):
+            return array.cast(pa.float32() if kind == 'float32' else pa.float64())
+        if kind == 'bool':
+            return array.cast(pa.bool_())
+        if kind == 'datetime':
+            if not pa.types.is_string(array.type):
+                return array
+            try:
+                return array.cast(pa.timestamp('us'))
+            except pa.ArrowInvalid:
+                # Strings with UTC offsets (possibly mixed across a daylight saving change) can only be combined in UTC.
+                return array.cast(pa.timestamp('us', tz='UTC'))
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return array  # The API sent something unexpected for this column; keep it as inferred
+    raise ValueError(f"Unknown column kind: {kind}")
+
+def build_polars(records, schema=None):
+    """
+    Builds a polars DataFrame straight from a decoded JSON list of records, without an intermediate pandas frame.
+    Declared columns get the compact polars types matching build_frame; other columns are inferred by polars.
+    Requires polars (pip install topaz_api[polars]).
+
+    Args:
+        records (list): The decoded JSON response, a list of dictionaries.
+        schema (str or dict, optional): The name of one of SCHEMAS or a dict of column kinds. Default is None.
+
+    Returns:
+        polars.DataFrame: The frame. Columns are in the order pd.DataFrame(records) would give them.
+    """
+    import polars as pl
+
+    records, columns = _records(records)
+    schema = _schema(schema)
+    return pl.DataFrame([_polars_column(column, [record.get(column) for record in records], schema.get(column))
+                         for column in columns])
+
+def _polars_column(name: str, values: list, kind: str):
+    import polars as pl
+
+    try:
+        series = pl.Series(name, values)
+    except (TypeError, ValueError, pl.exceptions.PolarsError):
+        # Mixed types, e.g. numbers and strings in one column: keep the values as text
+        return pl.Series(name, [None if value is None else str(value) for value in values], dtype=pl.String)
+    if kind is None:
+        return series
+    try:
+        if kind == 'category':
+            return series.cast(pl.Categorical) if series.dtype == pl.String else series
+        if kind == 'int':
+            return series.cast(pl.Int64) if series.dtype.is_integer() or series.dtype == pl.Null else series
+        if kind in ('float32', 'float64'):
+            return series.cast(pl.Float32 if kind == 'float32' else pl.Float64)
+        if kind == 'bool':
+            return series.cast(pl.Boolean)
+        if kind == 'datetime':
+            return series.str.to_datetime(time_unit='us') if series.dtype == pl.String else series
+    except pl.exceptions.PolarsError:
+        return series  # The API sent something unexpected for this column; keep it as inferred
+    raise ValueError(f"Unknown column kind: {kind}")
@@ -0,0 +1,62 @@
+import threading
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Coalesces concurrent identical calls: while a call for a key is in flight, other threads asking for the
+        same key wait for it and share its result (or its exception) instead of making the call again.
+        """
+        self.calls = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """
+        Calls fn() unless a call for the same key is already in flight, in which case its outcome is shared.
+
+        Args:
+            key: A hashable key identifying the call.
+            fn (callable): Makes the call.
+
+        Returns:
+            The result of fn, possibly the very object returned to another caller.
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        """
+        Returns the number of calls, how many of them shared another call's result, and how many are in flight.
+        """
+        with self._lock:
+            return {'calls': self.calls, 'coalesced': self.coalesced, 'in_flight': len(self._calls)}
@@ -0,0 +1,68 @@
+import codecs
+import json
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = ',]' + _WHITESPACE
+
+def iter_json_array(chunks, encoding: str = 'utf-8'):
+    """
+    Incrementally decodes a JSON array from an iterable of byte chunks, yielding its elements as they complete.
+    Only the undecoded tail of the body is held in memory, never the whole body or the whole list.
+
+    Args:
+        chunks (iterable): Byte chunks of the response body, e.g. response.iter_content(65536).
+        encoding (str, optional): The text encoding of the body. Default is 'utf-8'.
+
+    Yields:
+        The decoded elements of the array, in order.
+
+    Raises:
+        ValueError: If the body is not a JSON array or is truncated.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder(encoding)()
+    buffer = ''
+    started = finished = False
+    for chunk in _with_end_marker(chunks):
+        final = chunk is None
+        buffer += text.decode(b'' if final else chunk, final=final)
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError("Expected the response body to be a JSON array")
+                started = True
+                pos += 1
+                continue
+            if finished:
+                raise ValueError("Unexpected data after the end of the JSON array")
+            if buffer[pos] == ']':
+                finished = True
+                pos += 1
+                continue
+            if buffer[pos] == ',':
+                pos += 1
+                continue
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise ValueError("The JSON array in the response body is malformed or truncated")
+                break  # The element continues in the next chunk
+            if not final and not isinstance(element, (dict, list)) and (end == len(buffer) or buffer[end] not in _DELIMITERS):
+                break  # A number cut short by the end of the chunk (e.g. "1.5e") may continue in the next one
+            yield element
+            pos = end
+        buffer = buffer[pos:]
+    if not finished:
+        raise ValueError("The JSON array in the response body is truncated")
+
+def _with_end_marker(chunks):
+    for chunk in chunks:
+        if chunk:
+            yield chunk
+    yield None
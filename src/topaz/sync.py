@@ -0,0 +1,258 @@
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+from .topaz import _validate_authority_code
+
+try:
+    from zoneinfo import ZoneInfo
+    MELBOURNE = ZoneInfo('Australia/Melbourne')
+except (ImportError, KeyError):  # Python 3.8, or no time zone database available
+    MELBOURNE = None
+
+# The API interprets 'since' as Melbourne local time, to the second.
+SINCE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Each poll asks for changes since a little before the previous poll started, so a change that lands while a poll
+# is in flight (or a small clock difference with the server) is not missed. Re-fetching is harmless: unchanged
+# payloads are detected by hash and not rewritten.
+OVERLAP = datetime.timedelta(seconds=60)
+
+# Upsert outcomes.
+INSERTED = 'inserted'
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+
+def _not_found(error: Exception) -> bool:
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) == 404
+
+def _melbourne_now() -> datetime.datetime:
+    return datetime.datetime.now(MELBOURNE).replace(tzinfo=None)
+
+class MeetingStore:
+    def __init__(self, path: str = 'topaz_meetings.sqlite'):
+        """
+        A local mirror of meeting payloads in a SQLite file, plus the high-water marks of MeetingSync.
+        Each meeting is stored once per kind of payload ('details' from get_meeting_details, 'results' from
+        get_meeting_results).
+
+        Args:
+            path (str, optional): The store file. Default is 'topaz_meetings.sqlite' in the working directory.
+        """
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.expanduser(path), check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS meetings (
+                meeting_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (meeting_id, kind)
+            )''')
+        self._db.execute('CREATE TABLE IF NOT EXISTS sync_state (authority TEXT PRIMARY KEY, since TEXT NOT NULL)')
+        # Meetings that failed to sync, retried by the next cycle even though the high-water mark has moved past them.
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS sync_pending (
+                authority TEXT NOT NULL,
+                meeting_id INTEGER NOT NULL,
+                PRIMARY KEY (authority, meeting_id)
+            )''')
+
+    def upsert(self, meeting_id: int, kind: str, payload) -> str:
+        """
+        Inserts or replaces the payload of a meeting.
+
+        Args:
+            meeting_id (int): The id of the meeting.
+            kind (str): The kind of payload, e.g. 'details' or 'results'.
+            payload: The decoded JSON payload.
+
+        Returns:
+            str: INSERTED, UPDATED, or UNCHANGED if the stored payload was identical.
+        """
+        text = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+        digest = hashlib.sha1(text.encode()).hexdigest()
+        with self._lock:
+            row = self._db.execute('SELECT hash FROM meetings WHERE meeting_id = ? AND kind = ?',
+                                   (meeting_id, kind)).fetchone()
+            if row is not None and row[0] == digest:
+                return UNCHANGED
+            self._db.execute('INSERT OR REPLACE INTO meetings VALUES (?, ?, ?, ?, ?)',
+                             (meeting_id, kind, text, digest, time.time()))
+        return INSERTED if row is None else UPDATED
+
+    def get(self, meeting_id: int, kind: str = 'details'):
+        """
+        Returns the stored payload of a meeting, or None if it has not been stored.
+        """
+        with self._lock:
+            row = self._db.execute('SELECT payload FROM meetings WHERE meeting_id = ? AND kind = ?',
+                                   (meeting_id, kind)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def meeting_ids(self, kind: str = 'details') -> list:
+        """
+        Returns the ids of all stored meetings with a payload of the given kind.
+        """
+        with self._lock:
+            return [row[0] for row in self._db.execute('SELECT meeting_id FROM meetings WHERE kind = ? ORDER BY meeting_id', (kind,))]
+
+    def get_since(self, authority: str) -> str:
+        with self._lock:
+            row = self._db.execute('SELECT since FROM sync_state WHERE authority = ?', (authority,)).fetchone()
+        return row[0] if row else None
+
+    def set_since(self, authority: str, since: str):
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO sync_state VALUES (?, ?)', (authority, since))
+
+    def get_pending(self, authority: str) -> list:
+        """
+        Returns the ids of the meetings of an authority that failed to sync and are waiting to be retried.
+        """
+        with self._lock:
+            return [row[0] for row in self._db.execute(
+                'SELECT meeting_id FROM sync_pending WHERE authority = ? ORDER BY meeting_id', (authority,))]
+
+    def set_pending(self, authority: str, meeting_ids: list):
+        """
+        Replaces the ids of the meetings of an authority waiting to be retried.
+        """
+        with self._lock:
+            self._db.execute('BEGIN')
+            self._db.execute('DELETE FROM sync_pending WHERE authority = ?', (authority,))
+            self._db.executemany('INSERT OR IGNORE INTO sync_pending VALUES (?, ?)',
+                                 [(authority, meeting_id) for meeting_id in meeting_ids])
+            self._db.execute('COMMIT')
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+class SyncSummary(NamedTuple):
+    """
+    What one MeetingSync cycle did.
+
+    Attributes:
+        changed (list): The ids of the meetings reported as changed, over all authorities.
+        inserted (list): The ids of meetings stored for the first time.
+        updated (list): The ids of meetings whose stored payload changed.
+        unchanged (list): The ids of meetings that were re-fetched but had not actually changed.
+        errors (dict): The error for each meeting id, or authority code, that could not be synced.
+        since (dict): The high-water mark of each authority after the cycle.
+    """
+    changed: list
+    inserted: list
+    updated: list
+    unchanged: list
+    errors: dict
+    since: dict
+
+class MeetingSync:
+    def __init__(self, api, store: MeetingStore, authorities: list = ('VIC',), initial_since: str = None,
+                 results: bool = True, max_workers: int = None):
+        """
+        Keeps a MeetingStore up to date by polling get_updated_meetings and re-fetching only the meetings it reports.
+        The high-water mark of each authority is kept in the store, so syncing resumes where it left off.
+
+        Args:
+            api (TopazAPI): The client to fetch with.
+            store (MeetingStore): The local store to upsert into.
+            authorities (list, optional): The owning authority codes to sync. Default is ('VIC',).
+            initial_since (str, optional): Where to start for an authority without a high-water mark, in
+                                           YYYY-MM-DD HH:mm:ss Melbourne time. Defaults to 24 hours ago.
+            results (bool, optional): Also fetch get_meeting_results for each changed meeting. Default is True.
+            max_workers (int, optional): The number of meetings fetched concurrently. Defaults to the pool_maxsize of the client.
+        """
+        for code in authorities:
+            _validate_authority_code(code)
+        self.api = api
+        self.store = store
+        self.authorities = list(authorities)
+        self.initial_since = initial_since
+        self.results = results
+        self.max_workers = max_workers
+
+    def _since(self, authority: str) -> str:
+        since = self.store.get_since(authority) or self.initial_since
+        if since is None:
+            since = (_melbourne_now() - datetime.timedelta(days=1)).strftime(SINCE_FORMAT)
+        return since
+
+    def run_once(self) -> SyncSummary:
+        """
+        Runs one sync cycle: polls every authority, re-fetches the changed meetings and upserts them.
+        An authority's high-water mark advances whenever its poll succeeds. Meetings that failed to sync are
+        kept in the store and retried in the next cycle. A meeting without results yet (a 404 from
+        get_meeting_results, e.g. a scratching at an upcoming meeting) is synced with its details only.
+
+        Returns:
+            SyncSummary: The change summary of the cycle.
+        """
+        summary = SyncSummary([], [], [], [], {}, {})
+        for authority in self.authorities:
+            started = _melbourne_now()
+            try:
+                # Only the ids are needed, so skip building a DataFrame.
+                updated = self.api.get_updated_meetings(since=self._since(authority), owning_authority_code=authority,
+                                                         force_refresh=True, output='raw')
+            except Exception as e:
+                summary.errors[authority] = e
+                summary.since[authority] = self._since(authority)
+                continue
+
+            meeting_ids = [int(meeting['meetingId']) for meeting in updated or []] + self.store.get_pending(authority)
+            meeting_ids = list(dict.fromkeys(meeting_ids))
+            meeting_ids = [id_ for id_ in meeting_ids if id_ not in summary.changed]  # Already synced this cycle
+            summary.changed.extend(meeting_ids)
+            failed = self._sync_meetings(meeting_ids, summary)
+            self.store.set_pending(authority, failed)
+            self.store.set_since(authority, (started - OVERLAP).strftime(SINCE_FORMAT))
+            summary.since[authority] = self._since(authority)
+        return summary
+
+    def _sync_meetings(self, meeting_ids: list, summary: SyncSummary) -> list:
+        fetches = [('details', self.api.get_meeting_details, {'format': 'all'})]
+        if self.results:
+            fetches.append(('results', self.api.get_meeting_results, {}))
+
+        outcomes = {}
+        for kind, method, kwargs in fetches:
+            payloads, errors = self.api._fetch_many(method, meeting_ids, self.max_workers, force_refresh=True, **kwargs)
+            if kind == 'results':
+                # No results yet is not a failure: the meeting is synced with its details.
+                errors = {meeting_id: e for meeting_id, e in errors.items() if not _not_found(e)}
+            summary.errors.update(errors)
+            for meeting_id, payload in payloads.items():
+                outcome = self.store.upsert(meeting_id, kind, payload)
+                # A meeting counts as inserted or updated if any of its payloads was.
+                if outcomes.get(meeting_id) in (None, UNCHANGED):
+                    outcomes[meeting_id] = outcome
+        for meeting_id in meeting_ids:
+            if meeting_id in summary.errors:
+                continue
+            {INSERTED: summary.inserted, UPDATED: summary.updated, UNCHANGED: summary.unchanged}[outcomes[meeting_id]].append(meeting_id)
+        return [meeting_id for meeting_id in meeting_ids if meeting_id in summary.errors]
+
+    def run_forever(self, interval: float = 30, on_cycle=None):
+        """
+        Runs sync cycles every interval seconds until interrupted.
+
+        Args:
+            interval (float, optional): The number of seconds between the start of two cycles. Default is 30.
+            on_cycle (callable, optional): Called with the SyncSummary of every cycle.
+        """
+        while True:
+            started = time.monotonic()
+            summary = self.run_once()
+            if on_cycle is not None:
+                on_cycle(summary)
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
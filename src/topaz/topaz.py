@@ -1,158 +1,703 @@
+from __future__ import annotations
+
+import datetime
+import json
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, NamedTuple
+
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .breaker import CircuitBreaker
+from .cache import cache_key
+from .codes import CodeRegistry
+from .conditional import RESEND, ConditionalStore
+from .metrics import Metrics
+from .singleflight import SingleFlight
+from .ratelimit import RateLimiter, RetryPolicy, endpoint_family
+from .streaming import iter_json_array
+
+# pandas (and the schema module built on it) is imported by the first call that builds a DataFrame, so that
+# importing the package costs little more than importing requests, e.g. for jobs that only want dictionaries.
+if TYPE_CHECKING:
+    import pandas as pd
+
+VALID_AUTHORITY_CODES = ['ACT', 'NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA', 'NZ']
+
+# Pass as the owning authority code of a list endpoint to query every authority.
+ALL_AUTHORITIES = 'ALL'
+
+# What list endpoints can return: the decoded JSON list itself, or a pandas DataFrame, pyarrow Table or polars DataFrame.
+OUTPUTS = ['raw', 'pandas', 'pyarrow', 'polars']
+
+# Response handlers. Each endpoint method names the handler that turns its raw response into the value it
+# returns, so the same handling is shared by TopazAPI and AsyncTopazAPI. They only rely on status_code, json()
+# and raise_for_status(), which requests and httpx responses both provide. DataFrame handlers take the name of
+# a declared schema (see schema.SCHEMAS) to build a compactly typed frame, or None to let pandas infer dtypes,
+# and the kind of frame to build (one of OUTPUTS).
+def _json(response):
+    if response.status_code == 200:
+        return response.json()  # Returns a dictionary representing the JSON response
+    else:
+        response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+
+def _to_frame(records, schema: str = None, output: str = 'pandas'):
+    # Arrow and polars frames are built straight from the decoded records, never through pandas.
+    if output == 'raw':
+        return records
+    if output == 'pyarrow':
+        from .schema import build_arrow
+        return build_arrow(records, schema)
+    if output == 'polars':
+        from .schema import build_polars
+        return build_polars(records, schema)
+    import pandas as pd
+    from .schema import build_frame
+    return build_frame(records, schema) if schema else pd.DataFrame(records)
+
+def _frame(response, schema: str = None, output: str = 'pandas'):
+    if response.status_code == 200:
+        # Convert the list of dictionaries (which is the expected JSON response) to a DataFrame
+        return _to_frame(response.json(), schema, output)
+    else:
+        response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+
+def _restricted_json(response):
+    if response.status_code == 200:
+        return response.json()  # Returns a dictionary representing the JSON response
+    elif response.status_code == 401:  # Unauthorized access
+        raise PermissionError("You are not authorized to access this endpoint.")
+    else:
+        response.raise_for_status()  # Raises an HTTPError for other unsuccessful status codes
+
+def _bulk_frame(response, schema: str = None, output: str = 'pandas'):
+    if response.status_code == 200:
+        # Convert the list of BulkRunOutput objects to a DataFrame
+        return _to_frame(response.json(), schema, output)
+    elif response.status_code == 400:  # Bad Request
+        error_msg = response.json().get('message', 'Bad request - The request was malformed')
+        raise ValueError(f"Invalid request parameters: {error_msg}")
+    elif response.status_code == 401:  # Unauthorized access
+        raise PermissionError("You are not authorized to access this data.")
+    elif response.status_code == 404:  # No data found
+        # Return an empty DataFrame (or an empty result of the requested output) instead of raising an error
+        return _to_frame([], None, output)
+    elif response.status_code == 422:  # Validation Failed
+        error_msg = response.json().get('message', 'Validation failed')
+        raise ValueError(f"Validation error: {error_msg}")
+    else:
+        response.raise_for_status()  # Raises an HTTPError for other unsuccessful status codes
+
+class BatchResult(NamedTuple):
+    """
+    The outcome of a batch fetch such as TopazAPI.get_race_runs_many.
+
+    Attributes:
+        result: A DataFrame of all rows, or a dictionary keyed by ID, in input order.
+        errors (dict): The exception raised for each ID that could not be fetched, keyed by ID.
+    """
+    result: object
+    errors: dict
+
+class AuthorityWarning(UserWarning):
+    """
+    Issued when some of the authorities queried together could not be accessed. The rows of the others are still
+    returned.
+
+    Attributes:
+        errors (dict): The exception raised for each authority that could not be fetched, keyed by authority code.
+    """
+    def __init__(self, message: str, errors: dict):
+        super().__init__(message)
+        self.errors = errors
+
+def _concat_frames(frames: dict, id_column: str) -> pd.DataFrame:
+    # Tag each frame with the ID it was fetched for and stack them in input order. The frames may be shared with
+    # other callers (single-flight or conditional requests), so the tag goes on a shallow copy.
+    import pandas as pd
+    tagged = []
+    for source_id, frame in frames.items():
+        if frame.empty:
+            continue
+        if id_column not in frame.columns:
+            frame = frame.copy(deep=False)
+            frame.insert(0, id_column, source_id)
+        tagged.append(frame)
+    if not tagged:
+        return pd.DataFrame()
+    return pd.concat(tagged, ignore_index=True)
+
+def _stored_response(status: int, headers: dict, body: bytes, url: str) -> requests.Response:
+    # Rebuilds a response stored by the cache or a cassette, so handlers cannot tell it from a live one.
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response._content_consumed = True  # There is no connection behind it to read or close
+    response.url = url
+    return response
+
+def _validate_authority_code(owning_authority_code: str):
+    if owning_authority_code not in VALID_AUTHORITY_CODES:
+        raise ValueError(f"Invalid owning authority code: {owning_authority_code}. "
+                         f"Must be one of: {', '.join(VALID_AUTHORITY_CODES)}")
+
+def _authority_codes(owning_authority_code) -> list:
+    # The codes to fan out over for a list of codes or 'ALL', or None for a single code (or none at all).
+    if owning_authority_code is None or (isinstance(owning_authority_code, str) and
+                                         owning_authority_code != ALL_AUTHORITIES):
+        return None
+    if owning_authority_code == ALL_AUTHORITIES:
+        return list(VALID_AUTHORITY_CODES)
+    codes = list(dict.fromkeys(owning_authority_code))
+    for code in codes:
+        _validate_authority_code(code)
+    return codes
+
+def _denied(error: Exception) -> bool:
+    # An authority the user has no access to: the PermissionError of the bulk endpoints, or the HTTP error of a
+    # 401 or 403 response (from requests or httpx).
+    if isinstance(error, PermissionError):
+        return True
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) in (401, 403)
+
+def _merge_authorities(codes: list, results: dict, errors: dict, schema: str, output: str):
+    # Merges the raw rows fetched per authority code (see TopazAPI._fetch_authorities) into one frame.
+    for code in codes:
+        if code in errors and (not _denied(errors[code]) or not results):
+            raise errors[code]
+    records = []
+    for code in codes:
+        records.extend({**record, 'owningAuthority': code} for record in results.get(code) or [])
+    return _report_denied(_to_frame(records, schema, output), errors, output, stacklevel=5)
+
+def _report_denied(frame, errors: dict, output: str, stacklevel: int):
+    # Warns once about the authorities that were denied, keyed by code, and notes them on a pandas frame.
+    if errors:
+        warnings.warn(AuthorityWarning(f"Not authorized for {', '.join(errors)}; their rows are missing.", errors),
+                      stacklevel=stacklevel)
+        if output == 'pandas':
+            # pandas deep-copies attrs into every derived frame, so keep the messages rather than the exceptions.
+            frame.attrs['errors'] = {code: str(error) for code, error in errors.items()}
+    return frame
+
+def _validate_output(output: str):
+    if output not in OUTPUTS:
+        raise ValueError(f"Invalid output: {output}. Must be one of: {', '.join(OUTPUTS)}")
+
+def _date_windows(from_date: str, to_date: str, chunk_days: int) -> list:
+    # Consecutive (from, to) windows of at most chunk_days days covering the range, both ends included.
+    if chunk_days < 1:
+        raise ValueError(f"chunk_days must be at least 1, got {chunk_days}")
+    start = datetime.date.fromisoformat(from_date)
+    end = datetime.date.fromisoformat(to_date) if to_date else start
+    if end < start:
+        raise ValueError(f"to_date {to_date} is before from_date {from_date}")
+    windows = []
+    while start <= end:
+        last = min(start + datetime.timedelta(days=chunk_days - 1), end)
+        windows.append((start.isoformat(), last.isoformat()))
+        start = last + datetime.timedelta(days=1)
+    return windows
+
+def _merge_records(records: list, id_columns: tuple, date_columns: tuple) -> list:
+    # Drops rows returned by more than one window (the last copy wins) and sorts by the first date column present.
+    # The sort is stable, so rows with the same date keep the order the server returned them in.
+    merged = {}
+    for record in records:
+        key = tuple(record.get(column) for column in id_columns)
+        if all(value is None for value in key):
+            key = json.dumps(record, sort_keys=True, default=str)
+        merged.pop(key, None)
+        merged[key] = record
+    def date(record):
+        return next((str(record[column]) for column in date_columns if record.get(column) is not None), '')
+    return sorted(merged.values(), key=date)
 
 class TopazAPI:
-    def __init__(self, api_key):
+    def __init__(self, api_key, pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False,
+                 keep_alive: bool = True, timeout: float = 30, rate_limit: float = None, rate_limits: dict = None,
+                 max_retries: int = 3, backoff_factor: float = 0.5, cache=None, code_refresh_interval: float = 3600,
+                 typed_frames: bool = True, conditional=True, metrics=True, transport=None,
+                 coalesce=True, output: str = 'pandas', circuit_breaker=None):
+        """
+        Creates a client that sends every request over a single pooled, keep-alive HTTP session.
+        The session is shared by all endpoint methods and is safe to use from multiple threads.
+
+        Requests are throttled by an optional client-side token bucket rate limiter. Requests that fail with
+        429, 502, 503 or 504, a connection error or a timeout are retried with jittered exponential backoff,
+        honouring the Retry-After header when the server sends one.
+
+        With a ResponseCache, responses of endpoints that have a TTL policy are served from a persistent local
+        cache until they expire. Every endpoint method accepts force_refresh=True to skip the cached copy.
+
+        The race-day field endpoints are polled with conditional requests (If-None-Match / If-Modified-Since), so an
+        unchanged field costs a 304 instead of a download, and an identical body is not parsed again (see ConditionalStore).
+
+        Identical calls made from several threads at the same time are coalesced into one request whose decoded
+        result is shared by all of them (see SingleFlight).
+
+        List endpoints return pandas DataFrames by default. With output='pyarrow' or 'polars' they build a pyarrow
+        Table or polars DataFrame straight from the decoded JSON instead, and with output='raw' they return the
+        decoded list of dictionaries itself. Every list endpoint also accepts output= to override this per call.
+
+        With a circuit breaker, an endpoint family that keeps failing or timing out fails fast with CircuitOpenError
+        until the server health endpoint reports it is back, then traffic ramps up again (see CircuitBreaker).
+
+        Args:
+            api_key (str): Your Topaz API key.
+            pool_connections (int, optional): The number of per-host connection pools to keep. Default is 10.
+            pool_maxsize (int, optional): The maximum number of connections kept open to a single host. Default is 10.
+            pool_block (bool, optional): If True, requests wait for a free pooled connection once pool_maxsize
+                                         connections to a host are in use, making pool_maxsize a hard per-host limit.
+                                         If False, extra connections are opened and discarded after use. Default is False.
+            keep_alive (bool, optional): Reuse connections between requests. Default is True.
+            timeout (float, optional): The request timeout in seconds. Default is 30.
+            rate_limit (float, optional): The maximum requests per second for the whole client. Default is None (unlimited).
+            rate_limits (dict, optional): The maximum requests per second per endpoint family (the first path segment),
+                                          e.g. {'bulk': 0.5, 'race': 20}. Default is None.
+            max_retries (int, optional): The number of times a failed request is retried. 0 disables retries. Default is 3.
+            backoff_factor (float, optional): The base delay in seconds of the exponential backoff. Default is 0.5.
+            cache (ResponseCache, optional): An opt-in persistent response cache. Default is None (no caching).
+            code_refresh_interval (float, optional): The number of seconds after which the code tables used by the
+                                                     *_by_code methods and decode_codes are reloaded. Default is 3600.
+            typed_frames (bool, optional): Build bulk run, race and meeting listing DataFrames with their declared
+                                           compact schema: categorical strings, downcast numbers and datetime
+                                           columns. False keeps the frames pandas infers. Default is True.
+            conditional (bool or ConditionalStore, optional): Poll the field endpoints with conditional requests.
+                                                             Pass a ConditionalStore to choose the endpoints, or False
+                                                             to always download and parse. Default is True.
+            metrics (bool or Metrics, optional): Collect request counts, latencies, sizes, retries and cache lookups
+                                                 per endpoint in self.metrics. Pass a Metrics to set its histogram
+                                                 buckets or hooks, or False to collect nothing. Default is True.
+            transport (RecordReplayTransport, optional): Records responses to, or replays them from, a local
+                                                         cassette instead of always using the network. Default is None.
+            coalesce (bool or SingleFlight, optional): Share one in-flight request between concurrent identical calls.
+                                                       False sends every call on its own. Default is True.
+            output (str, optional): What list endpoints return: 'pandas', 'pyarrow' (needs pip install
+                                    topaz_api[parquet]), 'polars' (needs pip install topaz_api[polars]) or 'raw'.
+                                    Default is 'pandas'.
+            circuit_breaker (bool or CircuitBreaker, optional): Fail fast per endpoint family while the server is
+                                                                failing. True uses the default CircuitBreaker. A breaker
+                                                                without metrics of its own reports to self.metrics.
+                                                                Default is None (no breaker).
+
+        Raises:
+            ValueError: If output is not one of OUTPUTS.
+        """
+        _validate_output(output)
         self.base_url = "https://topaz.grv.org.au/api"
         self.headers = {
             'accept': 'application/json',
             'X-API-Key': api_key
         }
+        if not keep_alive:
+            self.headers['Connection'] = 'close'
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.rate_limiter = RateLimiter(rate_limit, rate_limits)
+        self.retry_policy = RetryPolicy(max_retries=max_retries, backoff_factor=backoff_factor)
+        self.cache = cache
+        self.typed_frames = typed_frames
+        self.output = output
+        self.conditional = ConditionalStore() if conditional is True else (conditional or None)
+        self.metrics = Metrics() if metrics is True else (metrics or None)
+        self.transport = transport
+        self.single_flight = SingleFlight() if coalesce is True else (coalesce or None)
+        self.breaker = CircuitBreaker() if circuit_breaker is True else (circuit_breaker or None)
+        if self.breaker is not None and self.breaker.metrics is None:
+            self.breaker.metrics = self.metrics  # A breaker given without its own metrics reports to the client's
+        self.codes = CodeRegistry(lambda path: self._fetch(_json, path), refresh_interval=code_refresh_interval)
+
+        # The session is configured once here and never mutated afterwards (headers are passed per request),
+        # so it can be shared between threads; urllib3's connection pools are themselves thread-safe.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the session and all of its pooled connections.
+        """
+        self.session.close()
+
+    def _get(self, path: str, params: dict = None, force_refresh: bool = False) -> requests.Response:
+        """
+        Gets a response from the cache if the endpoint is cacheable and a fresh copy is stored,
+        otherwise sends the request and caches a successful response.
+
+        Args:
+            path (str): The endpoint path, e.g. "/race/972428497/runs".
+            params (dict, optional): Query string parameters. Default is None.
+            force_refresh (bool, optional): Skip the cache lookup. Default is False.
+
+        Returns:
+            requests.Response: The cached or raw response.
+        """
+        if self.cache is None or not self.cache.is_cacheable(path):
+            return self._send(path, params)
+
+        key = cache_key(path, params)
+        cached = None if force_refresh else self.cache.get(key)
+        if self.metrics is not None and not force_refresh:
+            self.metrics.cache_lookup(path, cached is not None)
+        if cached is not None:
+            status, headers, body = cached
+            return _stored_response(status, headers, body, f"{self.base_url}{key}")
+
+        response = self._send(path, params)
+        if response.status_code == 200:
+            self.cache.set(key, path, params, response.status_code, response.headers, response.content)
+        return response
+
+    def _send(self, path: str, params: dict = None, stream: bool = False, headers: dict = None) -> requests.Response:
+        """
+        Sends a GET request through the transport if one is set, otherwise over the network. See _request.
+        """
+        if self.transport is not None:
+            return self.transport.send(path, params, lambda: self._request(path, params, stream, headers), stream)
+        return self._request(path, params, stream, headers)
+
+    def _request(self, path: str, params: dict = None, stream: bool = False, headers: dict = None) -> requests.Response:
+        """
+        Sends a GET request for a path relative to the base URL over the pooled session,
+        applying the rate limiter and retry policy.
+
+        Args:
+            path (str): The endpoint path, e.g. "/race/972428497/runs".
+            params (dict, optional): Query string parameters. Default is None.
+            stream (bool, optional): Return as soon as the headers arrive and leave the body to be read
+                                     incrementally. The caller must close the response. Default is False.
+            headers (dict, optional): Extra request headers, e.g. conditional request validators. Default is None.
+
+        Returns:
+            requests.Response: The raw response. After the last retry this may still be an unsuccessful response.
+        """
+        headers = {**self.headers, **headers} if headers else self.headers
+        family = endpoint_family(path)
+        attempt = 0
+        while True:
+            if self.breaker is not None:
+                self._admit(family)
+            self.rate_limiter.acquire(family)
+            if self.metrics is not None:
+                self.metrics.request(path, params)
+            started = time.perf_counter()
+            try:
+                response = self.session.get(f"{self.base_url}{path}", headers=headers, params=params,
+                                            timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if self.metrics is not None:
+                    self.metrics.response(path, None, time.perf_counter() - started)
+                if self.breaker is not None:
+                    self.breaker.record(family, None)
+                if not self.retry_policy.should_retry(attempt):
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+            else:
+                if self.metrics is not None:
+                    # A streamed body has not been read yet, so only its declared length is known.
+                    size = int(response.headers.get('Content-Length') or 0) if stream else len(response.content)
+                    self.metrics.response(path, response.status_code, time.perf_counter() - started, size)
+                if self.breaker is not None:
+                    self.breaker.record(family, response.status_code)
+                if not self.retry_policy.should_retry(attempt, response.status_code):
+                    return response
+                delay = self.retry_policy.backoff(attempt, response.headers.get('Retry-After'))
+                if response.status_code == 429:
+                    # Throttled: hold back the client's other requests too, not just this one.
+                    self.rate_limiter.pause(family, delay)
+                response.close()
+            if self.metrics is not None:
+                self.metrics.retry(path)
+            time.sleep(delay)
+            attempt += 1
+
+    def _admit(self, family: str):
+        """
+        Waits until the circuit breaker lets a request to the family through, probing the server health first if
+        it is the caller's turn to. Raises CircuitOpenError while the circuit is open.
+        """
+        if self.breaker.probe_due(family):
+            healthy = False
+            try:
+                healthy = self._probe()
+            finally:
+                # Report even when the probe raised, or the circuit would be left probing.
+                self.breaker.probed(family, healthy)
+        time.sleep(self.breaker.before(family))
+
+    def _probe(self) -> bool:
+        """
+        Returns whether the server health endpoint answers 200. Sent once, straight over the session: the breaker,
+        retries and the cache would all get in the way of an honest answer.
+        """
+        path = "/health"
+        if self.metrics is not None:
+            self.metrics.request(path)
+        started = time.perf_counter()
+        try:
+            response = self.session.get(f"{self.base_url}{path}", headers=self.headers, timeout=self.timeout)
+        except requests.RequestException:  # Connection errors, timeouts, redirect loops...
+            if self.metrics is not None:
+                self.metrics.response(path, None, time.perf_counter() - started)
+            return False
+        if self.metrics is not None:
+            self.metrics.response(path, response.status_code, time.perf_counter() - started, len(response.content))
+        return response.status_code == 200
+
+    def _fetch(self, handler, path: str, params: dict = None, force_refresh: bool = False, **options):
+        """
+        Sends a GET request and converts the response with one of the module's response handlers.
+
+        Args:
+            handler (callable): The response handler, e.g. _frame or _json.
+            path (str): The endpoint path, e.g. "/race/972428497/runs".
+            params (dict, optional): Query string parameters. Default is None.
+            force_refresh (bool, optional): Skip the response cache and send conditional requests unconditionally.
+                                            Default is False.
+            **options: Keyword arguments for the handler, e.g. schema.
+
+        Returns:
+            The value produced by the handler.
+        """
+        if self.single_flight is None:
+            return self._fetch_once(handler, path, params, force_refresh, options)
+        key = (cache_key(path, params), handler, tuple(sorted(options.items())), force_refresh)
+        return self.single_flight.do(key, lambda: self._fetch_once(handler, path, params, force_refresh, options))
+
+    def _fetch_once(self, handler, path: str, params: dict, force_refresh: bool, options: dict):
+        if self.conditional is not None and self.conditional.matches(path):
+            # The stored result depends on the handler and its options as well as the URL.
+            key = (cache_key(path, params), handler, tuple(sorted(options.items())))
+            if force_refresh:
+                self.conditional.forget(key)
+            response = self._send(path, params, headers=self.conditional.request_headers(key))
+            result = self.conditional.resolve(key, response, handler, options)
+            if result is RESEND:
+                result = self.conditional.resolve(key, self._send(path, params), handler, options, conditional=False)
+            return result
+        return handler(self._get(path, params=params, force_refresh=force_refresh), **options)
+
+    def _schema(self, name: str, typed: bool = None) -> str:
+        """
+        Returns the schema name to build a DataFrame with, or None for an inferred frame.
+        """
+        return name if (self.typed_frames if typed is None else typed) else None
+
+    def _output(self, output: str = None) -> str:
+        """
+        Returns the kind of value a list endpoint builds: the per-call choice if given, otherwise the client's.
+        """
+        if output is None:
+            return self.output
+        _validate_output(output)
+        return output
+
+    def _fetch_authorities(self, method, codes: list, schema: str, output: str, **kwargs):
+        """
+        Calls a list endpoint once per authority, concurrently, and merges the rows into one frame with an
+        'owningAuthority' column. Authorities the user has no access to are left out and reported with an
+        AuthorityWarning, and by message in the attrs of a pandas DataFrame under 'errors'.
+
+        Args:
+            method (callable): The bound endpoint method. Called with owning_authority_code, output='raw' and **kwargs.
+            codes (list): The authority codes.
+            schema (str): The schema to build the frame with, or None.
+            output (str): The kind of value to return, one of OUTPUTS.
+
+        Raises:
+            Exception: Any error other than a denied authority, or the first error if every authority was denied.
+        """
+        fetch = lambda code, **options: method(owning_authority_code=code, **options)
+        results, errors = self._fetch_many(fetch, codes, None, output='raw', **kwargs)
+        return _merge_authorities(codes, results, errors, schema, output)
 
     ### Codes
-    def get_dog_colours(self) -> pd.DataFrame:
+    def get_dog_colours(self, force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Gets the dog color codes.
 
+        Args:
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
+
         Returns:
             pd.DataFrame: A DataFrame containing all the dog color codes and their descriptions.
         """
-        response = requests.get(f"{self.base_url}/codes/dogcolour", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            # Convert the list of dictionaries (which is the expected JSON response) to a DataFrame
-            return pd.DataFrame(response.json())
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_frame, "/codes/dogcolour", force_refresh=force_refresh, output=self._output(output))
 
-    def get_dog_colour_by_code(self, colour_code: str) -> dict:
+    def get_dog_colour_by_code(self, colour_code: str, force_refresh: bool = False) -> dict:
         """
         Gets details for a specific dog colour code.
+        Served from the in-process code registry, which loads the full table once.
 
         Args:
             colour_code (str): The colour code to retrieve details for. 
                             Example value would be "BK" for black.
+            force_refresh (bool, optional): Ignore the code registry and any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the code and the colour description.
         """
-        response = requests.get(f"{self.base_url}/codes/dogcolour/{colour_code}", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        if not force_refresh:
+            row = self.codes.lookup('colour', colour_code)
+            if row is not None:
+                return row
+        # Not in the loaded table (or force_refresh), so ask the API
+        return self._fetch(_json, f"/codes/dogcolour/{colour_code}", force_refresh=force_refresh)
 
-    def get_owning_authorities(self) -> pd.DataFrame:
+    def get_owning_authorities(self, force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Gets the owning authority codes.
 
+        Args:
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
+
         Returns:
             pd.DataFrame: A DataFrame containing all the owning authority codes and their descriptions.
         """
-        response = requests.get(f"{self.base_url}/codes/owningauthority", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            # Convert the list of dictionaries (which is the expected JSON response) to a DataFrame
-            return pd.DataFrame(response.json())
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_frame, "/codes/owningauthority", force_refresh=force_refresh, output=self._output(output))
 
-    def get_owning_authority_by_code(self, authority_code: str) -> dict:
+    def get_owning_authority_by_code(self, authority_code: str, force_refresh: bool = False) -> dict:
         """
         Gets details for a specific owning authority code.
+        Served from the in-process code registry, which loads the full table once.
 
         Args:
             authority_code (str): The owning authority code to retrieve details for. 
                                 Example value would be "VIC" for Victoria.
+            force_refresh (bool, optional): Ignore the code registry and any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the details of the owning authority.
         """
-        response = requests.get(f"{self.base_url}/codes/owningauthority/{authority_code}", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        if not force_refresh:
+            row = self.codes.lookup('authority', authority_code)
+            if row is not None:
+                return row
+        # Not in the loaded table (or force_refresh), so ask the API
+        return self._fetch(_json, f"/codes/owningauthority/{authority_code}", force_refresh=force_refresh)
 
-    def get_track_codes(self) -> pd.DataFrame:
+    def get_track_codes(self, force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Gets the track codes.
 
+        Args:
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
+
         Returns:
             pd.DataFrame: A DataFrame containing all the track codes and their descriptions.
         """
-        response = requests.get(f"{self.base_url}/codes/track", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            # Convert the list of dictionaries (which is the expected JSON response) to a DataFrame
-            return pd.DataFrame(response.json())
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_frame, "/codes/track", force_refresh=force_refresh, output=self._output(output))
     
-    def get_track_by_code(self, track_code: str) -> dict:
+    def get_track_by_code(self, track_code: str, force_refresh: bool = False) -> dict:
         """
         Gets details for a specific track code.
+        Served from the in-process code registry, which loads the full table once.
 
         Args:
             track_code (str): The track code to retrieve details for. 
                             Example value would be "WPK" for Wentworth Park.
+            force_refresh (bool, optional): Ignore the code registry and any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the details of the specific track.
         """
-        response = requests.get(f"{self.base_url}/codes/track/{track_code}", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        if not force_refresh:
+            row = self.codes.lookup('track', track_code)
+            if row is not None:
+                return row
+        # Not in the loaded table (or force_refresh), so ask the API
+        return self._fetch(_json, f"/codes/track/{track_code}", force_refresh=force_refresh)
 
-    def get_grade_codes(self) -> pd.DataFrame:
+    def get_grade_codes(self, force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Gets the grade codes.
 
+        Args:
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
+
         Returns:
             pd.DataFrame: A DataFrame containing all the grade codes and their descriptions.
         """
-        response = requests.get(f"{self.base_url}/codes/grade", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            # Convert the list of dictionaries (which is the expected JSON response) to a DataFrame
-            return pd.DataFrame(response.json())
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_frame, "/codes/grade", force_refresh=force_refresh, output=self._output(output))
 
-    def get_grade_by_code(self, grade_code: str) -> dict:
+    def get_grade_by_code(self, grade_code: str, force_refresh: bool = False) -> dict:
         """
         Gets details for a specific grade code.
+        Served from the in-process code registry, which loads the full table once.
 
         Args:
             grade_code (str): The grade code to retrieve details for. 
                             Example value would be "1". Yes you have to put a number as a string.
+            force_refresh (bool, optional): Ignore the code registry and any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the details of the specific grade.
         """
-        response = requests.get(f"{self.base_url}/codes/grade/{grade_code}", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        if not force_refresh:
+            row = self.codes.lookup('grade', grade_code)
+            if row is not None:
+                return row
+        # Not in the loaded table (or force_refresh), so ask the API
+        return self._fetch(_json, f"/codes/grade/{grade_code}", force_refresh=force_refresh)
+
+    def decode_codes(self, df: pd.DataFrame, column: str, kind: str, field: str = None) -> pd.Series:
+        """
+        Decodes a whole column of track, grade, dog colour or owning authority codes in one pass,
+        using the in-process code registry instead of one request per code.
+
+        Args:
+            df (pd.DataFrame): The frame holding the codes, e.g. the result of get_bulk_runs_by_month.
+            column (str): The column of codes, e.g. 'trackCode'.
+            kind (str): One of 'track', 'grade', 'colour', 'authority'.
+            field (str, optional): The field of the code table to return. Defaults to its name or description field.
+
+        Returns:
+            pd.Series: The decoded values, aligned with df. Unknown codes decode to NaN.
+        """
+        return self.codes.decode(df, column, kind, field)
 
     ### Dogs
-    def get_dog_details(self, dog_id: int) -> dict:
+    def get_dog_details(self, dog_id: int, force_refresh: bool = False) -> dict:
         """
         Gets details for a specific dog.
 
         Args:
             dog_id (int): The unique identifier of the dog to retrieve details for. 
                         Example value could be 695144538.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the details of the specific dog.
         """
-        response = requests.get(f"{self.base_url}/dog/{dog_id}", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_json, f"/dog/{dog_id}", force_refresh=force_refresh)
 
-    def get_dog_form(self, dog_id: int, meeting_date: str = None) -> pd.DataFrame:
+    def get_dog_form(self, dog_id: int, meeting_date: str = None,
+                     force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Gets form details for a specific dog, optionally filtered by a meeting date.
 
@@ -162,37 +707,34 @@ class TopazAPI:
             meeting_date (str, optional): You can get form data as at a specified date by specifying a Meeting Date. 
                                           Format should be 'yyyy-mm-dd'. Default is None.
                                           Example for dog_id 695144538 is '2023-12-03'
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
 
         Returns:
             pd.DataFrame: A DataFrame containing the form details of the specific dog.
         """
-        endpoint = f"{self.base_url}/dog/{dog_id}/form"
         params = {'meetingdate': meeting_date} if meeting_date else {}
-        response = requests.get(endpoint, headers=self.headers, params=params, timeout=30)
-        
-        if response.status_code == 200:
-            return pd.DataFrame(response.json())
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_frame, f"/dog/{dog_id}/form", params=params, force_refresh=force_refresh,
+                           output=self._output(output))
 
-    def get_dog_statistics(self, dog_id: int) -> dict:
+    def get_dog_statistics(self, dog_id: int, force_refresh: bool = False) -> dict:
         """
         Gets statistics for a specific dog.
 
         Args:
             dog_id (int): The GRV id of the dog to get form details for.
                         E.g. 695144538
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the statistics of the specific dog.
         """
-        response = requests.get(f"{self.base_url}/dog/{dog_id}/statistics", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_json, f"/dog/{dog_id}/statistics", force_refresh=force_refresh)
 
-    def search_dogs(self, search_term: str, exact_match: bool = False, records: int = 300) -> pd.DataFrame:
+    def search_dogs(self, search_term: str, exact_match: bool = False, records: int = 300,
+                    force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Searches for dogs based on a search term, with options for exact match and record limit.
         Returns a dataframe of dogs and the details of their run within the specified race.
@@ -201,6 +743,10 @@ class TopazAPI:
             search_term (str): The full or partial name of the target greyhound.
             exact_match (bool, optional): Limits the records returned to the unique greyhound with that name. Default is False.
             records (int, optional): The maximum number of records to return. Default is 300 hits.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
 
         Returns:
             pd.DataFrame: A DataFrame containing the search results.
@@ -210,14 +756,11 @@ class TopazAPI:
             'exactmatch': exact_match,
             'records': records
         }
-        response = requests.get(f"{self.base_url}/search/dogs", headers=self.headers, params=params, timeout=30)
-        if response.status_code == 200:
-            return pd.DataFrame(response.json())  # Converts the JSON response to a DataFrame
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_frame, "/search/dogs", params=params, force_refresh=force_refresh,
+                           output=self._output(output))
 
     ### Firstsplit
-    def get_meeting_first_split_results(self, meeting_id: int) -> dict:
+    def get_meeting_first_split_results(self, meeting_id: int, force_refresh: bool = False) -> dict:
         """
         Returns all the details of the meeting, including races, runs, and results. 
         Includes First Split data for all dogs where available, and returns the most up-to-date data at all times.
@@ -226,6 +769,7 @@ class TopazAPI:
         Args:
             meeting_id (int): The unique identifier of the meeting to retrieve first split results for. 
                             Example value could be 509346178.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the first split results and other details of the specified meeting.
@@ -233,15 +777,9 @@ class TopazAPI:
         Raises:
             PermissionError: If the user is not authorized to access this endpoint (HTTP 401 error).
         """
-        response = requests.get(f"{self.base_url}/meeting/{meeting_id}/results/firstsplit", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        elif response.status_code == 401:  # Unauthorized access
-            raise PermissionError("You are not authorized to access this endpoint.")
-        else:
-            response.raise_for_status()  # Raises an HTTPError for other unsuccessful status codes
+        return self._fetch(_restricted_json, f"/meeting/{meeting_id}/results/firstsplit", force_refresh=force_refresh)
 
-    def get_races_first_split(self, meeting_id: int) -> dict:
+    def get_races_first_split(self, meeting_id: int, force_refresh: bool = False) -> dict:
         """
         Returns a list of all races for the specified meeting. 
         Includes First Split data for all dogs where available, and returns the most up-to-date data at all times.
@@ -250,6 +788,7 @@ class TopazAPI:
         Args:
             meeting_id (int): The unique identifier of the meeting to retrieve races' first split results for. 
                             Example value could be 509346178.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the first split results and other race details of the specified meeting.
@@ -257,15 +796,9 @@ class TopazAPI:
         Raises:
             PermissionError: If the user is not authorized to access this endpoint (HTTP 401 error).
         """
-        response = requests.get(f"{self.base_url}/meeting/{meeting_id}/races/firstsplit", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        elif response.status_code == 401:  # Unauthorized access
-            raise PermissionError("You are not authorized to access this endpoint.")
-        else:
-            response.raise_for_status()  # Raises an HTTPError for other unsuccessful status codes
+        return self._fetch(_restricted_json, f"/meeting/{meeting_id}/races/firstsplit", force_refresh=force_refresh)
 
-    def get_race_runs_first_split(self, race_id: int) -> dict:
+    def get_race_runs_first_split(self, race_id: int, force_refresh: bool = False) -> dict:
         """
         Returns a list of dogs and the details of their run within the specified race. 
         The results of this call include First Split information for each run if available and always returns the latest information.
@@ -274,6 +807,7 @@ class TopazAPI:
         Args:
             race_id (int): The unique identifier of the race to retrieve runs' first split details for.
                         Example value could be 509346808.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the first split details and other run information for the specified race.
@@ -281,13 +815,7 @@ class TopazAPI:
         Raises:
             PermissionError: If the user is not authorized to access this endpoint (HTTP 401 error).
         """
-        response = requests.get(f"{self.base_url}/race/{race_id}/runs/firstsplit", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        elif response.status_code == 401:  # Unauthorized access
-            raise PermissionError("You are not authorized to access this endpoint.")
-        else:
-            response.raise_for_status()  # Raises an HTTPError for other unsuccessful status codes
+        return self._fetch(_restricted_json, f"/race/{race_id}/runs/firstsplit", force_refresh=force_refresh)
 
     # def get_race_first_split(self, race_id: int) -> dict:
     #     """
@@ -304,18 +832,12 @@ class TopazAPI:
     #     Raises:
     #         PermissionError: If the user is not authorized to access this endpoint (HTTP 401 error).
     #     """
-    #     response = requests.get(f"{self.base_url}/race/{race_id}/firstsplit", headers=self.headers, timeout=30)
-    #     if response.status_code == 200:
-    #         return response.json()  # Returns a dictionary representing the JSON response
-    #     elif response.status_code == 401:  # Unauthorized access
-    #         raise PermissionError("You are not authorized to access this endpoint.")
-    #     else:
-    #         response.raise_for_status()  # Raises an HTTPError for other unsuccessful status codes
+    #     return self._fetch(_restricted_json, f"/race/{race_id}/firstsplit")
 
     ### Internal
 
     ### Isolynx
-    def get_isolynx_splits(self, race_id: int) -> dict:
+    def get_isolynx_splits(self, race_id: int, force_refresh: bool = False) -> dict:
         """
         Returns a list of runners with ISO Lynx Split data.
         Requires the caller to have access to Isolynx data.
@@ -323,6 +845,7 @@ class TopazAPI:
         Args:
             race_id (int): The unique identifier of the race to retrieve ISO Lynx Split data for.
                         Example value could be 509346808.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing ISO Lynx Split data for the runners in the specified race.
@@ -330,16 +853,11 @@ class TopazAPI:
         Raises:
             PermissionError: If the user is not authorized to access this endpoint (HTTP 401 error).
         """
-        response = requests.get(f"{self.base_url}/isolynx/{race_id}/splits", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        elif response.status_code == 401:  # Unauthorized access
-            raise PermissionError("You are not authorized to access this endpoint.")
-        else:
-            response.raise_for_status()  # Raises an HTTPError for other unsuccessful status codes
+        return self._fetch(_restricted_json, f"/isolynx/{race_id}/splits", force_refresh=force_refresh)
 
     ### Meeting
-    def get_meetings(self, from_date: str, to_date: str = None, owning_authority_code: str = None) -> pd.DataFrame:
+    def get_meetings(self, from_date: str, to_date: str = None, owning_authority_code: str = None,
+                     typed: bool = None, force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Returns a list of Meetings between the two provided dates. When the 'to' date is not supplied, 
         it defaults to the same date as the date provided by 'from'. 
@@ -349,23 +867,33 @@ class TopazAPI:
         Args:
             from_date (str): The start date for the query, in YYYY-MM-DD format. Must be a valid date.
             to_date (str, optional): The end date for the query, in YYYY-MM-DD format. Defaults to the same as 'from_date'.
-            owning_authority_code (str, optional): The code of the owning authority. Must be one of: 'ACT', 'NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA', 'NZ'.
+            owning_authority_code (str or list, optional): The code of the owning authority. Must be one of: 'ACT', 'NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA', 'NZ'.
+                                                           A list of codes or 'ALL' queries the authorities concurrently and adds an 'owningAuthority' column.
+            typed (bool, optional): Build the DataFrame with the declared compact schema (categorical strings, downcast
+                                    numbers, datetime columns). False keeps the raw inferred frame. Defaults to the
+                                    client's typed_frames setting.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
 
         Returns:
             pd.DataFrame: A DataFrame containing the list of meetings.
         """
+        codes = _authority_codes(owning_authority_code)
+        if codes is not None:
+            return self._fetch_authorities(self.get_meetings, codes, self._schema('meetings', typed), self._output(output),
+                                           from_date=from_date, to_date=to_date, force_refresh=force_refresh)
         params = {
             'from': from_date,
             'to': to_date or from_date,  # Defaults to from_date if to_date is not provided
             'owningauthoritycode': owning_authority_code
         }
-        response = requests.get(f"{self.base_url}/meeting", headers=self.headers, params=params, timeout=30)
-        if response.status_code == 200:
-            return pd.DataFrame(response.json())
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_frame, "/meeting", params=params, force_refresh=force_refresh,
+                           schema=self._schema('meetings', typed), output=self._output(output))
 
-    def get_updated_meetings(self, since: str, owning_authority_code: str = 'VIC') -> pd.DataFrame:
+    def get_updated_meetings(self, since: str, owning_authority_code: str = 'VIC',
+                             typed: bool = None, force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Returns a list of Meetings that have changed (scratchings or results) since the specified date/time.
         Meetings are limited to the authorities (owningauthoritycode) that the user has access to. 
@@ -374,23 +902,33 @@ class TopazAPI:
         Args:
             since (str): Must be a valid date and time. Use format YYYY-MM-DD HH:mm:ss. 
                          Is interpreted as Melbourne Local time unless time zone is specified.
-            owning_authority_code (str, optional): Restrict meetings to the specified authority. 
+            owning_authority_code (str or list, optional): Restrict meetings to the specified authority. 
                                                    Defaults to VIC. Valid values: 'ACT', 'NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA', 'NZ'.
+                                                   A list of codes or 'ALL' queries the authorities concurrently and adds an 'owningAuthority' column.
+            typed (bool, optional): Build the DataFrame with the declared compact schema (categorical strings, downcast
+                                    numbers, datetime columns). False keeps the raw inferred frame. Defaults to the
+                                    client's typed_frames setting.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
 
         Returns:
             pd.DataFrame: A DataFrame containing the list of updated meetings.
         """
+        codes = _authority_codes(owning_authority_code)
+        if codes is not None:
+            return self._fetch_authorities(self.get_updated_meetings, codes, self._schema('meetings', typed),
+                                           self._output(output), since=since, force_refresh=force_refresh)
         params = {
             'since': since,
             'owningauthoritycode': owning_authority_code
         }
-        response = requests.get(f"{self.base_url}/meeting/updated", headers=self.headers, params=params, timeout=30)
-        if response.status_code == 200:
-            return pd.DataFrame(response.json())
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_frame, "/meeting/updated", params=params, force_refresh=force_refresh,
+                           schema=self._schema('meetings', typed), output=self._output(output))
 
-    def get_meeting_details(self, meeting_id: int, format: str = 'all'):
+    def get_meeting_details(self, meeting_id: int, format: str = 'all',
+                            force_refresh: bool = False, output: str = None):
         """
         Return all the details of the meeting, including races and runs. 
         Returns a dictionary if format is 'all', otherwise returns a DataFrame.
@@ -399,54 +937,47 @@ class TopazAPI:
             meeting_id (int): The unique identifier of the meeting. E.g.900012680 
             format (str, optional): The format of the meeting details to be returned. 
                                     Valid values: 'all', 'basic', 'basicplus', 'full', 'fullplus'. Default is 'all'.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return for formats other than 'all': 'pandas', 'pyarrow',
+                                    'polars' or 'raw'. Defaults to the client's output setting.
 
         Returns:
             dict or pd.DataFrame: Depending on the format, either a dictionary or a DataFrame containing the meeting details.
         """
         params = {'format': format}
-        response = requests.get(f"{self.base_url}/meeting/{meeting_id}", headers=self.headers, params=params, timeout=30)
-        if response.status_code == 200:
-            if format == 'all':
-                return response.json()  # Returns a dictionary for 'all' format
-            else:
-                return pd.DataFrame(response.json())  # Converts the JSON response to a DataFrame for other formats
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        if format == 'all':  # 'all' returns a dictionary, other formats a DataFrame
+            return self._fetch(_json, f"/meeting/{meeting_id}", params=params, force_refresh=force_refresh)
+        return self._fetch(_frame, f"/meeting/{meeting_id}", params=params, force_refresh=force_refresh,
+                           output=self._output(output))
 
-    def get_meeting_form(self, meeting_id: int) -> dict:
+    def get_meeting_form(self, meeting_id: int, force_refresh: bool = False) -> dict:
         """
         Return all the details of the meeting, including races and runs. 
         Also includes Form data for the dogs in the meeting.
 
         Args:
             meeting_id (int): The unique identifier of the meeting. E.g. 900012680
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing all the details of the meeting, including form data.
         """
-        response = requests.get(f"{self.base_url}/meeting/{meeting_id}/form", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_json, f"/meeting/{meeting_id}/form", force_refresh=force_refresh)
 
-    def get_meeting_results(self, meeting_id: int) -> dict:
+    def get_meeting_results(self, meeting_id: int, force_refresh: bool = False) -> dict:
         """
         Return all the details of the meeting, including races, runs, and results.
 
         Args:
             meeting_id (int): The unique identifier of the meeting. E.g. 900012680.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing all the details of the meeting, including races, runs, and results.
         """
-        response = requests.get(f"{self.base_url}/meeting/{meeting_id}/results", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_json, f"/meeting/{meeting_id}/results", force_refresh=force_refresh)
 
-    def get_meeting_results_first_split(self, meeting_id: int) -> dict:
+    def get_meeting_results_first_split(self, meeting_id: int, force_refresh: bool = False) -> dict:
         """
         Return all the details of the meeting, including races, runs, and results. 
         Includes First Split data for all dogs where available, and returns the most up-to-date data at all times.
@@ -454,6 +985,7 @@ class TopazAPI:
 
         Args:
             meeting_id (int): The unique identifier of the meeting. Example value could be 900012680.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing all the details of the meeting, including races, runs, results, and First Split data.
@@ -461,31 +993,22 @@ class TopazAPI:
         Raises:
             PermissionError: If the user is not authorized to access this endpoint (HTTP 401 error).
         """
-        response = requests.get(f"{self.base_url}/meeting/{meeting_id}/results/firstsplit", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        elif response.status_code == 401:  # Unauthorized access
-            raise PermissionError("You are not authorized to access this endpoint.")
-        else:
-            response.raise_for_status()  # Raises an HTTPError for other unsuccessful status codes
+        return self._fetch(_restricted_json, f"/meeting/{meeting_id}/results/firstsplit", force_refresh=force_refresh)
 
-    def get_meeting_races(self, meeting_id: int) -> dict:
+    def get_meeting_races(self, meeting_id: int, force_refresh: bool = False) -> dict:
         """
         Returns a list of all races for the specified meeting.
 
         Args:
             meeting_id (int): The unique identifier of the meeting. Example value could be 900012680.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing a list of all races for the specified meeting.
         """
-        response = requests.get(f"{self.base_url}/meeting/{meeting_id}/races", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_json, f"/meeting/{meeting_id}/races", force_refresh=force_refresh)
 
-    def get_races_first_split(self, meeting_id: int) -> dict:
+    def get_races_first_split(self, meeting_id: int, force_refresh: bool = False) -> dict:
         """
         Returns a list of all races for the specified meeting. 
         Includes First Split data for all dogs where available, and returns the most up-to-date data at all times.
@@ -493,6 +1016,7 @@ class TopazAPI:
 
         Args:
             meeting_id (int): The unique identifier of the meeting. Example value could be 425059749.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing a list of all races with First Split data for the specified meeting.
@@ -500,169 +1024,157 @@ class TopazAPI:
         Raises:
             PermissionError: If the user is not authorized to access this endpoint (HTTP 401 error).
         """
-        response = requests.get(f"{self.base_url}/meeting/{meeting_id}/races/firstsplit", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        elif response.status_code == 401:  # Unauthorized access
-            raise PermissionError("You are not authorized to access this endpoint.")
-        else:
-            response.raise_for_status()  # Raises an HTTPError for other unsuccessful status codes
+        return self._fetch(_restricted_json, f"/meeting/{meeting_id}/races/firstsplit", force_refresh=force_refresh)
 
-    def get_meeting_field(self, meeting_id: int) -> dict:
+    def get_meeting_field(self, meeting_id: int, force_refresh: bool = False) -> dict:
         """
         Gets a minimal set of the latest field information for a meeting, primarily to get latest scratching and reserve details.
 
         Args:
             meeting_id (int): The unique identifier of the meeting. Example value could be 900012680.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the latest field information for the specified meeting.
         """
-        response = requests.get(f"{self.base_url}/meeting/{meeting_id}/field", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_json, f"/meeting/{meeting_id}/field", force_refresh=force_refresh)
 
-    def get_race_field(self, meeting_id: int, race_id: int) -> pd.DataFrame:
+    def get_race_field(self, meeting_id: int, race_id: int,
+                       force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Gets a minimal set of the latest field information for a race within a meeting, primarily to get latest scratching and reserve details.
 
         Args:
             meeting_id (int): The id of the meeting to get the latest field for. E.g. 900012680
             race_id (int): The id of the race within the meeting to get the latest field for. E.g. 972428497
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
 
         Returns:
             pd.DataFrame: A DataFrame containing the latest field information for the specified race within the meeting.
         """
-        response = requests.get(f"{self.base_url}/meeting/{meeting_id}/field/{race_id}", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return pd.DataFrame(response.json())
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_frame, f"/meeting/{meeting_id}/field/{race_id}", force_refresh=force_refresh,
+                           output=self._output(output))
 
-    def get_race_field(self, meeting_id: int, race_id: int) -> dict:
+    def get_race_field(self, meeting_id: int, race_id: int, force_refresh: bool = False) -> dict:
         """
         Gets a minimal set of the latest field information for a race within a meeting, primarily to get latest scratching and reserve details.
 
         Args:
             meeting_id (int): The id of the meeting to get the latest field for.
             race_id (int): The id of the race within the meeting to get the latest field for.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the latest field information for the specified race within the meeting.
         """
-        response = requests.get(f"{self.base_url}/meeting/{meeting_id}/field/{race_id}", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_json, f"/meeting/{meeting_id}/field/{race_id}", force_refresh=force_refresh)
 
     ### Race
-    def get_races(self, from_date: str, to_date: str = None, owning_authority_code: str = None) -> pd.DataFrame:
+    def get_races(self, from_date: str, to_date: str = None, owning_authority_code: str = None,
+                  typed: bool = None, force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Get a list of all races between the dates given. Constrained by any configured limits on the users Account's access to the specified state (owningAuthority).
 
         Args:
             from_date (str): Must be a valid date. Use format YYYY-MM-DD.
             to_date (str, optional): Must be a valid date if present. Use format YYYY-MM-DD. Defaults to the same date as from_date.
-            owning_authority_code (str, optional): One of 'ACT', 'NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA', 'NZ'.
+            owning_authority_code (str or list, optional): One of 'ACT', 'NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA', 'NZ'.
+                                                           A list of codes or 'ALL' queries the authorities concurrently and adds an 'owningAuthority' column.
+            typed (bool, optional): Build the DataFrame with the declared compact schema (categorical strings, downcast
+                                    numbers, datetime columns). False keeps the raw inferred frame. Defaults to the
+                                    client's typed_frames setting.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
 
         Returns:
             pd.DataFrame: A DataFrame containing all the races within the specified date range and owning authority.
         """
+        codes = _authority_codes(owning_authority_code)
+        if codes is not None:
+            return self._fetch_authorities(self.get_races, codes, self._schema('races', typed), self._output(output),
+                                           from_date=from_date, to_date=to_date, force_refresh=force_refresh)
         params = {
             'from': from_date,
             'to': to_date or from_date,  # Defaults to from_date if to_date is not provided
             'owningauthoritycode': owning_authority_code
         }
-        response = requests.get(f"{self.base_url}/race", headers=self.headers, params=params, timeout=30)
-        if response.status_code == 200:
-            return pd.DataFrame(response.json())
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_frame, "/race", params=params, force_refresh=force_refresh,
+                           schema=self._schema('races', typed), output=self._output(output))
 
-    def get_races_for_meeting(self, meeting_id: int) -> dict:
+    def get_races_for_meeting(self, meeting_id: int, force_refresh: bool = False) -> dict:
         """
         Get the list of Races for a specified meeting.
 
         Args:
             meeting_id (int): The unique identifier of the meeting. Example value could be 900012673.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the list of races for the specified meeting.
         """
-        response = requests.get(f"{self.base_url}/race/meeting/{meeting_id}", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_json, f"/race/meeting/{meeting_id}", force_refresh=force_refresh)
 
-    def get_race_result(self, race_id: int) -> dict:
+    def get_race_result(self, race_id: int, force_refresh: bool = False) -> dict:
         """
         Retrieves the result of a specific race.
 
         Args:
             race_id (int): The unique identifier of the race. Example value could be 972428497.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the result of the specified race.
         """
-        response = requests.get(f"{self.base_url}/race/{race_id}/result", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_json, f"/race/{race_id}/result", force_refresh=force_refresh)
 
-    def get_race_runs(self, race_id: int) -> pd.DataFrame:
+    def get_race_runs(self, race_id: int, force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Returns a list of dogs and the details of their run within the specified race.
 
         Args:
             race_id (int): The unique identifier of the race. Example value could be 972428497.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
 
         Returns:
             pd.DataFrame: A DataFrame containing the list of dogs and the details of their runs in the specified race.
         """
-        response = requests.get(f"{self.base_url}/race/{race_id}/runs", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return pd.DataFrame(response.json())
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_frame, f"/race/{race_id}/runs", force_refresh=force_refresh, output=self._output(output))
 
-    def get_race_runs_form(self, race_id: int) -> dict:
+    def get_race_runs_form(self, race_id: int, force_refresh: bool = False) -> dict:
         """
         Returns a list of dogs and the details of their run within the specified race, including form data.
 
         Args:
             race_id (int): The id of the race for which to receive the list of Runs (dogs and their run details for the race specified).
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the list of dogs and the details of their runs, including form data, in the specified race.
         """
-        response = requests.get(f"{self.base_url}/race/{race_id}/runs/form", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_json, f"/race/{race_id}/runs/form", force_refresh=force_refresh)
 
-    def get_race_field(self, race_id: int) -> dict:
+    def get_race_field(self, race_id: int, force_refresh: bool = False) -> dict:
         """
         Gets a minimal set of the latest field information for a race, primarily to get latest scratching and reserve details.
 
         Args:
             race_id (int): The unique identifier of the race. Example value could be 972428497.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the latest field information for the specified race.
         """
-        response = requests.get(f"{self.base_url}/race/{race_id}/field", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_json, f"/race/{race_id}/field", force_refresh=force_refresh)
 
-    def get_race_runs_first_split(self, race_id: int) -> dict:
+    def get_race_runs_first_split(self, race_id: int, force_refresh: bool = False) -> dict:
         """
         Returns a list of dogs and the details of their run within the specified race. 
         The results of this call include First Split information for each run if available and always returns the latest information.
@@ -670,6 +1182,7 @@ class TopazAPI:
 
         Args:
             race_id (int): The unique identifier of the race. Example value could be 509346808.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing the list of dogs and the details of their runs, including First Split information, in the specified race.
@@ -677,15 +1190,9 @@ class TopazAPI:
         Raises:
             PermissionError: If the user is not authorized to access this endpoint (HTTP 401 error).
         """
-        response = requests.get(f"{self.base_url}/race/{race_id}/runs/firstsplit", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        elif response.status_code == 401:  # Unauthorized access
-            raise PermissionError("You are not authorized to access this endpoint.")
-        else:
-            response.raise_for_status()  # Raises an HTTPError for other unsuccessful status codes
+        return self._fetch(_restricted_json, f"/race/{race_id}/runs/firstsplit", force_refresh=force_refresh)
 
-    def get_race_first_split(self, race_id: int) -> dict:
+    def get_race_first_split(self, race_id: int, force_refresh: bool = False) -> dict:
         """
         Returns a list of just the first split data for runs in the specified race.
         Requires the caller to have access to first split information.
@@ -693,6 +1200,7 @@ class TopazAPI:
 
         Args:
             race_id (int): The unique identifier of the race. Example value could be 972428497.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
 
         Returns:
             dict: A dictionary containing just the first split data for the runs in the specified race.
@@ -700,15 +1208,10 @@ class TopazAPI:
         Raises:
             PermissionError: If the user is not authorized to access this endpoint (HTTP 401 error).
         """
-        response = requests.get(f"{self.base_url}/race/{race_id}/firstsplit", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        elif response.status_code == 401:  # Unauthorized access
-            raise PermissionError("You are not authorized to access this endpoint.")
-        else:
-            response.raise_for_status()  # Raises an HTTPError for other unsuccessful status codes
+        return self._fetch(_restricted_json, f"/race/{race_id}/firstsplit", force_refresh=force_refresh)
 
-    def get_upcoming_races(self, from_datetime: str = None) -> pd.DataFrame:
+    def get_upcoming_races(self, from_datetime: str = None,
+                           typed: bool = None, force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Get a list of all remaining races for a particular date after the date and time given. 
         Defaults to the current date and time. (VIC races only).
@@ -716,92 +1219,93 @@ class TopazAPI:
         Args:
             from_datetime (str, optional): The start date and time for the query in YYYY-MM-DD HH:mm format. 
                                            Defaults to the current date and time.
+            typed (bool, optional): Build the DataFrame with the declared compact schema (categorical strings, downcast
+                                    numbers, datetime columns). False keeps the raw inferred frame. Defaults to the
+                                    client's typed_frames setting.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
 
         Returns:
             pd.DataFrame: A DataFrame containing all the remaining races after the specified date and time.
         """
         params = {'from': from_datetime} if from_datetime else {}
-        response = requests.get(f"{self.base_url}/race/upcoming", headers=self.headers, params=params, timeout=30)
-        if response.status_code == 200:
-            return pd.DataFrame(response.json())
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_frame, "/race/upcoming", params=params, force_refresh=force_refresh,
+                           schema=self._schema('races', typed), output=self._output(output))
 
     ### RaceResult
-    def get_recent_race_results(self) -> dict:
+    def get_recent_race_results(self, force_refresh: bool = False) -> dict:
         """
         Get a list of the most recently finalised races with runs and exotic bet types for display on the website.
 
+        Args:
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+
         Returns:
             dict: A dictionary containing the most recently finalized races, along with runs and exotic bet types.
         """
-        response = requests.get(f"{self.base_url}/raceresult/recent", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_json, "/raceresult/recent", force_refresh=force_refresh)
 
     ### Race
-    def get_runs_for_race(self, race_id: int) -> pd.DataFrame:
+    def get_runs_for_race(self, race_id: int, force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Returns a list of dogs and the details of their run within the specified race.
 
         Args:
             race_id (int): The unique identifier of the race. Example value could be 972428497.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
 
         Returns:
             pd.DataFrame: A DataFrame containing the list of dogs and the details of their runs in the specified race.
         """
-        response = requests.get(f"{self.base_url}/run/race/{race_id}", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return pd.DataFrame(response.json())
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_frame, f"/run/race/{race_id}", force_refresh=force_refresh, output=self._output(output))
 
     ### Statistics
 
     ### System
-    def get_change_log(self) -> dict:
+    def get_change_log(self, force_refresh: bool = False) -> dict:
         """
         Returns change log.
 
+        Args:
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+
         Returns:
             dict: A dictionary containing the change log.
         """
-        response = requests.get(f"{self.base_url}/changelog", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_json, "/changelog", force_refresh=force_refresh)
 
-    def get_server_health(self) -> dict:
+    def get_server_health(self, force_refresh: bool = False) -> dict:
         """
         Returns indication of the health of the server.
 
+        Args:
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+
         Returns:
             dict: A dictionary indicating the health of the server.
         """
-        response = requests.get(f"{self.base_url}/health", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_json, "/health", force_refresh=force_refresh)
 
-    def get_cache_health(self) -> dict:
+    def get_cache_health(self, force_refresh: bool = False) -> dict:
         """
         Returns some stats about the internal usage of cache within the server.
 
+        Args:
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+
         Returns:
             dict: A dictionary containing statistics about the server's cache usage.
         """
-        response = requests.get(f"{self.base_url}/health/cache", headers=self.headers, timeout=30)
-        if response.status_code == 200:
-            return response.json()  # Returns a dictionary representing the JSON response
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_json, "/health/cache", force_refresh=force_refresh)
 
     ### Trainers
-    def search_trainers(self, search_term: str, exact_match: bool = False, records: int = 300) -> pd.DataFrame:
+    def search_trainers(self, search_term: str, exact_match: bool = False, records: int = 300,
+                        force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Returns a list of dogs and the details of their run within the specified race.
 
@@ -809,6 +1313,10 @@ class TopazAPI:
             search_term (str): The full or partial name of the target greyhound trainer.
             exact_match (bool, optional): Limits the records returned to all trainers matched by first name and surname. Default is False.
             records (int, optional): The maximum number of records to return. Default is 300 hits.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
 
         Returns:
             pd.DataFrame: A DataFrame containing the search results.
@@ -818,14 +1326,12 @@ class TopazAPI:
             'exactmatch': exact_match,
             'records': records
         }
-        response = requests.get(f"{self.base_url}/search/trainers", headers=self.headers, params=params, timeout=30)
-        if response.status_code == 200:
-            return pd.DataFrame(response.json())
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_frame, "/search/trainers", params=params, force_refresh=force_refresh,
+                           output=self._output(output))
 
     ### TrialResults
-    def get_trial_results(self, from_date: str, to_date: str = None) -> pd.DataFrame:
+    def get_trial_results(self, from_date: str, to_date: str = None,
+                          force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Returns a list of Trial Results between the two provided dates. 
         When the 'to' date is not supplied, it defaults to the same date as the date provided by 'from'. 
@@ -835,6 +1341,10 @@ class TopazAPI:
         Args:
             from_date (str): The start date for the query, in YYYY-MM-DD format.
             to_date (str, optional): The end date for the query, in YYYY-MM-DD format. Defaults to the same as 'from_date'.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
 
         Returns:
             pd.DataFrame: A DataFrame containing the trial results between the specified dates.
@@ -843,26 +1353,32 @@ class TopazAPI:
             'from': from_date,
             'to': to_date or from_date  # Defaults to from_date if to_date is not provided
         }
-        response = requests.get(f"{self.base_url}/trialresult", headers=self.headers, params=params, timeout=30)
-        if response.status_code == 200:
-            return pd.DataFrame(response.json())
-        else:
-            response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+        return self._fetch(_frame, "/trialresult", params=params, force_refresh=force_refresh,
+                           output=self._output(output))
 
     ### Wagering
     ### Watchdog
 
     ### Bulk Data
-    def get_bulk_runs_by_day(self, owning_authority_code: str, year: int, month: int, day: int) -> pd.DataFrame:
+    def get_bulk_runs_by_day(self, owning_authority_code: str, year: int, month: int, day: int,
+                             typed: bool = None, force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Retrieves bulk run data for a specific day and specific jurisdiction.
 
         Args:
-            owning_authority_code (str): The code of the owning authority. 
+            owning_authority_code (str or list): The code of the owning authority. 
                                        Must be one of: 'ACT', 'NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA', 'NZ'.
+                                       A list of codes or 'ALL' queries the authorities concurrently and adds an 'owningAuthority' column.
             year (int): The year for which to retrieve data.
             month (int): The month for which to retrieve data.
             day (int): The day for which to retrieve data.
+            typed (bool, optional): Build the DataFrame with the declared compact schema (categorical strings, downcast
+                                    numbers, datetime columns). False keeps the raw inferred frame. Defaults to the
+                                    client's typed_frames setting.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
 
         Returns:
             pd.DataFrame: A DataFrame containing bulk run data for the specified day and jurisdiction.
@@ -872,44 +1388,35 @@ class TopazAPI:
             PermissionError: If the user does not have access to the requested data.
             HTTPError: If the API returns an error response.
         """
-        # Validate owning authority code
-        valid_authority_codes = ['ACT', 'NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA', 'NZ']
-        if owning_authority_code not in valid_authority_codes:
-            raise ValueError(f"Invalid owning authority code: {owning_authority_code}. "
-                             f"Must be one of: {', '.join(valid_authority_codes)}")
-
-        response = requests.get(
-            f"{self.base_url}/bulk/runs/{owning_authority_code}/{year}/{month}/{day}", 
-            headers=self.headers, 
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            # Convert the list of BulkRunOutput objects to a DataFrame
-            return pd.DataFrame(response.json())
-        elif response.status_code == 400:  # Bad Request
-            error_msg = response.json().get('message', 'Bad request - The request was malformed')
-            raise ValueError(f"Invalid request parameters: {error_msg}")
-        elif response.status_code == 401:  # Unauthorized access
-            raise PermissionError("You are not authorized to access this data.")
-        elif response.status_code == 404:  # No data found
-            # Return an empty DataFrame instead of raising an error
-            return pd.DataFrame()
-        elif response.status_code == 422:  # Validation Failed
-            error_msg = response.json().get('message', 'Validation failed')
-            raise ValueError(f"Validation error: {error_msg}")
-        else:
-            response.raise_for_status()  # Raises an HTTPError for other unsuccessful status codes
-
-    def get_bulk_runs_by_month(self, owning_authority_code: str, year: int, month: int) -> pd.DataFrame:
+        codes = _authority_codes(owning_authority_code)
+        if codes is not None:
+            return self._fetch_authorities(self.get_bulk_runs_by_day, codes, self._schema('bulk_runs', typed),
+                                           self._output(output), year=year, month=month, day=day,
+                                           force_refresh=force_refresh)
+        _validate_authority_code(owning_authority_code)
+
+        return self._fetch(_bulk_frame, f"/bulk/runs/{owning_authority_code}/{year}/{month}/{day}",
+                           force_refresh=force_refresh, schema=self._schema('bulk_runs', typed),
+                           output=self._output(output))
+
+    def get_bulk_runs_by_month(self, owning_authority_code: str, year: int, month: int,
+                               typed: bool = None, force_refresh: bool = False, output: str = None) -> pd.DataFrame:
         """
         Retrieves bulk run data for a specified month and year for a given owning authority code.
 
         Args:
-            owning_authority_code (str): The code of the owning authority. 
+            owning_authority_code (str or list): The code of the owning authority. 
                                        Must be one of: 'ACT', 'NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA', 'NZ'.
+                                       A list of codes or 'ALL' queries the authorities concurrently and adds an 'owningAuthority' column.
             year (int): The year for which to retrieve data.
             month (int): The month for which to retrieve data.
+            typed (bool, optional): Build the DataFrame with the declared compact schema (categorical strings, downcast
+                                    numbers, datetime columns). False keeps the raw inferred frame. Defaults to the
+                                    client's typed_frames setting.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): The kind of value to return: 'pandas' for a DataFrame, 'pyarrow' for a Table,
+                                    'polars' for a polars DataFrame or 'raw' for the decoded JSON list.
+                                    Defaults to the client's output setting.
 
         Returns:
             pd.DataFrame: A DataFrame containing bulk run data for the specified month, year, and jurisdiction.
@@ -919,31 +1426,366 @@ class TopazAPI:
             PermissionError: If the user does not have access to the requested data.
             HTTPError: If the API returns an error response.
         """
-        # Validate owning authority code
-        valid_authority_codes = ['ACT', 'NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA', 'NZ']
-        if owning_authority_code not in valid_authority_codes:
-            raise ValueError(f"Invalid owning authority code: {owning_authority_code}. "
-                             f"Must be one of: {', '.join(valid_authority_codes)}")
-
-        response = requests.get(
-            f"{self.base_url}/bulk/runs/{owning_authority_code}/{year}/{month}", 
-            headers=self.headers, 
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            # Convert the list of BulkRunOutput objects to a DataFrame
-            return pd.DataFrame(response.json())
-        elif response.status_code == 400:  # Bad Request
-            error_msg = response.json().get('message', 'Bad request - The request was malformed')
-            raise ValueError(f"Invalid request parameters: {error_msg}")
-        elif response.status_code == 401:  # Unauthorized access
-            raise PermissionError("You are not authorized to access this data.")
-        elif response.status_code == 404:  # No data found
-            # Return an empty DataFrame instead of raising an error
-            return pd.DataFrame()
-        elif response.status_code == 422:  # Validation Failed
-            error_msg = response.json().get('message', 'Validation failed')
-            raise ValueError(f"Validation error: {error_msg}")
-        else:
-            response.raise_for_status()  # Raises an HTTPError for other unsuccessful status codes
\ No newline at end of file
+        codes = _authority_codes(owning_authority_code)
+        if codes is not None:
+            return self._fetch_authorities(self.get_bulk_runs_by_month, codes, self._schema('bulk_runs', typed),
+                                           self._output(output), year=year, month=month, force_refresh=force_refresh)
+        _validate_authority_code(owning_authority_code)
+
+        return self._fetch(_bulk_frame, f"/bulk/runs/{owning_authority_code}/{year}/{month}",
+                           force_refresh=force_refresh, schema=self._schema('bulk_runs', typed),
+                           output=self._output(output))
+
+    def iter_bulk_runs_by_day(self, owning_authority_code: str, year: int, month: int, day: int,
+                              chunk_size: int = 10000, typed: bool = None, output: str = None):
+        """
+        Streams bulk run data for a specific day and jurisdiction as DataFrames of at most chunk_size rows.
+        See iter_bulk_runs_by_month.
+
+        Args:
+            owning_authority_code (str or list): The code of the owning authority.
+                                       Must be one of: 'ACT', 'NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA', 'NZ'.
+                                       A list of codes or 'ALL' streams the authorities one after the other and adds
+                                       an 'owningAuthority' column.
+            year (int): The year for which to retrieve data.
+            month (int): The month for which to retrieve data.
+            day (int): The day for which to retrieve data.
+            chunk_size (int, optional): The number of rows per DataFrame. Default is 10000.
+            typed (bool, optional): Build each chunk with the declared compact schema. Defaults to the client's
+                                    typed_frames setting.
+            output (str, optional): What each chunk is: 'pandas', 'pyarrow', 'polars' or 'raw'.
+                                    Defaults to the client's output setting.
+
+        Returns:
+            Iterator[pd.DataFrame]: The bulk run data in chunks. Nothing is yielded if there is no data.
+        """
+        codes = _authority_codes(owning_authority_code)
+        if codes is not None:
+            return self._iter_authorities(lambda code: f"/bulk/runs/{code}/{year}/{month}/{day}", codes, chunk_size,
+                                          self._schema('bulk_runs', typed), self._output(output))
+        _validate_authority_code(owning_authority_code)
+        return self._iter_bulk_runs(f"/bulk/runs/{owning_authority_code}/{year}/{month}/{day}", chunk_size,
+                                    self._schema('bulk_runs', typed), self._output(output))
+
+    def iter_bulk_runs_by_month(self, owning_authority_code: str, year: int, month: int, chunk_size: int = 10000,
+                                typed: bool = None, output: str = None):
+        """
+        Streams bulk run data for a specified month and year for a given owning authority code.
+        The response body is decoded incrementally as it downloads and turned into DataFrames of at most
+        chunk_size rows, so peak memory depends on chunk_size rather than on the size of the month.
+        The request is sent when iteration starts. Streamed responses bypass the response cache.
+
+        Args:
+            owning_authority_code (str or list): The code of the owning authority.
+                                       Must be one of: 'ACT', 'NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA', 'NZ'.
+                                       A list of codes or 'ALL' streams the authorities one after the other and adds
+                                       an 'owningAuthority' column.
+            year (int): The year for which to retrieve data.
+            month (int): The month for which to retrieve data.
+            chunk_size (int, optional): The number of rows per DataFrame. Default is 10000.
+            typed (bool, optional): Build each chunk with the declared compact schema. Defaults to the client's
+                                    typed_frames setting.
+            output (str, optional): What each chunk is: 'pandas', 'pyarrow', 'polars' or 'raw'.
+                                    Defaults to the client's output setting.
+
+        Returns:
+            Iterator[pd.DataFrame]: The bulk run data in chunks. Nothing is yielded if there is no data.
+
+        Raises:
+            ValueError: If the owning authority code is invalid or if the request parameters are invalid.
+            PermissionError: If the user does not have access to the requested data.
+            HTTPError: If the API returns an error response.
+        """
+        codes = _authority_codes(owning_authority_code)
+        if codes is not None:
+            return self._iter_authorities(lambda code: f"/bulk/runs/{code}/{year}/{month}", codes, chunk_size,
+                                          self._schema('bulk_runs', typed), self._output(output))
+        _validate_authority_code(owning_authority_code)
+        return self._iter_bulk_runs(f"/bulk/runs/{owning_authority_code}/{year}/{month}", chunk_size,
+                                    self._schema('bulk_runs', typed), self._output(output))
+
+    def _iter_authorities(self, path, codes: list, chunk_size: int, schema: str, output: str):
+        # Streams one authority after the other. As with _fetch_authorities, denied authorities are skipped and
+        # reported once the others are done.
+        errors = {}
+        for code in codes:
+            try:
+                for chunk in self._iter_bulk_runs(path(code), chunk_size, schema, output, authority=code):
+                    yield chunk
+            except Exception as e:
+                if not _denied(e):
+                    raise
+                errors[code] = e
+        if errors:
+            if len(errors) == len(codes):
+                raise next(iter(errors.values()))
+            warnings.warn(AuthorityWarning(f"Not authorized for {', '.join(errors)}; their rows are missing.", errors),
+                          stacklevel=2)
+
+    def _iter_bulk_runs(self, path: str, chunk_size: int, schema: str = None, output: str = 'pandas',
+                        authority: str = None):
+        with self._send(path, stream=True) as response:
+            if response.status_code != 200:
+                _bulk_frame(response)  # Raises for errors, returns an empty DataFrame when there is no data
+                return
+            records = []
+            for record in iter_json_array(response.iter_content(chunk_size=64 * 1024)):
+                if authority is not None:
+                    record['owningAuthority'] = authority
+                records.append(record)
+                if len(records) == chunk_size:
+                    yield _to_frame(records, schema, output)
+                    records = []
+            if records:
+                yield _to_frame(records, schema, output)
+
+    ### Batch
+    def _fetch_many(self, method, ids, max_workers: int = None, **kwargs):
+        """
+        Calls an endpoint method once per ID on a bounded thread pool.
+
+        Args:
+            method (callable): The bound endpoint method, e.g. self.get_race_runs. Called as method(id, **kwargs).
+            ids (iterable): The IDs to fetch. Duplicates are fetched once.
+            max_workers (int, optional): The number of concurrent requests. Defaults to the pool_maxsize of the client.
+            **kwargs: Extra keyword arguments passed to every call.
+
+        Returns:
+            tuple: A dictionary of results keyed by ID in input order, and a dictionary of exceptions keyed by ID.
+        """
+        ids = list(dict.fromkeys(ids))
+        results, errors = {}, {}
+        if not ids:
+            return results, errors
+        with ThreadPoolExecutor(max_workers=min(max_workers or self.pool_maxsize, len(ids))) as executor:
+            futures = [(id_, executor.submit(method, id_, **kwargs)) for id_ in ids]
+            for id_, future in futures:
+                try:
+                    results[id_] = future.result()
+                except Exception as e:
+                    errors[id_] = e
+        return results, errors
+
+    def get_race_runs_many(self, race_ids: list, max_workers: int = None) -> BatchResult:
+        """
+        Fetches the runs for many races concurrently. See get_race_runs.
+
+        Args:
+            race_ids (list): The ids of the races. E.g. [972428497, 972428498]
+            max_workers (int, optional): The number of concurrent requests. Defaults to the pool_maxsize of the client.
+
+        Returns:
+            BatchResult: A single DataFrame of all runs with a 'raceId' column, in input order,
+                         and a dictionary of the errors raised for any race that could not be fetched.
+        """
+        frames, errors = self._fetch_many(self.get_race_runs, race_ids, max_workers, output='pandas')
+        return BatchResult(_concat_frames(frames, 'raceId'), errors)
+
+    def get_race_runs_form_many(self, race_ids: list, max_workers: int = None) -> BatchResult:
+        """
+        Fetches the runs, including form data, for many races concurrently. See get_race_runs_form.
+
+        Args:
+            race_ids (list): The ids of the races. E.g. [972428497, 972428498]
+            max_workers (int, optional): The number of concurrent requests. Defaults to the pool_maxsize of the client.
+
+        Returns:
+            BatchResult: A dictionary of responses keyed by race id, in input order,
+                         and a dictionary of the errors raised for any race that could not be fetched.
+        """
+        return BatchResult(*self._fetch_many(self.get_race_runs_form, race_ids, max_workers))
+
+    def get_race_results_many(self, race_ids: list, max_workers: int = None) -> BatchResult:
+        """
+        Fetches the results of many races concurrently. See get_race_result.
+
+        Args:
+            race_ids (list): The ids of the races. E.g. [972428497, 972428498]
+            max_workers (int, optional): The number of concurrent requests. Defaults to the pool_maxsize of the client.
+
+        Returns:
+            BatchResult: A dictionary of results keyed by race id, in input order,
+                         and a dictionary of the errors raised for any race that could not be fetched.
+        """
+        return BatchResult(*self._fetch_many(self.get_race_result, race_ids, max_workers))
+
+    def get_dog_form_many(self, dog_ids: list, meeting_date: str = None, max_workers: int = None) -> BatchResult:
+        """
+        Fetches the form of many dogs concurrently. See get_dog_form.
+
+        Args:
+            dog_ids (list): The GRV ids of the dogs. E.g. [695144538]
+            meeting_date (str, optional): Get form data as at this date for every dog. Format should be 'yyyy-mm-dd'. Default is None.
+            max_workers (int, optional): The number of concurrent requests. Defaults to the pool_maxsize of the client.
+
+        Returns:
+            BatchResult: A single DataFrame of all form lines with a 'dogId' column, in input order,
+                         and a dictionary of the errors raised for any dog that could not be fetched.
+        """
+        frames, errors = self._fetch_many(self.get_dog_form, dog_ids, max_workers, meeting_date=meeting_date,
+                                          output='pandas')
+        return BatchResult(_concat_frames(frames, 'dogId'), errors)
+
+    def get_dog_details_many(self, dog_ids: list, max_workers: int = None) -> BatchResult:
+        """
+        Fetches the details of many dogs concurrently. See get_dog_details.
+
+        Args:
+            dog_ids (list): The GRV ids of the dogs. E.g. [695144538]
+            max_workers (int, optional): The number of concurrent requests. Defaults to the pool_maxsize of the client.
+
+        Returns:
+            BatchResult: A dictionary of dog details keyed by dog id, in input order,
+                         and a dictionary of the errors raised for any dog that could not be fetched.
+        """
+        return BatchResult(*self._fetch_many(self.get_dog_details, dog_ids, max_workers))
+
+    def get_isolynx_splits_many(self, race_ids: list, max_workers: int = None) -> BatchResult:
+        """
+        Fetches the ISO Lynx Split data of many races concurrently. See get_isolynx_splits.
+
+        Args:
+            race_ids (list): The ids of the races. E.g. [509346808]
+            max_workers (int, optional): The number of concurrent requests. Defaults to the pool_maxsize of the client.
+
+        Returns:
+            BatchResult: A dictionary of split data keyed by race id, in input order,
+                         and a dictionary of the errors raised for any race that could not be fetched.
+                         A race you are not authorized to access is reported as a PermissionError.
+        """
+        return BatchResult(*self._fetch_many(self.get_isolynx_splits, race_ids, max_workers))
+
+    ### Date ranges
+    def _fetch_range(self, method, from_date: str, to_date: str, chunk_days: int, max_workers: int,
+                     id_columns: tuple, date_columns: tuple, schema: str, output: str, **kwargs):
+        """
+        Fetches a date range as consecutive windows of chunk_days days, concurrently, and merges the rows.
+
+        Args:
+            method (callable): The bound list method, e.g. self.get_races. Called with from_date, to_date, output='raw'
+                               and **kwargs for each window. With several owning authorities (a list of codes or
+                               'ALL' in kwargs), it is called once per window and authority.
+            from_date (str): The first date of the range, format 'yyyy-mm-dd'.
+            to_date (str): The last date of the range, format 'yyyy-mm-dd'.
+            chunk_days (int): The number of days requested at a time.
+            max_workers (int): The number of concurrent requests. None for the pool_maxsize of the client.
+            id_columns (tuple): The columns identifying a row, used to drop rows returned by more than one window.
+            date_columns (tuple): The columns to sort by, the first one a row has.
+            schema (str): The schema to build the frame with, or None.
+            output (str): The kind of value to return, one of OUTPUTS.
+
+        Raises:
+            Exception: The error of the earliest window that could not be fetched. Authorities that were denied are
+                       reported once for the whole range instead, as _fetch_authorities does.
+        """
+        windows = _date_windows(from_date, to_date, chunk_days)
+        codes = _authority_codes(kwargs.get('owning_authority_code'))
+        if codes is not None:
+            # Fan out over windows and authorities together, so denied authorities are reported once for the range.
+            del kwargs['owning_authority_code']
+        tasks = [(window, code) for window in windows for code in (codes or [None])]
+
+        def fetch(task, **options):
+            (first, last), code = task
+            if code is not None:
+                options['owning_authority_code'] = code
+            return method(from_date=first, to_date=last, **options)
+
+        results, errors = self._fetch_many(fetch, tasks, max_workers, output='raw', **kwargs)
+        denied = {}
+        for task in tasks:
+            if task in errors:
+                if codes is None or not _denied(errors[task]) or not results:
+                    # A range with a missing window would look complete, so fail rather than return part of it.
+                    raise errors[task]
+                denied.setdefault(task[1], errors[task])
+        records = []
+        for task in tasks:
+            code = task[1]
+            rows = results.get(task) or []
+            records.extend(rows if code is None else ({**record, 'owningAuthority': code} for record in rows))
+        frame = _to_frame(_merge_records(records, id_columns, date_columns), schema, output)
+        return _report_denied(frame, denied, output, stacklevel=4)
+
+    def get_meetings_range(self, from_date: str, to_date: str, owning_authority_code: str = None,
+                           chunk_days: int = 7, max_workers: int = None, typed: bool = None,
+                           force_refresh: bool = False, output: str = None) -> pd.DataFrame:
+        """
+        Returns the meetings between two dates like get_meetings, for ranges of any length: the range is requested
+        chunk_days days at a time, concurrently, and the windows are merged into one frame without duplicate
+        meetings, in date order.
+
+        Args:
+            from_date (str): The first date, in YYYY-MM-DD format.
+            to_date (str): The last date, in YYYY-MM-DD format.
+            owning_authority_code (str or list, optional): One of 'ACT', 'NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA', 'NZ',
+                                                           a list of codes or 'ALL'.
+            chunk_days (int, optional): The number of days requested at a time. Default is 7.
+            max_workers (int, optional): The number of concurrent requests. Defaults to the pool_maxsize of the client.
+            typed (bool, optional): Build the DataFrame with the declared compact schema. Defaults to the client's
+                                    typed_frames setting.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): 'pandas', 'pyarrow', 'polars' or 'raw'. Defaults to the client's output setting.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the meetings between the dates.
+
+        Raises:
+            Exception: Whatever get_meetings raised for the earliest window that could not be fetched.
+        """
+        return self._fetch_range(self.get_meetings, from_date, to_date, chunk_days, max_workers, ('meetingId',),
+                                 ('meetingDate',), self._schema('meetings', typed), self._output(output),
+                                 owning_authority_code=owning_authority_code, force_refresh=force_refresh)
+
+    def get_races_range(self, from_date: str, to_date: str, owning_authority_code: str = None,
+                        chunk_days: int = 7, max_workers: int = None, typed: bool = None,
+                        force_refresh: bool = False, output: str = None) -> pd.DataFrame:
+        """
+        Returns the races between two dates like get_races, for ranges of any length. See get_meetings_range.
+
+        Args:
+            from_date (str): The first date, in YYYY-MM-DD format.
+            to_date (str): The last date, in YYYY-MM-DD format.
+            owning_authority_code (str or list, optional): One of 'ACT', 'NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA', 'NZ',
+                                                           a list of codes or 'ALL'.
+            chunk_days (int, optional): The number of days requested at a time. Default is 7.
+            max_workers (int, optional): The number of concurrent requests. Defaults to the pool_maxsize of the client.
+            typed (bool, optional): Build the DataFrame with the declared compact schema. Defaults to the client's
+                                    typed_frames setting.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): 'pandas', 'pyarrow', 'polars' or 'raw'. Defaults to the client's output setting.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the races between the dates, in date and start time order.
+
+        Raises:
+            Exception: Whatever get_races raised for the earliest window that could not be fetched.
+        """
+        return self._fetch_range(self.get_races, from_date, to_date, chunk_days, max_workers, ('raceId',),
+                                 ('startTime', 'raceStart', 'meetingDate'), self._schema('races', typed),
+                                 self._output(output), owning_authority_code=owning_authority_code,
+                                 force_refresh=force_refresh)
+
+    def get_trial_results_range(self, from_date: str, to_date: str, chunk_days: int = 7, max_workers: int = None,
+                                force_refresh: bool = False, output: str = None) -> pd.DataFrame:
+        """
+        Returns the trial results between two dates like get_trial_results, for ranges of any length.
+        See get_meetings_range. Rows are identified by their meeting, race, run and dog ids.
+
+        Args:
+            from_date (str): The first date, in YYYY-MM-DD format.
+            to_date (str): The last date, in YYYY-MM-DD format.
+            chunk_days (int, optional): The number of days requested at a time. Default is 7.
+            max_workers (int, optional): The number of concurrent requests. Defaults to the pool_maxsize of the client.
+            force_refresh (bool, optional): Ignore any cached response and fetch a fresh one. Default is False.
+            output (str, optional): 'pandas', 'pyarrow', 'polars' or 'raw'. Defaults to the client's output setting.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the trial results between the dates.
+
+        Raises:
+            Exception: Whatever get_trial_results raised for the earliest window that could not be fetched.
+        """
+        return self._fetch_range(self.get_trial_results, from_date, to_date, chunk_days, max_workers,
+                                 ('meetingId', 'raceId', 'runId', 'dogId'), ('meetingDate', 'trialDate'), None,
+                                 self._output(output), force_refresh=force_refresh)
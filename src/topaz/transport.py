@@ -0,0 +1,145 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from .cache import cache_key
+from .ratelimit import RETRY_STATUSES
+from .topaz import _stored_response
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+class CassetteMiss(LookupError):
+    """
+    Raised in strict replay mode when a request has no recorded response.
+    """
+
+class RecordReplayTransport:
+    def __init__(self, path: str, mode: str = REPLAY, strict: bool = True):
+        """
+        A transport for TopazAPI that records responses to a cassette, a local SQLite file of zlib-compressed bodies
+        indexed by path and query parameters, and replays them without touching the network. Replayed responses
+        skip the rate limiter and retries, so a backtest over recorded data runs at local disk speed and gives the
+        same results every time.
+
+        Args:
+            path (str): The cassette file.
+            mode (str, optional): RECORD to send every request over the network and store its response, replacing any
+                                  earlier recording, or REPLAY to serve recorded responses. Default is REPLAY.
+            strict (bool, optional): In REPLAY mode, raise CassetteMiss for a request that was never recorded.
+                                     If False, such a request is sent over the network and recorded. Default is True.
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Invalid mode: {mode}. Must be '{RECORD}' or '{REPLAY}'")
+        self.mode = mode
+        self.strict = strict
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.expanduser(path), check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS interactions (
+                key TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                params TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                recorded REAL NOT NULL
+            )''')
+        self._db.execute('CREATE INDEX IF NOT EXISTS interactions_path ON interactions (path)')
+
+    def send(self, path: str, params: dict, fetch, stream: bool = False):
+        """
+        Serves a request from the cassette or fetches it, depending on the mode.
+
+        Args:
+            path (str): The endpoint path.
+            params (dict): The query string parameters.
+            fetch (callable): Sends the request over the network and returns the response.
+            stream (bool, optional): Whether fetch leaves the body to be read with iter_content. A streamed 200 body
+                                     is recorded as it is read, once it has been read in full; any other streamed
+                                     response (e.g. a 404 for a month without data) is recorded at once. Default is False.
+
+        Returns:
+            requests.Response: The recorded or live response.
+
+        Raises:
+            CassetteMiss: In strict replay mode, if the request was never recorded.
+        """
+        key = cache_key(path, params)
+        if self.mode == REPLAY:
+            with self._lock:
+                row = self._db.execute('SELECT status, headers, body FROM interactions WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                self.hits += 1
+                status, headers, body = row
+                return _stored_response(status, json.loads(headers), zlib.decompress(body), key)
+            self.misses += 1
+            if self.strict:
+                raise CassetteMiss(f"No recorded response for {key}")
+        response = fetch()
+        # Transient failures and 304s (which only make sense to the client that sent the validators) are not recorded.
+        if response.status_code in RETRY_STATUSES or response.status_code == 304:
+            return response
+        if stream and response.status_code == 200:
+            self._record_stream(path, params, response)
+        else:
+            self.record(path, params, response.status_code, response.headers, response.content)
+        return response
+
+    def _record_stream(self, path: str, params: dict, response):
+        # Compresses the chunks of a streamed body as the caller reads them, rather than reading the whole body
+        # into memory first. A body that is not read to the end (e.g. a generator closed early) is not recorded.
+        iter_content = response.iter_content
+
+        def tee(chunk_size: int = 1, decode_unicode: bool = False):
+            compressor = zlib.compressobj()
+            parts = []
+            for chunk in iter_content(chunk_size, decode_unicode):
+                parts.append(compressor.compress(chunk.encode(response.encoding or 'utf-8')
+                                                 if isinstance(chunk, str) else chunk))
+                yield chunk
+            parts.append(compressor.flush())
+            self._store(path, params, response.status_code, response.headers, b''.join(parts))
+
+        response.iter_content = tee
+
+    def record(self, path: str, params: dict, status: int, headers: dict, body: bytes):
+        """
+        Stores a response in the cassette, replacing any earlier recording of the same request.
+        """
+        self._store(path, params, status, headers, zlib.compress(body))
+
+    def _store(self, path: str, params: dict, status: int, headers: dict, compressed: bytes):
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO interactions VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             (cache_key(path, params), path, json.dumps(params, sort_keys=True, default=str), status,
+                              json.dumps(dict(headers)), compressed, time.time()))
+            self.recorded += 1
+
+    def paths(self) -> list:
+        """
+        Returns the recorded request keys (path and query string), in order.
+        """
+        with self._lock:
+            return [row[0] for row in self._db.execute('SELECT key FROM interactions ORDER BY path, key')]
+
+    def stats(self) -> dict:
+        """
+        Returns the replay hits and misses and the number of responses recorded by this process,
+        and the number of responses in the cassette.
+        """
+        with self._lock:
+            entries = self._db.execute('SELECT COUNT(*) FROM interactions').fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'recorded': self.recorded, 'entries': entries}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,368 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import NamedTuple
+
+from .normalize import _rows
+from .schema import SCHEMAS
+from .topaz import _to_frame, _validate_authority_code, _validate_output
+
+# The columns of a run that describe the dog rather than the run, returned by RaceWarehouse.dog.
+_DOG_COLUMNS = ('dogId', 'dogName', 'sex', 'colourCode', 'dateWhelped', 'damId', 'damName', 'sireId', 'sireName',
+                'trainerId', 'trainerName', 'trainerSuburb', 'trainerState', 'ownerId', 'ownerName', 'ownerState')
+
+# A stored row is updated by merging the new payload into the stored one, so a run ingested from bulk data keeps its
+# bulk-only fields when the same run arrives again in a meeting payload. Null fields are dropped before merging
+# (json_patch would delete the stored value), and an indexed column keeps its stored value if the new row lacks it.
+_UPSERTS = {
+    'meetings': '''
+        INSERT INTO meetings VALUES (:meeting_id, :meeting_date, :track, :payload)
+        ON CONFLICT (meeting_id) DO UPDATE SET
+            meeting_date = coalesce(excluded.meeting_date, meeting_date),
+            track = coalesce(excluded.track, track),
+            payload = json_patch(payload, excluded.payload)''',
+    'races': '''
+        INSERT INTO races VALUES (:race_id, :meeting_id, :meeting_date, :track, :payload)
+        ON CONFLICT (race_id) DO UPDATE SET
+            meeting_id = coalesce(excluded.meeting_id, meeting_id),
+            meeting_date = coalesce(excluded.meeting_date, meeting_date),
+            track = coalesce(excluded.track, track),
+            payload = json_patch(payload, excluded.payload)''',
+    'runs': '''
+        INSERT INTO runs VALUES (:run_id, :race_id, :meeting_id, :dog_id, :trainer_id, :meeting_date, :track, :payload)
+        ON CONFLICT (run_id) DO UPDATE SET
+            race_id = coalesce(excluded.race_id, race_id),
+            meeting_id = coalesce(excluded.meeting_id, meeting_id),
+            dog_id = coalesce(excluded.dog_id, dog_id),
+            trainer_id = coalesce(excluded.trainer_id, trainer_id),
+            meeting_date = coalesce(excluded.meeting_date, meeting_date),
+            track = coalesce(excluded.track, track),
+            payload = json_patch(payload, excluded.payload)''',
+}
+
+class IngestSummary(NamedTuple):
+    """
+    The number of rows written to each table by one ingest, and the number of records skipped for lack of an id.
+    """
+    meetings: int
+    races: int
+    runs: int
+    skipped: int
+
+def _date(row: dict):
+    value = row.get('meetingDate')
+    return str(value)[:10] if value else None
+
+def _track(row: dict):
+    return row.get('trackCode') or row.get('track')
+
+def _payload(row: dict) -> str:
+    return json.dumps({key: value for key, value in row.items() if value is not None}, separators=(',', ':'),
+                      default=str)
+
+class RaceWarehouse:
+    def __init__(self, path: str = 'topaz_warehouse.sqlite'):
+        """
+        A local, indexed store of meetings, races and runs in a SQLite file, answering history queries in
+        milliseconds instead of calling get_dog_form, get_race_runs and friends again for data already fetched.
+        Runs are indexed by dog, race, meeting, trainer, track and date. Each row keeps its full record, and a row
+        ingested again is merged with the stored one rather than replaced.
+
+        Args:
+            path (str, optional): The warehouse file. Default is 'topaz_warehouse.sqlite' in the working directory.
+        """
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.expanduser(path), check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS meetings (
+                meeting_id INTEGER PRIMARY KEY,
+                meeting_date TEXT,
+                track TEXT,
+                payload TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS races (
+                race_id INTEGER PRIMARY KEY,
+                meeting_id INTEGER,
+                meeting_date TEXT,
+                track TEXT,
+                payload TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY,
+                race_id INTEGER,
+                meeting_id INTEGER,
+                dog_id INTEGER,
+                trainer_id INTEGER,
+                meeting_date TEXT,
+                track TEXT,
+                payload TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS meetings_date ON meetings (meeting_date);
+            CREATE INDEX IF NOT EXISTS meetings_track ON meetings (track, meeting_date);
+            CREATE INDEX IF NOT EXISTS races_meeting ON races (meeting_id);
+            CREATE INDEX IF NOT EXISTS races_date ON races (meeting_date);
+            CREATE INDEX IF NOT EXISTS races_track ON races (track, meeting_date);
+            CREATE INDEX IF NOT EXISTS runs_dog ON runs (dog_id, meeting_date);
+            CREATE INDEX IF NOT EXISTS runs_race ON runs (race_id);
+            CREATE INDEX IF NOT EXISTS runs_meeting ON runs (meeting_id);
+            CREATE INDEX IF NOT EXISTS runs_trainer ON runs (trainer_id, meeting_date);
+            CREATE INDEX IF NOT EXISTS runs_track ON runs (track, meeting_date);
+            CREATE INDEX IF NOT EXISTS runs_date ON runs (meeting_date);
+        ''')
+
+    ### Ingest
+    def _write(self, meetings: list, races: list, runs: list, skipped: int) -> IngestSummary:
+        # One transaction per ingest: much faster than a commit per row, and a failure leaves nothing half written.
+        with self._lock:
+            self._db.execute('BEGIN')
+            try:
+                for table, rows in (('meetings', meetings), ('races', races), ('runs', runs)):
+                    self._db.executemany(_UPSERTS[table], rows)
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+        return IngestSummary(len(meetings), len(races), len(runs), skipped)
+
+    @staticmethod
+    def _meeting_row(row: dict) -> dict:
+        return {'meeting_id': row['meetingId'], 'meeting_date': _date(row), 'track': _track(row),
+                'payload': _payload(row)}
+
+    @staticmethod
+    def _race_row(row: dict) -> dict:
+        return {'race_id': row['raceId'], 'meeting_id': row.get('meetingId'), 'meeting_date': _date(row),
+                'track': _track(row), 'payload': _payload(row)}
+
+    @staticmethod
+    def _run_row(row: dict) -> dict:
+        return {'run_id': row['runId'], 'race_id': row.get('raceId'), 'meeting_id': row.get('meetingId'),
+                'dog_id': row.get('dogId'), 'trainer_id': row.get('trainerId'), 'meeting_date': _date(row),
+                'track': _track(row), 'payload': _payload(row)}
+
+    def ingest_runs(self, records: list) -> IngestSummary:
+        """
+        Stores flat run records, e.g. the raw output of get_bulk_runs_by_month or get_race_runs.
+        The meeting and race columns of each run also fill in the meetings and races tables.
+
+        Args:
+            records (list): The run records, a list of dictionaries.
+
+        Returns:
+            IngestSummary: The number of rows written to each table.
+        """
+        race_columns, meeting_columns = SCHEMAS['races'], SCHEMAS['meetings']
+        meetings, races, runs, skipped = {}, {}, [], 0
+        for record in records:
+            if record.get('runId') is None:
+                skipped += 1
+                continue
+            runs.append(self._run_row(record))
+            if record.get('raceId') is not None and record['raceId'] not in races:
+                races[record['raceId']] = self._race_row({key: value for key, value in record.items()
+                                                          if key in race_columns})
+            if record.get('meetingId') is not None and record['meetingId'] not in meetings:
+                meetings[record['meetingId']] = self._meeting_row({key: value for key, value in record.items()
+                                                                   if key in meeting_columns})
+        return self._write(list(meetings.values()), list(races.values()), runs, skipped)
+
+    def ingest(self, payloads) -> IngestSummary:
+        """
+        Stores nested payloads: what get_meeting_form, get_meeting_results, get_meeting_details(format='all') and
+        get_race_runs_form return, or a list of them (see normalize). Form lines are stored as runs of their own.
+
+        Args:
+            payloads (dict or list): A meeting, race or list of runs, or a list of such payloads.
+
+        Returns:
+            IngestSummary: The number of rows written to each table.
+        """
+        rows = _rows(payloads)
+        # Races and runs inside a meeting payload only carry its id; give them its date and track too, so they are
+        # found by date and track queries.
+        meetings = {row['meetingId']: row for row in rows['meetings'] if row.get('meetingId') is not None}
+        for row in rows['races'] + rows['runs']:
+            meeting = meetings.get(row.get('meetingId'))
+            if meeting is not None:
+                for column in ('meetingDate', 'trackCode', 'track'):
+                    if column in meeting:
+                        row.setdefault(column, meeting[column])
+        skipped = 0
+        written = {}
+        for table, id_column, to_row in (('meetings', 'meetingId', self._meeting_row),
+                                         ('races', 'raceId', self._race_row),
+                                         ('runs', 'runId', self._run_row),
+                                         ('form', 'runId', self._run_row)):
+            kept = [to_row(row) for row in rows[table] if row.get(id_column) is not None]
+            skipped += len(rows[table]) - len(kept)
+            written.setdefault('runs' if table == 'form' else table, []).extend(kept)
+        return self._write(written['meetings'], written['races'], written['runs'], skipped)
+
+    def load_bulk_runs(self, api, owning_authority_code: str, year: int, month: int, day: int = None,
+                       chunk_size: int = 10000) -> IngestSummary:
+        """
+        Streams a month (or a day) of bulk runs from the API into the warehouse, chunk_size records at a time.
+
+        Args:
+            api (TopazAPI): The client to fetch with.
+            owning_authority_code (str): The code of the owning authority, e.g. 'VIC'.
+            year (int): The year to load.
+            month (int): The month to load.
+            day (int, optional): Load only this day. Default is None (the whole month).
+            chunk_size (int, optional): The number of records decoded and written at a time. Default is 10000.
+
+        Returns:
+            IngestSummary: The total number of rows written to each table.
+        """
+        _validate_authority_code(owning_authority_code)
+        if day:
+            chunks = api.iter_bulk_runs_by_day(owning_authority_code, year, month, day, chunk_size=chunk_size,
+                                               output='raw')
+        else:
+            chunks = api.iter_bulk_runs_by_month(owning_authority_code, year, month, chunk_size=chunk_size,
+                                                 output='raw')
+        total = IngestSummary(0, 0, 0, 0)
+        for records in chunks:
+            total = IngestSummary(*(a + b for a, b in zip(total, self.ingest_runs(records))))
+        return total
+
+    def ingest_meeting_store(self, store, kinds: tuple = ('details', 'results')) -> IngestSummary:
+        """
+        Stores every meeting payload mirrored by a MeetingStore (see MeetingSync).
+
+        Args:
+            store (MeetingStore): The meeting mirror.
+            kinds (tuple, optional): The kinds of payload to ingest. Default is ('details', 'results').
+
+        Returns:
+            IngestSummary: The total number of rows written to each table.
+        """
+        total = IngestSummary(0, 0, 0, 0)
+        for kind in kinds:
+            for meeting_id in store.meeting_ids(kind):
+                total = IngestSummary(*(a + b for a, b in zip(total, self.ingest(store.get(meeting_id, kind)))))
+        return total
+
+    ### Queries
+    def _query(self, table: str, where: list, params: list, order: str, schema: str, typed: bool, output: str):
+        _validate_output(output)
+        sql = f"SELECT payload FROM {table}" + (f" WHERE {' AND '.join(where)}" if where else '') + f" ORDER BY {order}"
+        with self._lock:
+            records = [json.loads(row[0]) for row in self._db.execute(sql, params)]
+        return _to_frame(records, schema if typed else None, output)
+
+    @staticmethod
+    def _between(where: list, params: list, from_date: str, to_date: str):
+        if from_date:
+            where.append('meeting_date >= ?')
+            params.append(from_date)
+        if to_date:
+            where.append('meeting_date <= ?')
+            params.append(to_date)
+
+    def dog_history(self, dog_id: int, as_of: str = None, typed: bool = True, output: str = 'pandas'):
+        """
+        Returns every stored run of a dog, oldest first, optionally only those before a date, e.g. the form
+        of the dog going into a race on that date.
+
+        Args:
+            dog_id (int): The GRV id of the dog.
+            as_of (str, optional): Only runs from meetings before this date, format 'yyyy-mm-dd'. Default is None.
+            typed (bool, optional): Build the frame with the declared compact schema. Default is True.
+            output (str, optional): 'pandas', 'pyarrow', 'polars' or 'raw'. Default is 'pandas'.
+
+        Returns:
+            pd.DataFrame: The runs of the dog.
+        """
+        where, params = ['dog_id = ?'], [dog_id]
+        if as_of:
+            where.append('meeting_date < ?')
+            params.append(as_of)
+        return self._query('runs', where, params, 'meeting_date, race_id', 'bulk_runs', typed, output)
+
+    def dog(self, dog_id: int) -> dict:
+        """
+        Returns the details of a dog (name, sex, breeding, trainer and owner) from its latest stored run.
+
+        Args:
+            dog_id (int): The GRV id of the dog.
+
+        Returns:
+            dict: The details of the dog, or None if no run of the dog is stored.
+        """
+        with self._lock:
+            row = self._db.execute('SELECT payload FROM runs WHERE dog_id = ? ORDER BY meeting_date DESC LIMIT 1',
+                                   (dog_id,)).fetchone()
+        if row is None:
+            return None
+        record = json.loads(row[0])
+        return {column: record[column] for column in _DOG_COLUMNS if column in record}
+
+    def race_runs(self, race_id: int, typed: bool = True, output: str = 'pandas'):
+        """
+        Returns the stored runs of a race. See get_race_runs.
+
+        Args:
+            race_id (int): The id of the race.
+            typed (bool, optional): Build the frame with the declared compact schema. Default is True.
+            output (str, optional): 'pandas', 'pyarrow', 'polars' or 'raw'. Default is 'pandas'.
+
+        Returns:
+            pd.DataFrame: The runs of the race.
+        """
+        return self._query('runs', ['race_id = ?'], [race_id], 'run_id', 'bulk_runs', typed, output)
+
+    def races(self, track: str = None, from_date: str = None, to_date: str = None, typed: bool = True,
+              output: str = 'pandas'):
+        """
+        Returns the stored races, optionally at one track and between two dates.
+
+        Args:
+            track (str, optional): The track code, e.g. 'WPK'. Default is None (every track).
+            from_date (str, optional): The first meeting date, format 'yyyy-mm-dd'. Default is None.
+            to_date (str, optional): The last meeting date, format 'yyyy-mm-dd'. Default is None.
+            typed (bool, optional): Build the frame with the declared compact schema. Default is True.
+            output (str, optional): 'pandas', 'pyarrow', 'polars' or 'raw'. Default is 'pandas'.
+
+        Returns:
+            pd.DataFrame: The races, in date order.
+        """
+        where, params = [], []
+        if track:
+            where.append('track = ?')
+            params.append(track)
+        self._between(where, params, from_date, to_date)
+        return self._query('races', where, params, 'meeting_date, race_id', 'races', typed, output)
+
+    def trainer_runs(self, trainer_id: int, from_date: str = None, to_date: str = None, typed: bool = True,
+                     output: str = 'pandas'):
+        """
+        Returns the stored runs of a trainer's dogs, optionally between two dates.
+
+        Args:
+            trainer_id (int): The id of the trainer.
+            from_date (str, optional): The first meeting date, format 'yyyy-mm-dd'. Default is None.
+            to_date (str, optional): The last meeting date, format 'yyyy-mm-dd'. Default is None.
+            typed (bool, optional): Build the frame with the declared compact schema. Default is True.
+            output (str, optional): 'pandas', 'pyarrow', 'polars' or 'raw'. Default is 'pandas'.
+
+        Returns:
+            pd.DataFrame: The runs, in date order.
+        """
+        where, params = ['trainer_id = ?'], [trainer_id]
+        self._between(where, params, from_date, to_date)
+        return self._query('runs', where, params, 'meeting_date, race_id', 'bulk_runs', typed, output)
+
+    def stats(self) -> dict:
+        """
+        Returns the number of meetings, races and runs stored.
+        """
+        with self._lock:
+            return {table: self._db.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                    for table in ('meetings', 'races', 'runs')}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -66,10 +66,6 @@ all_races_df = pd.concat(all_races, ignore_index=True)
 # Extract unique race IDs
 race_ids = list(all_races_df['raceId'].unique())
 
-race_runs = []
-for race_id in race_ids:
-    race_run = topaz_api.get_race_runs(race_id=race_id)
-    race_runs.append(race_run)
-
-race_runs = pd.concat(race_runs)
+race_runs, errors = topaz_api.get_race_runs_many(race_ids)
 print(race_runs)
+print(errors)
@@ -0,0 +1,61 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from topaz import TopazAPI
+from topaz.transport import RECORD, RecordReplayTransport
+
+RUNS = [{'runId': 1, 'raceId': 10, 'dogName': 'A'}, {'runId': 2, 'raceId': 10, 'dogName': 'B'}]
+
+class _Handler(BaseHTTPRequestHandler):
+    # January has runs, February has none (404), and NT is not authorized (401).
+    def do_GET(self):
+        if '/NT/' in self.path:
+            status, body = 401, {'message': 'Unauthorized'}
+        elif self.path.endswith('/2023/1'):
+            status, body = 200, RUNS
+        else:
+            status, body = 404, {'message': 'No data'}
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+def _client(transport, base_url):
+    api = TopazAPI('key', transport=transport, max_retries=0)
+    api.base_url = base_url
+    return api
+
+def _runs(api, code, month):
+    return [record for chunk in api.iter_bulk_runs_by_month(code, 2023, month, output='raw') for record in chunk]
+
+def test_streamed_responses_replay_in_strict_mode(server, tmp_path):
+    cassette = str(tmp_path / 'runs.cassette')
+    recorder = _client(RecordReplayTransport(cassette, mode=RECORD), server)
+    assert _runs(recorder, 'VIC', 1) == RUNS
+    assert _runs(recorder, 'VIC', 2) == []
+    with pytest.raises(PermissionError):
+        _runs(recorder, 'NT', 1)
+    assert recorder.transport.stats()['entries'] == 3
+
+    # Nothing listens here, so every response must come from the cassette.
+    replay = _client(RecordReplayTransport(cassette), 'http://127.0.0.1:9')
+    assert _runs(replay, 'VIC', 1) == RUNS
+    assert _runs(replay, 'VIC', 2) == []
+    with pytest.raises(PermissionError):
+        _runs(replay, 'NT', 1)
+    assert replay.transport.stats()['hits'] == 3